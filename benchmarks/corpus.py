@@ -0,0 +1,135 @@
+"""Synthetic corpus of resumes and job postings for benchmarks.
+
+Resumes are rendered as TXT, DOCX and PDF in three sizes so that the
+extractors and the upload endpoint see realistic variation in input size.
+Generation is deterministic for a given seed.
+"""
+import io
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ['Ava', 'Liam', 'Maya', 'Noah', 'Priya', 'Omar', 'Sofia', 'Kenji', 'Lena', 'Diego']
+LAST_NAMES = ['Patel', 'Nguyen', 'Garcia', 'Smith', 'Kowalski', 'Okafor', 'Rossi', 'Tanaka', 'Silva', 'Berg']
+SKILLS = [
+    'Python', 'Django', 'React', 'SQL', 'AWS', 'Docker', 'Java', 'Go', 'TypeScript',
+    'Kubernetes', 'PostgreSQL', 'Redis', 'GraphQL', 'Terraform', 'Machine Learning',
+    'Pandas', 'REST APIs', 'CI/CD', 'Linux', 'Spark',
+]
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises']
+POSITIONS = ['Software Engineer', 'Backend Developer', 'Data Engineer', 'Tech Lead', 'DevOps Engineer']
+DEGREES = ['BSc Computer Science', 'MSc Data Science', 'BEng Software Engineering', 'PhD Physics']
+SCHOOLS = ['State University', 'Institute of Technology', 'City College', 'Polytechnic University']
+SENTENCES = [
+    'Designed and operated services handling millions of requests per day.',
+    'Led a team of engineers through a migration to containerized deployments.',
+    'Reduced p95 latency of the core API by rewriting hot paths.',
+    'Built data pipelines feeding analytics and reporting dashboards.',
+    'Mentored junior developers and ran the interview loop.',
+    'Introduced automated testing and continuous delivery practices.',
+]
+
+# Number of work experience entries and bullet points per entry
+SIZES = {
+    'small': (2, 2),
+    'medium': (6, 4),
+    'large': (20, 8),
+}
+
+
+def resume_text(rng: random.Random, size: str) -> str:
+    """Render a plain-text resume of the given size."""
+    jobs, bullets = SIZES[size]
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [name, f"{name.lower().replace(' ', '.')}@example.com", '']
+    lines += ['Skills', ', '.join(rng.sample(SKILLS, rng.randint(4, 10))), '']
+    lines.append('Education')
+    for _ in range(rng.randint(1, 2)):
+        lines.append(f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {rng.randint(2000, 2022)}")
+    lines += ['', 'Experience']
+    year = 2024
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(POSITIONS)} at {rng.choice(COMPANIES)} ({start} - {year})")
+        for _ in range(bullets):
+            lines.append(f"- {rng.choice(SENTENCES)}")
+        year = start
+    return '\n'.join(lines)
+
+
+def job_posting(rng: random.Random, size: str) -> Dict:
+    """Build a job posting payload as accepted by ``/api/jobs/``."""
+    _, bullets = SIZES[size]
+    return {
+        'title': rng.choice(POSITIONS),
+        'company': rng.choice(COMPANIES),
+        'required_skills': rng.sample(SKILLS, rng.randint(3, 8)),
+        'description': ' '.join(rng.choice(SENTENCES) for _ in range(bullets * 3)),
+    }
+
+
+def to_docx(text: str) -> bytes:
+    """Render text as a DOCX document, one paragraph per line."""
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def to_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """Render text as a minimal multi-page PDF using the built-in Helvetica font."""
+    lines = text.splitlines() or ['']
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    objects: List[bytes] = []
+    page_ids = [3 + 2 * i for i in range(len(pages))]
+    font_id = 3 + 2 * len(pages)
+    objects.append(b'<< /Type /Catalog /Pages 2 0 R >>')
+    kids = ' '.join(f'{pid} 0 R' for pid in page_ids)
+    objects.append(f'<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>'.encode())
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = ['BT', '/F1 10 Tf', '12 TL', '50 770 Td']
+        for line in page_lines:
+            escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            stream.append(f'({escaped}) Tj T*')
+        stream.append('ET')
+        content = '\n'.join(stream).encode('latin-1', 'replace')
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {page_id + 1} 0 R >>'.encode()
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b'%010d 00000 n \n' % offset)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def build_corpus(seed: int = 1234, per_size: int = 5) -> Dict:
+    """Generate resumes in every format and size plus a pool of job postings.
+
+    Returns ``{'resumes': {(fmt, size): [(filename, bytes), ...]}, 'jobs': {size: [payload, ...]}}``.
+    """
+    rng = random.Random(seed)
+    resumes: Dict = {}
+    jobs: Dict = {}
+    for size in SIZES:
+        texts = [resume_text(rng, size) for _ in range(per_size)]
+        resumes[('txt', size)] = [(f'resume_{size}_{i}.txt', t.encode('utf-8')) for i, t in enumerate(texts)]
+        resumes[('docx', size)] = [(f'resume_{size}_{i}.docx', to_docx(t)) for i, t in enumerate(texts)]
+        resumes[('pdf', size)] = [(f'resume_{size}_{i}.pdf', to_pdf(t)) for i, t in enumerate(texts)]
+        jobs[size] = [job_posting(rng, size) for _ in range(per_size)]
+    return {'resumes': resumes, 'jobs': jobs}
@@ -0,0 +1,165 @@
+"""Read/write concurrency benchmark for the database configuration.
+
+Runs a mix of reads (leaderboard pages, match lists) and writes (new job
+matches with their leaderboard updates) from several threads against a fresh
+SQLite file, once with Django's default SQLite settings and once with the
+tuned profile from ``settings.py`` (busy timeout, persistent connections)
+plus WAL, which deployments opt into with ``SQLITE_JOURNAL_MODE=WAL``. Each profile runs in its own process because the settings have
+to be in place before Django starts.
+
+Usage::
+
+    python -m benchmarks.db_concurrency --threads 8 --seconds 5 --write-ratio 0.3 --output db.json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from benchmarks.stats import summarize
+
+PROFILES = ('baseline', 'tuned')
+
+
+def configure(profile: str, database: str):
+    """Point the settings at ``database`` and, for the baseline, undo the tuning."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_matcher.settings')
+    from django.conf import settings
+
+    db = settings.DATABASES['default']
+    db['NAME'] = database
+    if profile == 'baseline':
+        db['CONN_MAX_AGE'] = 0
+        db['OPTIONS'] = {}
+        settings.SQLITE_PRAGMAS = {}
+    else:
+        settings.SQLITE_PRAGMAS = {**settings.SQLITE_PRAGMAS, 'journal_mode': 'WAL'}
+
+    import django
+    django.setup()
+
+
+def seed(jobs: int, candidates: int):
+    from matcher.models import CandidateProfile, JobPosting
+
+    JobPosting.objects.bulk_create([
+        JobPosting(title=f'Engineer {i}', company='Bench', required_skills=['Python'], description='')
+        for i in range(jobs)
+    ])
+    CandidateProfile.objects.bulk_create([
+        CandidateProfile(name=f'Candidate {i}', skills=['Python'], education=[], work_experience=[])
+        for i in range(candidates)
+    ])
+    return list(JobPosting.objects.values_list('id', flat=True)), \
+        list(CandidateProfile.objects.values_list('id', flat=True))
+
+
+def run_profile(profile: str, threads: int, seconds: float, write_ratio: float, seed_value: int) -> Dict:
+    database = os.path.join(tempfile.mkdtemp(prefix='matcher-db-bench-'), 'bench.sqlite3')
+    configure(profile, database)
+    logging.disable(logging.CRITICAL)
+
+    from django.core.management import call_command
+    from django.db import OperationalError, close_old_connections, connection, transaction
+
+    from matcher.leaderboards import top_entries
+    from matcher.models import JobMatch
+
+    call_command('migrate', verbosity=0)
+    job_ids, candidate_ids = seed(20, 200)
+    connection.close()
+
+    results = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(index: int):
+        rng = random.Random(seed_value + index)
+        while time.perf_counter() < deadline:
+            kind = 'write' if rng.random() < write_ratio else 'read'
+            # Mimic a request: Django closes or keeps the connection per CONN_MAX_AGE
+            close_old_connections()
+            start = time.perf_counter()
+            try:
+                if kind == 'write':
+                    with transaction.atomic():
+                        JobMatch.objects.create(
+                            candidate_id=rng.choice(candidate_ids), job_id=rng.choice(job_ids),
+                            match_score=rng.randint(0, 100), missing_skills=[], summary='bench')
+                else:
+                    top_entries('job', rng.choice(job_ids), 20)
+                    list(JobMatch.objects.filter(candidate_id=rng.choice(candidate_ids))[:20])
+                elapsed = time.perf_counter() - start
+                with lock:
+                    results[kind].append(elapsed)
+            except OperationalError:
+                with lock:
+                    errors[kind] += 1
+            finally:
+                close_old_connections()
+        connection.close()
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    wall_time = time.perf_counter() - started
+
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        journal_mode = cursor.fetchone()[0]
+    return {
+        'profile': profile,
+        'journal_mode': journal_mode,
+        'threads': threads,
+        'read': summarize(results['read'], wall_time, errors['read']),
+        'write': summarize(results['write'], wall_time, errors['write']),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--profile', choices=PROFILES, help='run a single profile in this process')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--write-ratio', type=float, default=0.3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        report = run_profile(args.profile, args.threads, args.seconds, args.write_ratio, args.seed)
+        print(json.dumps(report))
+        return
+
+    reports: List[Dict] = []
+    for profile in PROFILES:
+        command = [sys.executable, '-m', 'benchmarks.db_concurrency', '--profile', profile,
+                   '--threads', str(args.threads), '--seconds', str(args.seconds),
+                   '--write-ratio', str(args.write_ratio), '--seed', str(args.seed)]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        reports.append(json.loads(output.strip().splitlines()[-1]))
+
+    for report in reports:
+        print(f"{report['profile']:>8} ({report['journal_mode']})")
+        for kind in ('read', 'write'):
+            stats = report[kind]
+            print(f"  {kind:>5}: {stats['requests_per_sec']:>9} req/s  p95 {stats['p95_ms']:>8} ms  "
+                  f"errors {stats['errors']}")
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(reports, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""JSON encode/decode benchmark for the API renderer, parser and LLM decoder.
+
+Renders a large list response (serialized job matches with expanded
+candidates and jobs) with DRF's stock ``JSONRenderer`` and with
+``matcher.fastjson.FastJSONRenderer``, parses the same body with both
+parsers, and decodes fenced LLM answers with ``decode_llm_json``. No database
+is needed: the rows are built in memory.
+
+Usage::
+
+    python -m benchmarks.json_layer --rows 5000 --repeat 20 --output json_layer.json
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import time
+from typing import Callable, Dict, List
+
+
+def time_call(fn: Callable, repeat: int) -> float:
+    """Median wall time of ``fn`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def build_rows(count: int) -> List[Dict]:
+    rows = []
+    for i in range(count):
+        rows.append({
+            'id': i,
+            'candidate': {
+                'id': i, 'name': f'Candidate {i}', 'skills': ['Python', 'Django', 'SQL', 'Docker'],
+                'education': [{'degree': 'BSc Computer Science', 'institution': 'State University', 'year': '2015'}],
+                'work_experience': [{'company': 'Acme Corp', 'position': 'Software Engineer',
+                                     'duration': '2016 - 2020', 'description': 'Built APIs and data pipelines.'}],
+                'created_at': '2024-01-01T12:00:00Z',
+            },
+            'job': {'id': i % 50, 'title': 'Backend Engineer', 'company': 'Acme', 'required_skills': ['Python', 'AWS'],
+                    'description': 'Build and run the matching API. ' * 5},
+            'match_score': i % 101,
+            'missing_skills': ['Kubernetes'],
+            'summary': 'Strong backend experience; no Kubernetes.',
+            'score_source': 'llm',
+            'is_stale': False,
+            'is_provisional': False,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=5000, help='rows in the rendered list response')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per measurement')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_matcher.settings')
+    import django
+    django.setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from matcher import fastjson
+    from matcher.llm_json import MATCH_SCHEMA, decode_llm_json
+
+    rows = build_rows(args.rows)
+    body = JSONRenderer().render(rows)
+    answer = '```json\n' + json.dumps({
+        'match_score': 80, 'missing_skills': ['Kubernetes'], 'summary': 'Strong backend experience. ' * 20,
+    }, indent=2) + '\n```'
+
+    report = {
+        'orjson': fastjson.orjson is not None,
+        'rows': args.rows,
+        'response_bytes': len(body),
+        'render_ms': {
+            'stock': time_call(lambda: JSONRenderer().render(rows), args.repeat),
+            'fast': time_call(lambda: fastjson.FastJSONRenderer().render(rows), args.repeat),
+        },
+        'parse_ms': {
+            'stock': time_call(lambda: JSONParser().parse(io.BytesIO(body)), args.repeat),
+            'fast': time_call(lambda: fastjson.FastJSONParser().parse(io.BytesIO(body)), args.repeat),
+        },
+        # 1000 decodes per run, so milliseconds per run read as microseconds per answer
+        'llm_decode_us': round(time_call(lambda: [decode_llm_json(answer, MATCH_SCHEMA) for _ in range(1000)],
+                                         args.repeat), 2),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
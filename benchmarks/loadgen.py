@@ -0,0 +1,298 @@
+"""Load generator for a running deployment of the matcher API.
+
+Drives resume uploads, candidate/job matches and job listings with a
+configurable mix through a ramp of load levels and reports the saturation
+curve: achieved throughput, latency percentiles and error rate per step.
+
+Two arrival models are supported:
+
+* ``closed``: each ramp value is a number of concurrent users that send the
+  next request as soon as the previous one returns.
+* ``open``: each ramp value is an arrival rate in requests/sec with Poisson
+  arrivals, independent of how fast the server answers. Latency is measured
+  from the scheduled arrival time, so queueing delay is included.
+
+Usage::
+
+    python -m benchmarks.loadgen --start-server --mix upload=1,match=3,jobs=6 --ramp 1,2,4,8,16
+    python -m benchmarks.loadgen --arrival open --ramp 5,10,20,40 --base-url http://127.0.0.1:8000/api
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.corpus import build_corpus, job_posting
+from benchmarks.stats import summarize
+
+OPERATIONS = ('upload', 'match', 'jobs')
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_ramp(value: str) -> List[float]:
+    return [float(v) for v in value.split(',') if v.strip()]
+
+
+class Workload:
+    """Issues individual API requests and records their outcome."""
+
+    def __init__(self, base_url: str, mix: Dict[str, float], seed: int, timeout: float,
+                 match_deadline_ms: Optional[float] = None):
+        self.base_url = base_url.rstrip('/')
+        # Sent as X-Match-Deadline-Ms so matches degrade to provisional local scores
+        self.match_headers = {'X-Match-Deadline-Ms': str(match_deadline_ms)} if match_deadline_ms else {}
+        self.names = list(mix)
+        self.weights = [mix[n] for n in self.names]
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.local = threading.local()
+        corpus = build_corpus(seed, per_size=3)
+        self.files = [f for (fmt, size), files in corpus['resumes'].items() if size != 'large' for f in files]
+        self.candidate_ids: List[int] = []
+        self.job_ids: List[int] = []
+
+    def session(self) -> requests.Session:
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def prepare(self, jobs: int, candidates: int):
+        """Make sure there are jobs and candidates to match against."""
+        session = self.session()
+        rng = random.Random(0)
+        for _ in range(jobs):
+            response = session.post(f'{self.base_url}/jobs/', json=job_posting(rng, 'medium'), timeout=self.timeout)
+            response.raise_for_status()
+            self.job_ids.append(response.json()['id'])
+        for name, content in self.files[:candidates]:
+            response = session.post(
+                f'{self.base_url}/candidates/upload_resume/', files={'resume': (name, content)}, timeout=self.timeout)
+            response.raise_for_status()
+            self.candidate_ids.append(response.json()['id'])
+
+    def pick(self) -> Tuple[str, int]:
+        with self.rng_lock:
+            return self.rng.choices(self.names, self.weights)[0], self.rng.randrange(1 << 30)
+
+    def execute(self, operation: str, token: int) -> bool:
+        session = self.session()
+        try:
+            if operation == 'upload':
+                name, content = self.files[token % len(self.files)]
+                response = session.post(
+                    f'{self.base_url}/candidates/upload_resume/', files={'resume': (name, content)},
+                    timeout=self.timeout)
+                return response.status_code in (200, 201)
+            if operation == 'match':
+                if not self.candidate_ids or not self.job_ids:
+                    return False  # nothing to match; counted as an error
+                payload = {
+                    'candidate_id': self.candidate_ids[token % len(self.candidate_ids)],
+                    'job_id': self.job_ids[(token // 7) % len(self.job_ids)],
+                }
+                response = session.post(
+                    f'{self.base_url}/matches/match_candidate/', json=payload, headers=self.match_headers,
+                    timeout=self.timeout)
+                return response.status_code == 201
+            response = session.get(f'{self.base_url}/jobs/', timeout=self.timeout)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: List[Tuple[str, float, bool]] = []
+
+    def add(self, operation: str, latency: float, ok: bool):
+        with self.lock:
+            self.samples.append((operation, latency, ok))
+
+
+def run_closed(workload: Workload, users: int, duration: float) -> Recorder:
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    def user():
+        while time.perf_counter() < deadline:
+            operation, token = workload.pick()
+            t0 = time.perf_counter()
+            ok = workload.execute(operation, token)
+            recorder.add(operation, time.perf_counter() - t0, ok)
+
+    threads = [threading.Thread(target=user, daemon=True) for _ in range(int(users))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder
+
+
+def run_open(workload: Workload, rate: float, duration: float, max_workers: int) -> Recorder:
+    recorder = Recorder()
+    arrivals = random.Random(int(rate * 1000))
+
+    def request(operation, token, scheduled):
+        ok = workload.execute(operation, token)
+        recorder.add(operation, time.perf_counter() - scheduled, ok)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        start = time.perf_counter()
+        next_arrival = start
+        while next_arrival < start + duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            operation, token = workload.pick()
+            pool.submit(request, operation, token, next_arrival)
+            next_arrival += arrivals.expovariate(rate)
+    return recorder
+
+
+def summarize_step(recorder: Recorder, level: float, wall_time: float) -> Dict:
+    latencies = [latency for _, latency, _ in recorder.samples]
+    errors = sum(1 for _, _, ok in recorder.samples if not ok)
+    step = {'load': level, **summarize(latencies, wall_time, errors)}
+    step['error_rate'] = round(errors / len(latencies), 4) if latencies else 0.0
+    step['operations'] = {}
+    for operation in OPERATIONS:
+        op_samples = [s for s in recorder.samples if s[0] == operation]
+        if op_samples:
+            step['operations'][operation] = summarize(
+                [s[1] for s in op_samples], wall_time, sum(1 for s in op_samples if not s[2]))
+    return step
+
+
+def find_saturation(steps: List[Dict], knee_factor: float, max_error_rate: float) -> Dict:
+    """Return the last load level before latency collapses or errors appear."""
+    if not steps:
+        return {}
+    baseline = steps[0]['p99_ms'] or 1.0
+    sustained = None
+    for step in steps:
+        if step['p99_ms'] > knee_factor * baseline or step['error_rate'] > max_error_rate:
+            return {
+                'sustained_load': sustained['load'] if sustained else None,
+                'sustained_requests_per_sec': sustained['requests_per_sec'] if sustained else None,
+                'collapsed_at_load': step['load'],
+            }
+        sustained = step
+    return {
+        'sustained_load': sustained['load'],
+        'sustained_requests_per_sec': sustained['requests_per_sec'],
+        'collapsed_at_load': None,
+    }
+
+
+def wait_for_server(base_url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f'{base_url}/jobs/', timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f'Server at {base_url} did not come up within {timeout:.0f}s')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:8765/api')
+    parser.add_argument('--start-server', action='store_true',
+                        help='start benchmarks.stub_server on the base URL port for the duration of the run')
+    parser.add_argument('--llm-latency-ms', type=float, default=300.0, help='stub LLM latency when starting a server')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('upload=1,match=3,jobs=6'))
+    parser.add_argument('--ramp', type=parse_ramp, default=parse_ramp('1,2,4,8,16,32'),
+                        help='concurrent users (closed) or arrivals/sec (open) per step')
+    parser.add_argument('--arrival', choices=['closed', 'open'], default='closed')
+    parser.add_argument('--step-duration', type=float, default=10.0, help='seconds per ramp step')
+    parser.add_argument('--max-workers', type=int, default=256, help='in-flight request cap for the open model')
+    parser.add_argument('--timeout', type=float, default=60.0, help='per-request timeout in seconds')
+    parser.add_argument('--knee-factor', type=float, default=3.0,
+                        help='p99 growth over the first step that counts as collapse')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--match-deadline-ms', type=float,
+                        help='deadline sent with match requests; late LLM answers become provisional matches')
+    parser.add_argument('--prepare-jobs', type=int, default=20)
+    parser.add_argument('--prepare-candidates', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+    if args.mix.get('match') and (args.prepare_jobs < 1 or args.prepare_candidates < 1):
+        parser.error('a mix with match needs --prepare-jobs and --prepare-candidates of at least 1')
+
+    server = None
+    if args.start_server:
+        addrport = args.base_url.split('://', 1)[-1].split('/', 1)[0]
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.stub_server', '--addrport', addrport,
+             '--llm-latency-ms', str(args.llm_latency_ms)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+    try:
+        wait_for_server(args.base_url)
+        workload = Workload(args.base_url, args.mix, args.seed, args.timeout, args.match_deadline_ms)
+        workload.prepare(args.prepare_jobs, args.prepare_candidates)
+
+        steps = []
+        unit = 'users' if args.arrival == 'closed' else 'req/s'
+        print(f"{'load':>8} {unit:<6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}",
+              file=sys.stderr)
+        for level in args.ramp:
+            started = time.perf_counter()
+            if args.arrival == 'closed':
+                recorder = run_closed(workload, int(level), args.step_duration)
+            else:
+                recorder = run_open(workload, level, args.step_duration, args.max_workers)
+            step = summarize_step(recorder, level, time.perf_counter() - started)
+            steps.append(step)
+            print(f"{level:>8g} {'':<6} {step['requests_per_sec']:>8.2f} {step['p50_ms']:>9.1f} "
+                  f"{step['p95_ms']:>9.1f} {step['p99_ms']:>9.1f} {step['errors']:>7}", file=sys.stderr)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    report = {
+        'meta': {
+            'base_url': args.base_url,
+            'arrival': args.arrival,
+            'mix': args.mix,
+            'step_duration_s': args.step_duration,
+            'llm_latency_ms': args.llm_latency_ms if args.start_server else None,
+        },
+        'steps': steps,
+        'saturation': find_saturation(steps, args.knee_factor, args.max_error_rate),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(output + '\n')
+    else:
+        sys.stdout.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Cold-start benchmark for Django processes.
+
+Starts fresh interpreters and times what every worker and management command
+pays before doing any work: ``django.setup()``, loading the URL configuration
+(which imports the views and services), ``manage.py check`` and, for
+comparison, the optional ``matcher.warmup.warm_up()``. It also reports which
+heavy modules were imported along the way, so an eager import creeping back
+in shows up in the report.
+
+Usage::
+
+    python -m benchmarks.startup --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+HEAVY_MODULES = ('google.generativeai', 'PyPDF2', 'docx')
+
+CHILD = """
+import json, os, sys, time
+started = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_matcher.settings')
+import django
+django.setup()
+setup_done = time.perf_counter()
+import resume_matcher.urls
+urls_done = time.perf_counter()
+timings = {'setup_ms': (setup_done - started) * 1000, 'urls_ms': (urls_done - setup_done) * 1000}
+loaded = [name for name in %(heavy)r if name in sys.modules]
+if %(warm_up)r:
+    from matcher.warmup import warm_up
+    warm_up()
+    timings['warm_up_ms'] = (time.perf_counter() - urls_done) * 1000
+print(json.dumps({'timings': timings, 'heavy_modules_loaded': loaded}))
+"""
+
+
+def run_child(warm_up: bool) -> Dict:
+    code = CHILD % {'heavy': HEAVY_MODULES, 'warm_up': warm_up}
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['timings']['process_ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def time_command(args: List[str]) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, 'manage.py', *args], check=True, capture_output=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def median_timings(results: List[Dict]) -> Dict[str, float]:
+    keys = results[0]['timings'].keys()
+    return {key: round(statistics.median(r['timings'][key] for r in results), 1) for key in keys}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes per measurement')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    # Run from the project root so manage.py and the settings module resolve
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    cold = [run_child(warm_up=False) for _ in range(args.runs)]
+    warm = [run_child(warm_up=True) for _ in range(args.runs)]
+    report = {
+        'runs': args.runs,
+        'cold_start': median_timings(cold),
+        'heavy_modules_loaded': cold[-1]['heavy_modules_loaded'],
+        'with_warm_up': median_timings(warm),
+        'manage_check_ms': round(statistics.median(time_command(['check']) for _ in range(args.runs)), 1),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
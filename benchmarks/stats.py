@@ -0,0 +1,38 @@
+"""Small statistics helpers shared by the benchmark scripts."""
+import resource
+import sys
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(latencies: List[float], wall_time: float, errors: int = 0) -> Dict:
+    """Summarize latencies (in seconds) into throughput and percentile figures."""
+    count = len(latencies)
+    return {
+        'requests': count,
+        'errors': errors,
+        'wall_time_s': round(wall_time, 4),
+        'requests_per_sec': round(count / wall_time, 2) if wall_time > 0 else 0.0,
+        'mean_ms': round(sum(latencies) / count * 1000, 3) if count else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'max_ms': round(max(latencies) * 1000, 3) if count else 0.0,
+    }
+
+
+def peak_rss_kb() -> int:
+    """Return the high-water resident set size of this process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    if sys.platform == 'darwin':
+        peak //= 1024
+    return int(peak)
@@ -0,0 +1,109 @@
+"""Stand-in for the Gemini model with a fixed, configurable latency.
+
+The stub answers the prompts built in ``matcher.services`` with canned but
+well-formed JSON so that the full request path can be exercised without
+network access or API spend.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Optional
+
+
+class StubUsage:
+    """Mimics the ``usage_metadata`` attribute of a Gemini response."""
+
+    def __init__(self, prompt_tokens: int, response_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = response_tokens
+        self.total_token_count = prompt_tokens + response_tokens
+
+
+class StubResponse:
+    """Mimics the parts of a Gemini response that the services read."""
+
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        self.usage_metadata = StubUsage(len(prompt) // 4, len(text) // 4)
+
+
+class StubModel:
+    """Drop-in replacement for ``genai.GenerativeModel`` used in benchmarks."""
+
+    def __init__(self, latency_ms: float = 50.0):
+        self.latency = latency_ms / 1000.0
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        response = StubResponse(self._answer(prompt), prompt)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += response.usage_metadata.prompt_token_count
+            self.response_tokens += response.usage_metadata.candidates_token_count
+        return response
+
+    def _answer(self, prompt: str) -> str:
+        digest = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16)
+        if prompt.startswith('Parse this resume'):
+            payload = self._resume_payload(prompt, digest)
+        elif prompt.startswith('Score this candidate'):
+            job_ids = [int(job_id) for job_id in re.findall(r'"job_id":(\d+)', prompt)]
+            payload = [{
+                'job_id': job_id,
+                'match_score': (digest + job_id) % 101,
+                'missing_skills': ['Kubernetes', 'GraphQL'][:(digest + job_id) % 3],
+                'summary': 'Stub assessment of the candidate against the job.',
+            } for job_id in job_ids]
+        elif prompt.startswith('Analyze this candidate'):
+            payload = {
+                'match_score': digest % 101,
+                'missing_skills': ['Kubernetes', 'GraphQL'][:digest % 3],
+                'summary': 'Stub assessment of the candidate against the job.',
+            }
+        elif prompt.startswith('Generate a professional cover letter'):
+            payload = {'cover_letter': 'Dear Hiring Manager,\n\n' + 'I am excited to apply. ' * 40}
+        else:
+            payload = {}
+        # Gemini usually wraps JSON in a fenced block, so the stub does too
+        return '```json\n' + json.dumps(payload, indent=2) + '\n```'
+
+    @staticmethod
+    def _resume_payload(prompt: str, digest: int) -> dict:
+        body = prompt.split('Resume text:', 1)[-1]
+        name = _first_line(body) or f'Candidate {digest % 10000}'
+        skills = sorted(set(re.findall(r'\b(Python|Django|React|SQL|AWS|Docker|Java|Go|TypeScript)\b', body)))
+        return {
+            'name': name[:255],
+            'skills': skills or ['Communication'],
+            'education': [{'degree': 'BSc Computer Science', 'institution': 'State University', 'year': '2015'}],
+            'work_experience': [{
+                'company': 'Acme Corp',
+                'position': 'Software Engineer',
+                'duration': '2016 - 2020',
+                'description': 'Built things.',
+            }],
+        }
+
+
+def _first_line(text: str) -> Optional[str]:
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            return line
+    return None
+
+
+def install(latency_ms: float = 50.0) -> StubModel:
+    """Swap the Gemini model used by ``matcher.services`` for a stub."""
+    from matcher import services
+
+    stub = StubModel(latency_ms)
+    services.model = stub
+    return stub
@@ -0,0 +1,49 @@
+"""Run the Django development server with the stub LLM installed.
+
+The server uses its own SQLite database (a temporary file by default) and blob
+store so load tests never touch ``db.sqlite3`` or ``media/``.
+
+Usage::
+
+    python -m benchmarks.stub_server --addrport 127.0.0.1:8765 --llm-latency-ms 300
+"""
+import argparse
+import logging
+import os
+import tempfile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--addrport', default='127.0.0.1:8765')
+    parser.add_argument('--llm-latency-ms', type=float, default=300.0)
+    parser.add_argument('--database', help='SQLite file to use (default: a fresh temporary file)')
+    parser.add_argument('--with-logging', action='store_true', help='keep application logging enabled')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_matcher.settings')
+    from django.conf import settings
+
+    workdir = tempfile.mkdtemp(prefix='matcher-load-')
+    database = args.database or os.path.join(workdir, 'load.sqlite3')
+    # Connections are opened lazily, so the override takes effect as long as
+    # it happens before django.setup().
+    settings.DATABASES['default']['NAME'] = database
+    settings.RESUME_BLOB_ROOT = os.path.join(workdir, 'resumes')
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+
+    from benchmarks import stub_llm
+
+    if not args.with_logging:
+        logging.disable(logging.INFO)
+    stub_llm.install(args.llm_latency_ms)
+    call_command('migrate', verbosity=0)
+    call_command('runserver', args.addrport, use_reloader=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+"""Offline benchmark suite for the ingestion and matching pipeline.
+
+Runs the full Django request path (URL routing, parsers, views, serializers,
+ORM) through the test client against a throw-away test database, with the
+Gemini model replaced by a stub with fixed latency. Text extractors are also
+measured on their own. Results are written as JSON so runs can be compared
+across commits.
+
+Usage::
+
+    python -m benchmarks.suite --iterations 30 --llm-latency-ms 50 --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import SIZES, build_corpus
+from benchmarks.stats import peak_rss_kb, summarize
+
+
+def measure(fn: Callable[[int], bool], iterations: int, warmup: int, memory_iterations: int) -> Dict:
+    """Time ``fn`` and measure its memory footprint.
+
+    ``fn`` receives the iteration number and returns False on failure. Timing
+    and allocation tracking are done in separate passes so that tracemalloc
+    overhead does not skew the latency figures.
+    """
+    for i in range(warmup):
+        fn(i)
+
+    latencies: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        ok = fn(i)
+        latencies.append(time.perf_counter() - t0)
+        if not ok:
+            errors += 1
+    result = summarize(latencies, time.perf_counter() - started, errors)
+
+    tracemalloc.start()
+    try:
+        for i in range(memory_iterations):
+            fn(i)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    result['peak_alloc_kb'] = round(peak / 1024, 1)
+    result['peak_rss_kb'] = peak_rss_kb()
+    return result
+
+
+def bench_extractors(corpus: Dict, args) -> Dict:
+    from matcher.views import extract_text_from_docx, extract_text_from_pdf
+
+    extractors = {
+        'pdf': extract_text_from_pdf,
+        'docx': extract_text_from_docx,
+        'txt': lambda content: content.decode('utf-8'),
+    }
+    results: Dict = {}
+    for fmt, extract in extractors.items():
+        for size in SIZES:
+            files = corpus['resumes'][(fmt, size)]
+
+            def run(i, files=files, extract=extract):
+                return bool(extract(files[i % len(files)][1]))
+
+            results.setdefault(fmt, {})[size] = measure(run, args.iterations, args.warmup, args.memory_iterations)
+    return results
+
+
+def bench_upload(client, files: List, args) -> Dict:
+    """Measure ``upload_resume`` over ``files`` and count the uploads answered with an existing profile."""
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    counts = {'uploads': 0, 'reused_uploads': 0}
+
+    def upload(i):
+        name, content = files[i % len(files)]
+        response = client.post('/api/candidates/upload_resume/', {'resume': SimpleUploadedFile(name, content)})
+        counts['uploads'] += 1
+        # 200 means an identical or near-duplicate upload reused a profile
+        counts['reused_uploads'] += response.status_code == 200
+        return response.status_code in (200, 201)
+
+    result = measure(upload, args.iterations, args.warmup, args.memory_iterations)
+    # Counted over warm-up, timed and memory runs alike
+    result.update(counts)
+    return result
+
+
+def bench_endpoints(corpus: Dict, args) -> Dict:
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from matcher.models import CandidateProfile, JobMatch, JobPosting
+
+    client = Client()
+    results: Dict = {}
+
+    # The corpus repeats a few files per format and size. With deduplication
+    # most repeats would be served from the stored profile, so upload_resume
+    # runs without it and every upload is extracted and parsed;
+    # upload_resume_dedup measures the same uploads with reuse enabled.
+    for (fmt, size), files in corpus['resumes'].items():
+        with override_settings(RESUME_DEDUP={'ENABLED': False}):
+            results.setdefault('upload_resume', {})[f'{fmt}/{size}'] = bench_upload(client, files, args)
+    for (fmt, size), files in corpus['resumes'].items():
+        results.setdefault('upload_resume_dedup', {})[f'{fmt}/{size}'] = bench_upload(client, files, args)
+
+    # Seed a fixed pool of jobs so list and match figures do not depend on
+    # how many jobs the create benchmark happened to insert.
+    pool = [job for jobs in corpus['jobs'].values() for job in jobs]
+    seeded = [JobPosting(**pool[i % len(pool)]) for i in range(args.seed_jobs)]
+    for job in seeded:
+        job.prepare_derived_fields()
+    JobPosting.objects.bulk_create(seeded)
+    job_ids = list(JobPosting.objects.values_list('id', flat=True))
+    candidate_ids = list(CandidateProfile.objects.values_list('id', flat=True))
+
+    def list_jobs(i):
+        return client.get('/api/jobs/').status_code == 200
+
+    results['jobs_list'] = {f'{len(job_ids)}_jobs': measure(list_jobs, args.iterations, args.warmup, args.memory_iterations)}
+
+    for size, jobs in corpus['jobs'].items():
+        def create_job(i, jobs=jobs):
+            response = client.post('/api/jobs/', json.dumps(jobs[i % len(jobs)]), content_type='application/json')
+            return response.status_code == 201
+
+        results.setdefault('jobs_create', {})[size] = measure(
+            create_job, args.iterations, args.warmup, args.memory_iterations)
+
+    def match(i):
+        payload = {'candidate_id': candidate_ids[i % len(candidate_ids)], 'job_id': job_ids[i % len(job_ids)]}
+        response = client.post('/api/matches/match_candidate/', json.dumps(payload), content_type='application/json')
+        return response.status_code == 201
+
+    results['match_candidate'] = {'default': measure(match, args.iterations, args.warmup, args.memory_iterations)}
+    results['packed_matching'] = compare_packed_matching(client, candidate_ids, job_ids, args.packed_jobs)
+
+    match_ids = list(JobMatch.objects.values_list('id', flat=True))
+
+    def cover_letter(i):
+        response = client.post(f'/api/matches/{match_ids[i % len(match_ids)]}/generate_cover_letter/')
+        return response.status_code == 200
+
+    results['generate_cover_letter'] = {
+        'default': measure(cover_letter, args.iterations, args.warmup, args.memory_iterations)}
+    return results
+
+
+def compare_packed_matching(client, candidate_ids: List[int], job_ids: List[int], jobs_per_candidate: int) -> Dict:
+    """LLM round trips and tokens to score one candidate against N jobs, one prompt per job vs packed."""
+    from matcher import services
+
+    stub = services.model
+    jobs = job_ids[:jobs_per_candidate]
+    report = {'jobs': len(jobs)}
+
+    def usage():
+        return stub.calls, stub.prompt_tokens + stub.response_tokens
+
+    calls, tokens = usage()
+    started = time.perf_counter()
+    for job_id in jobs:
+        payload = {'candidate_id': candidate_ids[0], 'job_id': job_id}
+        client.post('/api/matches/match_candidate/', json.dumps(payload), content_type='application/json')
+    elapsed = time.perf_counter() - started
+    report['single'] = {'llm_calls': stub.calls - calls, 'tokens': stub.prompt_tokens + stub.response_tokens - tokens,
+                        'wall_time_s': round(elapsed, 4)}
+
+    calls, tokens = usage()
+    started = time.perf_counter()
+    payload = {'candidate_id': candidate_ids[-1], 'job_ids': jobs}
+    client.post('/api/matches/match_candidate_to_jobs/', json.dumps(payload), content_type='application/json')
+    elapsed = time.perf_counter() - started
+    report['packed'] = {'llm_calls': stub.calls - calls, 'tokens': stub.prompt_tokens + stub.response_tokens - tokens,
+                        'wall_time_s': round(elapsed, 4)}
+    return report
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=20, help='timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=2, help='untimed requests per scenario')
+    parser.add_argument('--memory-iterations', type=int, default=3, help='requests per scenario under tracemalloc')
+    parser.add_argument('--llm-latency-ms', type=float, default=50.0, help='fixed latency of the stub LLM')
+    parser.add_argument('--corpus-per-size', type=int, default=5, help='distinct documents per format and size')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--seed-jobs', type=int, default=100, help='job postings inserted before list/match runs')
+    parser.add_argument('--packed-jobs', type=int, default=20, help='jobs per candidate in the packed matching comparison')
+    parser.add_argument('--only', choices=['endpoints', 'extractors'], help='run a single group')
+    parser.add_argument('--with-logging', action='store_true', help='keep application logging enabled')
+    parser.add_argument('--output', help='write JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_matcher.settings')
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    from benchmarks import stub_llm
+
+    if not args.with_logging:
+        logging.disable(logging.INFO)
+    stub = stub_llm.install(args.llm_latency_ms)
+    corpus = build_corpus(args.seed, args.corpus_per_size)
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': args.iterations,
+            'llm_latency_ms': args.llm_latency_ms,
+            'corpus_per_size': args.corpus_per_size,
+        },
+    }
+
+    # Uploaded files go to a throw-away blob store, like the database
+    settings.RESUME_BLOB_ROOT = tempfile.mkdtemp(prefix='matcher-bench-blobs-')
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        # services print raw LLM responses; keep them out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            if args.only in (None, 'extractors'):
+                report['extractors'] = bench_extractors(corpus, args)
+            if args.only in (None, 'endpoints'):
+                report['endpoints'] = bench_endpoints(corpus, args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+    from matcher.services import get_coalescing_stats, get_local_parser_stats
+
+    report['meta']['llm_calls'] = stub.calls
+    report['meta']['llm_coalesced'] = get_coalescing_stats()['coalesced']
+    report['meta']['local_parser'] = get_local_parser_stats()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(output + '\n')
+    else:
+        sys.stdout.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import CandidateProfile, JobPosting, JobMatch
+from .ledger import summarize_windows
+from .models import CandidateProfile, DirtyMatchPair, JobPosting, JobMatch, LLMCall
 
 @admin.register(CandidateProfile)
 class CandidateProfileAdmin(admin.ModelAdmin):
@@ -13,6 +14,29 @@ class JobPostingAdmin(admin.ModelAdmin):
 
 @admin.register(JobMatch)
 class JobMatchAdmin(admin.ModelAdmin):
-    list_display = ('candidate', 'job', 'match_score')
-    list_filter = ('match_score',)
+    list_display = ('candidate', 'job', 'match_score', 'score_source', 'is_stale', 'is_provisional')
+    list_filter = ('match_score', 'score_source', 'is_stale', 'is_provisional')
+    list_select_related = ('candidate', 'job')
     search_fields = ('candidate__name', 'job__title')
+
+@admin.register(DirtyMatchPair)
+class DirtyMatchPairAdmin(admin.ModelAdmin):
+    list_display = ('candidate', 'job', 'due_at', 'claimed_at', 'attempts', 'failed', 'last_error')
+    list_filter = ('failed',)
+    list_select_related = ('candidate', 'job')
+
+@admin.register(LLMCall)
+class LLMCallAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'operation', 'outcome', 'cache_status', 'latency_ms',
+                    'prompt_tokens', 'response_tokens', 'cost_usd')
+    list_filter = ('operation', 'outcome', 'cache_status')
+    date_hierarchy = 'created_at'
+    change_list_template = 'admin/matcher/llmcall/change_list.html'
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        context = getattr(response, 'context_data', None)
+        if context and 'cl' in context:
+            # Summaries follow whatever filters are applied to the change list
+            context['ledger_summaries'] = summarize_windows(context['cl'].queryset)
+        return response
@@ -0,0 +1,124 @@
+"""Content-addressed storage of original resume files.
+
+Each upload is streamed to disk in chunks while its SHA-256 is computed, and
+kept under ``RESUME_BLOB_ROOT/<aa>/<bb>/<digest>``. The same bytes are stored
+once, so a re-upload of an identical file is recognized from its digest
+before any text extraction. Blobs are read back through a read-only memory
+map wrapped in a file object, so extractors read them without first copying
+the whole file into memory.
+"""
+import hashlib
+import io
+import logging
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def blob_root() -> Path:
+    return Path(getattr(settings, 'RESUME_BLOB_ROOT', None) or Path(settings.MEDIA_ROOT) / 'resumes')
+
+
+def blob_path(digest: str) -> Path:
+    """Location of a blob; two levels of fan-out keep directories small."""
+    return blob_root() / digest[:2] / digest[2:4] / digest
+
+
+def write_blob(chunks: Iterable[bytes]) -> Tuple[str, int]:
+    """Stream chunks to the store and return ``(sha256, size)``; existing content is not rewritten."""
+    root = blob_root()
+    root.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    # Written next to its final location so the rename below stays on one filesystem
+    fd, tmp_path = tempfile.mkstemp(dir=root, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            for chunk in chunks:
+                digest.update(chunk)
+                fh.write(chunk)
+                size += len(chunk)
+        key = digest.hexdigest()
+        path = blob_path(key)
+        if path.exists():
+            os.unlink(tmp_path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, path)
+            logger.info(f"Stored resume blob {key} ({size} bytes)")
+        return key, size
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def store_upload(uploaded_file) -> Tuple[str, int]:
+    """Store a Django ``UploadedFile`` by streaming its chunks (from memory or its temp file)."""
+    uploaded_file.seek(0)
+    return write_blob(uploaded_file.chunks())
+
+
+class BlobReader(io.RawIOBase):
+    """Seekable read-only file object over a memory-mapped blob.
+
+    Reads copy only the requested bytes out of the map; ``getbuffer()`` gives
+    the whole blob as a ``memoryview`` without copying.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError('negative seek position')
+        self._pos = offset
+        return self._pos
+
+    def readinto(self, buffer):
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+@contextmanager
+def open_blob(digest: str):
+    """Yield a ``BlobReader`` over a read-only memory map of a blob."""
+    with open(blob_path(digest), 'rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            with BlobReader(b'') as reader:
+                yield reader
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with BlobReader(mapped) as reader:
+                yield reader
@@ -0,0 +1,216 @@
+"""Streaming bulk import and export of jobs, candidates and matches.
+
+Imports read JSONL or CSV row by row, validate each chunk with the API
+serializers and insert it with ``bulk_create``; exports walk the table with
+``.iterator(chunk_size=...)``. Neither side holds more than one chunk in
+memory, whatever the size of the file or table.
+
+In CSV files, list and object columns (skills, education, ...) hold JSON;
+list columns also accept plain ``;``-separated values.
+"""
+import codecs
+import csv
+import json
+import logging
+import re
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from rest_framework.exceptions import ValidationError
+
+from .db import BulkInserter, chunked, write_batch_size
+from .leaderboards import rebuild_board
+from .models import CandidateProfile, JobMatch, JobPosting
+from .serializers import CandidateProfileSerializer, JobMatchImportSerializer, JobPostingSerializer
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('jsonl', 'csv')
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+EXTENSIONS = {
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+}
+
+RESOURCES = {
+    'jobs': {
+        'model': JobPosting,
+        'serializer': JobPostingSerializer,
+        'fields': ['id', 'title', 'company', 'required_skills', 'description'],
+        'json_fields': ['required_skills'],
+    },
+    'candidates': {
+        'model': CandidateProfile,
+        'serializer': CandidateProfileSerializer,
+        'fields': ['id', 'name', 'skills', 'education', 'work_experience'],
+        'json_fields': ['skills', 'education', 'work_experience'],
+    },
+    'matches': {
+        'model': JobMatch,
+        'serializer': JobMatchImportSerializer,
+        'fields': ['id', 'candidate', 'job', 'match_score', 'missing_skills', 'summary', 'score_source', 'is_stale'],
+        'json_fields': ['missing_skills'],
+    },
+}
+
+LIST_FIELDS = {'required_skills', 'skills', 'missing_skills'}
+MAX_REPORTED_ERRORS = 100
+EXPORT_CHUNK_SIZE = 2000
+
+_LIST_SEPARATOR = re.compile(r'\s*[;|]\s*')
+
+
+def detect_format(filename: str = '', requested: Optional[str] = None) -> str:
+    """Pick the file format from an explicit choice or the file extension."""
+    if requested:
+        if requested not in FORMATS:
+            raise ValueError(f"Unsupported format '{requested}', expected one of {', '.join(FORMATS)}")
+        return requested
+    for extension, fmt in EXTENSIONS.items():
+        if filename.lower().endswith(extension):
+            return fmt
+    raise ValueError('Could not tell the file format; use a .jsonl or .csv file or pass the format explicitly')
+
+
+def _decode_csv_cell(field: str, value: str):
+    if value is None or value == '':
+        return [] if field in LIST_FIELDS else value
+    try:
+        return json.loads(value)
+    except ValueError:
+        if field in LIST_FIELDS:
+            return [part for part in _LIST_SEPARATOR.split(value.strip()) if part]
+        return value
+
+
+def read_records(lines: Iterable[bytes], fmt: str, kind: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Yield ``(line_number, row, error)`` for each record of a JSONL or CSV byte stream."""
+    text = codecs.iterdecode(lines, 'utf-8-sig')
+    if fmt == 'jsonl':
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, None, f'Invalid JSON: {str(e)}'
+                continue
+            if not isinstance(row, dict):
+                yield number, None, 'Expected a JSON object'
+                continue
+            yield number, row, None
+        return
+
+    json_fields = RESOURCES[kind]['json_fields']
+    reader = csv.DictReader(text)
+    for row in reader:
+        for field in json_fields:
+            if field in row:
+                row[field] = _decode_csv_cell(field, row[field])
+        yield reader.line_num, row, None
+
+
+def _existing_ids(model, ids) -> set:
+    return set(model.objects.filter(id__in=ids).values_list('id', flat=True))
+
+
+def _validate_chunk(kind: str, chunk, report: Dict):
+    """Validate a chunk of records and return unsaved model instances for the valid ones."""
+    resource = RESOURCES[kind]
+    model = resource['model']
+    # One serializer validates every row, as a ListSerializer does with its child,
+    # so its fields are built once per chunk instead of once per row
+    serializer = resource['serializer']()
+    valid = []
+    for number, row, error in chunk:
+        if row is None:
+            _report_error(report, number, error)
+            continue
+        row.pop('id', None)
+        try:
+            validated = serializer.run_validation(row)
+        except ValidationError as e:
+            _report_error(report, number, e.detail)
+            continue
+        valid.append((number, model(**validated)))
+
+    if kind == 'matches':
+        # Foreign keys are checked once per chunk rather than once per row
+        candidates = _existing_ids(CandidateProfile, {m.candidate_id for _, m in valid})
+        jobs = _existing_ids(JobPosting, {m.job_id for _, m in valid})
+        checked = []
+        for number, match in valid:
+            if match.candidate_id not in candidates or match.job_id not in jobs:
+                _report_error(report, number, {'non_field_errors': ['Unknown candidate or job']})
+            else:
+                checked.append((number, match))
+        valid = checked
+
+    instances = [instance for _, instance in valid]
+    if kind != 'matches':
+        for instance in instances:
+            instance.prepare_derived_fields()
+    return instances
+
+
+def _report_error(report: Dict, number: int, errors):
+    report['invalid'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append({'line': number, 'errors': errors})
+
+
+def import_records(kind: str, records: Iterable, batch_size: Optional[int] = None) -> Dict:
+    """Validate and insert records chunk by chunk; invalid rows are skipped and reported."""
+    resource = RESOURCES[kind]
+    batch_size = write_batch_size(batch_size)
+    report = {'created': 0, 'invalid': 0, 'errors': []}
+    touched_jobs, touched_candidates = set(), set()
+
+    with BulkInserter(resource['model'], batch_size) as inserter:
+        for chunk in chunked(records, batch_size):
+            for instance in _validate_chunk(kind, chunk, report):
+                inserter.add(instance)
+                if kind == 'matches':
+                    touched_jobs.add(instance.job_id)
+                    touched_candidates.add(instance.candidate_id)
+    report['created'] = inserter.inserted
+
+    # bulk_create skips the signals that keep leaderboards current
+    for job_id in touched_jobs:
+        rebuild_board('job', job_id)
+    for candidate_id in touched_candidates:
+        rebuild_board('candidate', candidate_id)
+
+    logger.info(f"Imported {report['created']} {kind}, skipped {report['invalid']} invalid rows")
+    return report
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value, for streaming ``csv.writer`` output."""
+
+    def write(self, value):
+        return value
+
+
+def export_lines(kind: str, fmt: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield a table as JSONL or CSV text, one chunk of rows at a time."""
+    resource = RESOURCES[kind]
+    fields, json_fields = resource['fields'], set(resource['json_fields'])
+    rows = resource['model'].objects.order_by('id').values(*fields).iterator(chunk_size=chunk_size)
+
+    if fmt == 'jsonl':
+        for chunk in chunked(rows, chunk_size):
+            yield ''.join(json.dumps(row, default=str) + '\n' for row in chunk)
+        return
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for chunk in chunked(rows, chunk_size):
+        yield ''.join(
+            writer.writerow([json.dumps(row[f]) if f in json_fields else row[f] for f in fields])
+            for row in chunk
+        )
+
@@ -0,0 +1,94 @@
+"""Database connection tuning and batched writes.
+
+SQLite allows a single writer at a time, so write throughput depends on how
+many transactions are committed rather than how many rows. The helpers here
+group writes into few short transactions; on a server database they behave
+the same and simply save round trips.
+"""
+import logging
+from typing import Callable, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WRITE_BATCH_SIZE = 500
+
+
+def apply_sqlite_pragmas(connection):
+    """Run the ``SQLITE_PRAGMAS`` setting on a freshly opened SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    logger.debug(f"Applied SQLite pragmas to {connection.alias}: {pragmas}")
+
+
+def write_batch_size(batch_size: Optional[int] = None) -> int:
+    return batch_size or getattr(settings, 'DB_WRITE_BATCH_SIZE', DEFAULT_WRITE_BATCH_SIZE)
+
+
+def chunked(items: Iterable, size: int):
+    chunk: List = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_in_batches(items: Iterable, write: Callable, batch_size: Optional[int] = None) -> int:
+    """Call ``write(item)`` for every item, committing one transaction per batch.
+
+    Use this for writes that need per-row ``save()`` (signals, update_fields);
+    plain inserts should go through ``BulkInserter``.
+    """
+    written = 0
+    for chunk in chunked(items, write_batch_size(batch_size)):
+        with transaction.atomic():
+            for item in chunk:
+                write(item)
+        written += len(chunk)
+    return written
+
+
+class BulkInserter:
+    """Buffer model instances and insert them with ``bulk_create`` in batches.
+
+    Usable as a context manager; the remaining buffer is flushed on a clean exit.
+    """
+
+    def __init__(self, model, batch_size: Optional[int] = None, **bulk_create_kwargs):
+        self.model = model
+        self.batch_size = write_batch_size(batch_size)
+        self.bulk_create_kwargs = bulk_create_kwargs
+        self.buffer: List = []
+        self.inserted = 0
+
+    def add(self, instance):
+        self.buffer.append(instance)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        with transaction.atomic():
+            self.model.objects.bulk_create(self.buffer, **self.bulk_create_kwargs)
+        self.inserted += len(self.buffer)
+        self.buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        return False
@@ -0,0 +1,131 @@
+"""Near-duplicate resume detection with MinHash and locality-sensitive hashing.
+
+Extracted resume text is normalized and shingled into word n-grams, and each
+upload gets a MinHash signature whose agreement rate estimates the Jaccard
+similarity of two shingle sets. Signatures are split into bands; a resume is
+only compared with prior uploads that share at least one band bucket, so a
+lookup touches a handful of indexed rows instead of every stored resume.
+
+Resumes of different people built from the same template can be just as
+similar, so a near-duplicate must also have the same identity: a digest of
+the name and email addresses found in the text.
+"""
+import hashlib
+import random
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 61) - 1
+
+# Fixed seed so signatures stay comparable across processes and deployments
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# A run of digits with separators (phone numbers, dates, date ranges) becomes one token
+_NUMBER = re.compile(r'\d[\d\s().+\-/–—]*\d|\d')
+_NON_WORD = re.compile(r'[^\w]+')
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+
+DEFAULT_DEDUP_SETTINGS = {
+    'ENABLED': True,
+    'THRESHOLD': 0.9,  # estimated Jaccard similarity that counts as a near-duplicate
+    'POLICY': 'reuse',  # 'reuse' the existing profile, or 'update' it from a fresh parse
+}
+
+
+def dedup_settings() -> Dict:
+    return {**DEFAULT_DEDUP_SETTINGS, **getattr(settings, 'RESUME_DEDUP', {})}
+
+
+def _stable_hash(value: str) -> int:
+    # Python's hash() is salted per process, so use a stable digest instead
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def shingles(text: str) -> Set[int]:
+    """Hash the word n-grams of normalized text.
+
+    Numbers are masked so that changed phone numbers, dates or years, and
+    reformatted date ranges, do not count as differences.
+    """
+    words = [w for w in _NON_WORD.split(_NUMBER.sub(' 0 ', text.lower())) if w]
+    if len(words) < SHINGLE_SIZE:
+        return {_stable_hash(' '.join(words))} if words else set()
+    return {_stable_hash(' '.join(words[i:i + SHINGLE_SIZE])) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def resume_identity(text: str) -> str:
+    """Digest of the name and email addresses in a resume, or '' when neither is found."""
+    from .local_parser import parse_name, split_sections
+
+    header, _ = split_sections(text.splitlines())
+    name = ' '.join(parse_name(header).lower().split())
+    emails = sorted({email.lower() for email in _EMAIL.findall(text)})
+    if not name and not emails:
+        return ''
+    value = '\n'.join([name, *emails])
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def minhash_signature(text: str) -> List[int]:
+    hashes = shingles(text)
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERM
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def estimate_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def band_keys(signature: List[int]) -> List[str]:
+    keys = []
+    for band in range(BANDS):
+        values = ','.join(str(v) for v in signature[band * ROWS:(band + 1) * ROWS])
+        keys.append(f"{band}:{hashlib.blake2b(values.encode('ascii'), digest_size=8).hexdigest()}")
+    return keys
+
+
+def find_near_duplicate(signature: List[int], identity: str,
+                        threshold: Optional[float] = None) -> Optional[Tuple[object, float]]:
+    """Return ``(candidate, similarity)`` for the closest prior upload of the same person above the threshold."""
+    from .models import CandidateProfile, ResumeLSHBucket
+
+    if not identity:
+        return None  # no name or email to tell people apart
+    if threshold is None:
+        threshold = dedup_settings()['THRESHOLD']
+    rows = (
+        ResumeLSHBucket.objects
+        .filter(key__in=band_keys(signature), fingerprint__identity=identity)
+        .values_list('fingerprint__candidate_id', 'fingerprint__signature')
+        .distinct()
+    )
+    best_id, best_similarity = None, threshold
+    for candidate_id, other in rows:
+        similarity = estimate_similarity(signature, other)
+        if similarity >= best_similarity:
+            best_id, best_similarity = candidate_id, similarity
+    if best_id is None:
+        return None
+    return CandidateProfile.objects.get(pk=best_id), best_similarity
+
+
+@transaction.atomic
+def index_resume(candidate, signature: List[int], identity: str):
+    """Store (or replace) the signature and identity of a candidate's resume and its LSH buckets."""
+    from .models import ResumeFingerprint, ResumeLSHBucket
+
+    fingerprint, _ = ResumeFingerprint.objects.update_or_create(
+        candidate=candidate, defaults={'signature': signature, 'identity': identity})
+    fingerprint.buckets.all().delete()
+    ResumeLSHBucket.objects.bulk_create(
+        ResumeLSHBucket(fingerprint=fingerprint, key=key) for key in band_keys(signature))
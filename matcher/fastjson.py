@@ -0,0 +1,75 @@
+"""JSON encoding and decoding for the API, backed by orjson when it is installed.
+
+orjson is an optional speed-up: without it every helper here falls back to
+the standard library and the DRF classes behave exactly like the stock
+``JSONRenderer`` and ``JSONParser``.
+
+One difference remains with orjson: a float that is NaN or infinite is
+rendered as ``null``, where the stock renderer (with the default
+``STRICT_JSON``) raises ``ValueError``. Catching it would mean walking every
+response in Python, which is the cost orjson is here to avoid.
+"""
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Dict keys are not always strings (e.g. errors by job id), and Decimal,
+# lazy translations and the like go through DRF's encoder
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+_drf_default = encoders.JSONEncoder().default
+
+
+def loads(data):
+    """Decode JSON from ``str`` or ``bytes``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data) -> bytes:
+    """Encode ``data`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+    return json.dumps(data, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """``JSONRenderer`` that encodes with orjson; indented output still goes through the stock renderer.
+
+    Non-finite floats are rendered as ``null`` instead of raising.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        ret = dumps(data)
+        # Same escaping as JSONRenderer, for embedding responses in JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` that decodes UTF-8 request bodies with orjson."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,161 @@
+"""Materialized top-N leaderboards kept in step with ``JobMatch`` writes.
+
+Each job has a board of its best candidates and each candidate a board of its
+best jobs, stored as ``LeaderboardEntry`` rows (at most ``SIZE`` per board, one
+per member, holding the member's best match). Saving or deleting a match only
+touches the two boards of its pair, and reading a page is a single indexed
+range scan however many matches exist.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+DEFAULT_LEADERBOARD_SETTINGS = {
+    'SIZE': 100,  # entries kept per board
+    'PAGE_SIZE': 20,
+}
+
+# board -> (owner field, member field) on JobMatch
+BOARDS = {
+    'job': ('job_id', 'candidate_id'),
+    'candidate': ('candidate_id', 'job_id'),
+}
+
+RANK_ORDER = ('-match_score', '-match_id')
+
+
+def leaderboard_settings() -> Dict:
+    return {**DEFAULT_LEADERBOARD_SETTINGS, **getattr(settings, 'LEADERBOARDS', {})}
+
+
+def _outranks(match, entry) -> bool:
+    return (match.match_score, match.id) > (entry.match_score, entry.match_id)
+
+
+def _entries(board: str, owner_id: int):
+    from .models import LeaderboardEntry
+
+    return LeaderboardEntry.objects.filter(board=board, owner_id=owner_id)
+
+
+def _outside_matches(board: str, owner_id: int):
+    """Matches of the owner whose member is not on the board, best first."""
+    from .models import JobMatch
+
+    owner_field, member_field = BOARDS[board]
+    members = _entries(board, owner_id).values('member_id')
+    return (JobMatch.objects.filter(**{owner_field: owner_id})
+            .exclude(**{f'{member_field}__in': members})
+            .order_by('-match_score', '-id')
+            .only('id', 'match_score', 'candidate_id', 'job_id'))
+
+
+def _refill(board: str, owner_id: int, size: int):
+    """Fill free slots, or swap out the lowest entry, after an entry dropped or left the board."""
+    from .models import LeaderboardEntry
+
+    _, member_field = BOARDS[board]
+    entries = _entries(board, owner_id)
+    free = size - entries.count()
+    if free <= 0:
+        lowest = entries.order_by('match_score', 'match_id').first()
+        best = _outside_matches(board, owner_id).first()
+        if best is not None and _outranks(best, lowest):
+            lowest.delete()
+            LeaderboardEntry.objects.create(
+                board=board, owner_id=owner_id, member_id=getattr(best, member_field),
+                match_id=best.id, match_score=best.match_score)
+        return
+
+    rows, seen = [], set()
+    for match in _outside_matches(board, owner_id).iterator():
+        member_id = getattr(match, member_field)
+        if member_id in seen:
+            continue  # a lower-scoring match of a member already added
+        seen.add(member_id)
+        rows.append(LeaderboardEntry(
+            board=board, owner_id=owner_id, member_id=member_id,
+            match_id=match.id, match_score=match.match_score))
+        if len(rows) >= free:
+            break
+    LeaderboardEntry.objects.bulk_create(rows)
+
+
+def _update_board(board: str, owner_id: int, member_id: int, best, size: int):
+    """Apply the new best match (or ``None``) of one member to one board."""
+    from .models import LeaderboardEntry
+
+    entries = _entries(board, owner_id)
+    existing = entries.filter(member_id=member_id).first()
+    if best is None:
+        # The entry may already be gone through the match's cascade delete
+        if existing is not None:
+            existing.delete()
+        _refill(board, owner_id, size)
+        return
+    if existing is None:
+        lowest = entries.order_by('match_score', 'match_id').first()
+        if entries.count() >= size and not _outranks(best, lowest):
+            return
+        LeaderboardEntry.objects.create(
+            board=board, owner_id=owner_id, member_id=member_id,
+            match_id=best.id, match_score=best.match_score)
+        surplus = entries.order_by(*RANK_ORDER).values_list('pk', flat=True)[size:]
+        LeaderboardEntry.objects.filter(pk__in=list(surplus)).delete()
+        return
+
+    if (existing.match_id, existing.match_score) == (best.id, best.match_score):
+        return
+    dropped = (best.match_score, best.id) < (existing.match_score, existing.match_id)
+    existing.match_id, existing.match_score = best.id, best.match_score
+    existing.save(update_fields=['match', 'match_score'])
+    if dropped:
+        _refill(board, owner_id, size)
+
+
+def refresh_pair(candidate_id: int, job_id: int):
+    """Update both boards of a (candidate, job) pair after one of its matches changed."""
+    from .models import JobMatch
+
+    size = leaderboard_settings()['SIZE']
+    with transaction.atomic():
+        best = (JobMatch.objects.filter(candidate_id=candidate_id, job_id=job_id)
+                .order_by('-match_score', '-id').only('id', 'match_score').first())
+        _update_board('job', job_id, candidate_id, best, size)
+        _update_board('candidate', candidate_id, job_id, best, size)
+
+
+@transaction.atomic
+def rebuild_board(board: str, owner_id: int) -> int:
+    """Recompute a board from scratch; used for backfills."""
+    _entries(board, owner_id).delete()
+    _refill(board, owner_id, leaderboard_settings()['SIZE'])
+    return _entries(board, owner_id).count()
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Decode an ``after`` cursor of the form ``"<match_score>:<match_id>"``."""
+    if not cursor:
+        return None
+    try:
+        score, match_id = cursor.split(':')
+        return int(score), int(match_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor '{cursor}', expected '<match_score>:<match_id>'")
+
+
+def top_entries(board: str, owner_id: int, limit: int, after: Optional[Tuple[int, int]] = None):
+    """Return one page of a board and the cursor of the next page (``None`` on the last page)."""
+    entries = _entries(board, owner_id).select_related(
+        'match__candidate' if board == 'job' else 'match__job')
+    if after is not None:
+        score, match_id = after
+        entries = entries.filter(Q(match_score__lt=score) | Q(match_score=score, match_id__lt=match_id))
+    page: List = list(entries.order_by(*RANK_ORDER)[:limit + 1])
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = f"{page[-1].match_score}:{page[-1].match_id}"
+    return page, next_cursor
@@ -0,0 +1,239 @@
+"""Ledger of LLM calls with latency, token and cost analytics.
+
+Every call to Gemini is recorded as an ``LLMCall`` row. Records are queued in
+memory and written in batches by a background thread, so the request path
+never waits on the ledger insert.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEDGER_SETTINGS = {
+    'ENABLED': True,
+    'BACKGROUND': True,  # False writes batches on the calling thread (tests)
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 2.0,  # seconds
+    'MAX_QUEUE': 10000,
+}
+
+# USD per million tokens
+DEFAULT_LLM_PRICING = {
+    'gemini-1.5-flash': {'input': 0.075, 'output': 0.30},
+}
+
+WINDOWS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+BUCKETS = {'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Queued by ``LedgerWriter.stop``: the worker writes what it holds and exits
+_STOP = object()
+
+
+def ledger_settings() -> Dict:
+    return {**DEFAULT_LEDGER_SETTINGS, **getattr(settings, 'LLM_LEDGER', {})}
+
+
+def estimate_cost(model_name: str, prompt_tokens: int, response_tokens: int) -> float:
+    """Return the cost in USD of a call according to ``settings.LLM_PRICING``."""
+    pricing = getattr(settings, 'LLM_PRICING', DEFAULT_LLM_PRICING).get(model_name)
+    if not pricing:
+        return 0.0
+    return (prompt_tokens * pricing['input'] + response_tokens * pricing['output']) / 1_000_000
+
+
+class LedgerWriter:
+    """Queue ledger entries and write them with ``bulk_create`` in batches."""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """Entries discarded because the queue was full."""
+        return self._dropped
+
+    def record(self, **fields):
+        config = ledger_settings()
+        if not config['ENABLED']:
+            return
+        if self._queue.qsize() >= config['MAX_QUEUE']:
+            with self._lock:
+                self._dropped += 1
+            return
+        fields.setdefault('created_at', timezone.now())
+        self._queue.put(fields)
+        if config['BACKGROUND']:
+            self._ensure_worker()
+        elif self._queue.qsize() >= config['BATCH_SIZE']:
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far on the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write([fields for fields in batch if fields is not _STOP])
+
+    def stop(self, timeout: float = 10.0):
+        """Have the worker write the batch it holds and exit, then write anything still queued."""
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        self.flush()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='llm-ledger', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch: List[Dict] = []
+        deadline = None
+        while True:
+            config = ledger_settings()
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                fields = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                fields = None
+            if fields is _STOP:
+                self._write(batch)
+                close_old_connections()
+                return
+            if fields is not None:
+                batch.append(fields)
+                if deadline is None:
+                    deadline = time.monotonic() + config['FLUSH_INTERVAL']
+            if batch and (len(batch) >= config['BATCH_SIZE'] or time.monotonic() >= deadline):
+                self._write(batch)
+                close_old_connections()
+                batch, deadline = [], None
+
+    def _write(self, batch: List[Dict]):
+        if not batch:
+            return
+        from .models import LLMCall
+
+        try:
+            LLMCall.objects.bulk_create([LLMCall(**fields) for fields in batch])
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} LLM ledger entries: {str(e)}")
+
+
+writer = LedgerWriter()
+atexit.register(writer.stop)
+
+
+def record_llm_call(operation: str, model_name: str, latency_ms: float, outcome: str, cache_status: str,
+                    prompt_tokens: int = 0, response_tokens: int = 0, error: str = ''):
+    """Queue one LLM call for the ledger."""
+    writer.record(
+        operation=operation,
+        model_name=model_name,
+        prompt_tokens=prompt_tokens,
+        response_tokens=response_tokens,
+        latency_ms=latency_ms,
+        outcome=outcome,
+        cache_status=cache_status,
+        cost_usd=estimate_cost(model_name, prompt_tokens, response_tokens),
+        error=error[:1000],
+    )
+
+
+def parse_window(value: str) -> timedelta:
+    """Parse a window such as ``30m``, ``24h`` or ``7d``."""
+    unit = WINDOWS.get(value[-1:]) if value else None
+    if unit is None or not value[:-1].isdigit():
+        raise ValueError(f"Invalid window '{value}', expected e.g. 30m, 24h or 7d")
+    return timedelta(**{unit: int(value[:-1])})
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _aggregate(rows: List[tuple], seconds: float) -> Dict:
+    latencies = [row[0] for row in rows]
+    calls = len(rows)
+    return {
+        'calls': calls,
+        'calls_per_minute': round(calls / (seconds / 60.0), 3) if seconds else 0.0,
+        'p95_latency_ms': round(_percentile(latencies, 95), 1),
+        'mean_latency_ms': round(sum(latencies) / calls, 1) if calls else 0.0,
+        'error_rate': round(sum(1 for row in rows if row[1] != 'success') / calls, 4) if calls else 0.0,
+        'coalesced': sum(1 for row in rows if row[2] == 'coalesced'),
+        'served_locally': sum(1 for row in rows if row[2] == 'local'),
+        'prompt_tokens': sum(row[3] for row in rows),
+        'response_tokens': sum(row[4] for row in rows),
+        'cost_usd': round(sum(row[5] for row in rows), 6),
+    }
+
+
+def summarize_calls(queryset, window: timedelta, bucket: Optional[str] = None) -> Dict:
+    """Aggregate ledger entries per operation over ``window``, optionally bucketed in time.
+
+    Percentiles are computed in Python because SQLite has no percentile
+    aggregate; only the columns needed are pulled, in chunks.
+    """
+    now = timezone.now()
+    since = now - window
+    rows = queryset.filter(created_at__gte=since).values_list(
+        'operation', 'created_at', 'latency_ms', 'outcome', 'cache_status',
+        'prompt_tokens', 'response_tokens', 'cost_usd',
+    )
+    per_operation: Dict[str, List[tuple]] = defaultdict(list)
+    per_bucket: Dict[tuple, List[tuple]] = defaultdict(list)
+    bucket_seconds = BUCKETS[bucket] if bucket else None
+    for operation, created_at, *values in rows.iterator(chunk_size=2000):
+        per_operation[operation].append(values)
+        if bucket_seconds:
+            start = int(created_at.timestamp()) // bucket_seconds * bucket_seconds
+            per_bucket[(start, operation)].append(values)
+
+    summary = {
+        'since': since.isoformat(),
+        'until': now.isoformat(),
+        'operations': {
+            operation: _aggregate(values, window.total_seconds())
+            for operation, values in sorted(per_operation.items())
+        },
+    }
+    if bucket_seconds:
+        summary['bucket'] = bucket
+        summary['timeline'] = [
+            {
+                'bucket_start': datetime.fromtimestamp(start, tz=dt_timezone.utc).isoformat(),
+                'operation': operation,
+                **_aggregate(values, bucket_seconds),
+            }
+            for (start, operation), values in sorted(per_bucket.items())
+        ]
+    return summary
+
+
+def summarize_windows(queryset, windows: Iterable[str] = ('1h', '24h', '7d')) -> List[Dict]:
+    """Per-operation summaries for several trailing windows (used by the admin)."""
+    return [{'window': window, **summarize_calls(queryset, parse_window(window))} for window in windows]
@@ -0,0 +1,193 @@
+"""Decoding and validation of the JSON the LLM answers with.
+
+Every prompt asks for bare JSON, but answers often arrive wrapped in a code
+fence, with a sentence around them, with trailing commas or with raw
+newlines inside strings. ``decode_llm_json`` strips fences, takes the fast
+path when the JSON is clean and repairs those malformations otherwise, then
+checks the result against one of the schemas below. Schemas are compiled
+into plain validator functions once, at import time.
+
+The repairs never touch the contents of strings: a summary that reads
+"Python, ]" comes back exactly as the model wrote it.
+"""
+import json
+from typing import Callable, Optional
+
+from .fastjson import loads
+
+
+class LLMResponseError(ValueError):
+    """The LLM answer is not valid JSON or does not match the expected schema."""
+
+
+class Score:
+    """Schema for an integer score within ``[low, high]``; numeric strings and whole floats are accepted."""
+
+    def __init__(self, low: int, high: int):
+        self.low = low
+        self.high = high
+
+
+class Filtered:
+    """Schema for a JSON array whose items that don't match ``item`` are dropped instead of failing the answer."""
+
+    def __init__(self, item):
+        self.item = item
+
+
+def _coerce_int(value, path: str) -> int:
+    if isinstance(value, bool):
+        raise LLMResponseError(f"Expected an integer for {path}, got {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        return int(value.strip())
+    raise LLMResponseError(f"Expected an integer for {path}, got {value!r}")
+
+
+def compile_schema(spec, path: str = '') -> Callable:
+    """Turn a schema spec into a validator returning the (coerced) value or raising ``LLMResponseError``.
+
+    Specs are ``str``, ``int``, ``dict`` (any object), a ``Score``, a
+    ``Filtered``, a one-item list ``[item_spec]`` or a dict of required
+    fields to specs.
+    Fields not named in a dict spec are kept as they are.
+    """
+    where = path or 'response'
+    if isinstance(spec, dict):
+        fields = [(name, compile_schema(sub, f'{path}.{name}' if path else name)) for name, sub in spec.items()]
+
+        def check_object(value):
+            if not isinstance(value, dict):
+                raise LLMResponseError(f"Expected a JSON object for {where}")
+            for name, check in fields:
+                if name not in value:
+                    raise LLMResponseError(f"Missing required field: {f'{path}.{name}' if path else name}")
+                value[name] = check(value[name])
+            return value
+        return check_object
+    if isinstance(spec, list):
+        check_item = compile_schema(spec[0], f'{path}[]')
+
+        def check_list(value):
+            if not isinstance(value, list):
+                raise LLMResponseError(f"Expected a JSON array for {where}")
+            return [check_item(item) for item in value]
+        return check_list
+    if isinstance(spec, Filtered):
+        check_kept = compile_schema(spec.item, f'{path}[]')
+
+        def check_filtered(value):
+            if not isinstance(value, list):
+                raise LLMResponseError(f"Expected a JSON array for {where}")
+            kept = []
+            for item in value:
+                try:
+                    kept.append(check_kept(item))
+                except LLMResponseError:
+                    continue
+            return kept
+        return check_filtered
+    if isinstance(spec, Score):
+        def check_score(value):
+            score = _coerce_int(value, where)
+            if not spec.low <= score <= spec.high:
+                raise LLMResponseError(f"{where} must be between {spec.low} and {spec.high}, got {score}")
+            return score
+        return check_score
+    if spec is int:
+        return lambda value: _coerce_int(value, where)
+    if spec in (str, dict):
+        def check_type(value):
+            if not isinstance(value, spec):
+                raise LLMResponseError(f"Expected {'a string' if spec is str else 'a JSON object'} for {where}")
+            return value
+        return check_type
+    raise TypeError(f"Unsupported schema spec: {spec!r}")
+
+
+MATCH_RESULT_FIELDS = {
+    'match_score': Score(0, 100),
+    'missing_skills': [str],
+    'summary': str,
+}
+
+# Stray list items (a skill given as a number, an education entry given as a
+# sentence) are dropped rather than losing the whole parse
+RESUME_SCHEMA = compile_schema({
+    'name': str,
+    'skills': Filtered(str),
+    'education': Filtered(dict),
+    'work_experience': Filtered(dict),
+})
+MATCH_SCHEMA = compile_schema(MATCH_RESULT_FIELDS)
+PACKED_MATCH_ENTRY_SCHEMA = compile_schema({'job_id': int, **MATCH_RESULT_FIELDS})
+COVER_LETTER_SCHEMA = compile_schema({'cover_letter': str})
+
+
+def strip_fences(text: str) -> str:
+    """Remove a surrounding Markdown code fence (```json ... ```)."""
+    text = text.strip()
+    if text.startswith('```'):
+        # Drop the opening fence and its language tag
+        newline = text.find('\n')
+        text = text[newline + 1:] if newline != -1 else text[3:]
+        if text.rstrip().endswith('```'):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing bracket, skipping over string literals."""
+    out = []
+    comma = None  # index in ``out`` of a comma followed only by whitespace so far
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string, comma = True, None
+        elif char == ',':
+            comma = len(out)
+        elif char in '}]':
+            if comma is not None:
+                del out[comma]
+                comma = None
+        elif not char.isspace():
+            comma = None
+        out.append(char)
+    return ''.join(out)
+
+
+def _repair(text: str) -> str:
+    # Keep the outermost object or array, dropping any prose around it
+    starts = [i for i in (text.find('{'), text.find('[')) if i != -1]
+    if starts:
+        start = min(starts)
+        end = text.rfind('}' if text[start] == '{' else ']')
+        if end > start:
+            text = text[start:end + 1]
+    return _strip_trailing_commas(text)
+
+
+def decode_llm_json(text: Optional[str], schema: Optional[Callable] = None):
+    """Decode an LLM answer and, with ``schema``, validate it; raises ``LLMResponseError``."""
+    if not text or not text.strip():
+        raise LLMResponseError("Empty response from Gemini API")
+    text = strip_fences(text)
+    try:
+        data = loads(text)
+    except ValueError:
+        try:
+            # strict=False lets raw newlines and tabs inside strings through
+            data = json.loads(_repair(text), strict=False)
+        except ValueError as e:
+            raise LLMResponseError(f"Failed to parse JSON response: {str(e)}")
+    return schema(data) if schema is not None else data
@@ -0,0 +1,350 @@
+"""Rule-based fast path for parsing well-structured resumes without the LLM.
+
+Resumes with clear "Skills", "Education" and "Experience" headings are split
+into sections with precompiled heading patterns. Skills are found with an
+Aho-Corasick automaton over the skill alias table, so the whole section is
+scanned in one pass regardless of dictionary size and every hit is reported
+under its canonical name. The result has the same
+schema as ``services.parse_resume`` plus a confidence score; callers fall back
+to the LLM when the score is low or a field is missing.
+"""
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from .skills import canonicalize, get_alias_table, normalize_key
+
+DEFAULT_LOCAL_PARSER_SETTINGS = {
+    'ENABLED': True,
+    'CONFIDENCE_THRESHOLD': 0.8,
+}
+
+# Weight of each field in the overall confidence score
+FIELD_WEIGHTS = {
+    'name': 0.2,
+    'skills': 0.3,
+    'education': 0.2,
+    'work_experience': 0.3,
+}
+
+SECTION_PATTERNS = {
+    'skills': re.compile(
+        r'^(technical\s+|core\s+|key\s+)?(skills|competencies|skill\s+set|technologies|tech\s+stack)'
+        r'(\s*(&|and)\s*\w+)?$', re.I),
+    'education': re.compile(r'^(education|academic\s+background|academics|qualifications)'
+                            r'(\s*(&|and)\s*\w+)?$', re.I),
+    'work_experience': re.compile(
+        r'^((work|professional|relevant)\s+)?(experience|employment(\s+history)?|work\s+history|career\s+history)$',
+        re.I),
+    # Headings that end one of the sections above without being parsed themselves
+    'other': re.compile(
+        r'^(summary|profile|objective|about(\s+me)?|projects?|certifications?|licenses|languages|interests|'
+        r'hobbies|awards|honou?rs|publications|references|volunteer(ing)?(\s+experience)?|achievements|contact)$',
+        re.I),
+}
+
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+DURATION_PATTERN = re.compile(
+    rf'((?:{_MONTH}\s+|\d{{1,2}}/)?(?:19|20)\d\d\s*(?:-|–|—|to)\s*'
+    rf'(?:(?:{_MONTH}\s+|\d{{1,2}}/)?(?:19|20)\d\d|present|current|now|today))',
+    re.I)
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d\d\b')
+DEGREE_PATTERN = re.compile(
+    r"\b(bachelor(?:'s)?|master(?:'s)?|b\.?\s?sc?\.?|m\.?\s?sc?\.?|b\.?a\.?|m\.?a\.?|mba|ph\.?d\.?|b\.?eng|m\.?eng|"
+    r"b\.?tech|m\.?tech|associate(?:'s)?|diploma|doctor(?:ate)?)\b", re.I)
+INSTITUTION_PATTERN = re.compile(r'\b(university|college|institute|school|academy|polytechnic)\b', re.I)
+POSITION_PATTERN = re.compile(
+    r'\b(engineer|developer|manager|analyst|lead|intern|designer|scientist|consultant|director|architect|'
+    r'specialist|administrator|officer|coordinator|assistant|programmer|head|vp|president|founder|researcher)\b',
+    re.I)
+BULLET_PATTERN = re.compile(r'^\s*[-•*▪◦·]\s*')
+NAME_PATTERN = re.compile(r"^[A-Za-zÀ-ÿ][A-Za-zÀ-ÿ.'\-]*(\s+[A-Za-zÀ-ÿ][A-Za-zÀ-ÿ.'\-]*){1,3}$")
+# No '/': it joins single skills such as CI/CD or TCP/IP
+LIST_SPLIT = re.compile(r'\s*[,;|•·]\s*|\s{2,}')
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every dictionary entry in a text in one pass."""
+
+    def __init__(self, patterns: Dict[str, str]):
+        # patterns maps lowercase pattern -> value reported on a match
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        for pattern, value in patterns.items():
+            self._add(pattern, value)
+        self._build()
+
+    def _add(self, pattern: str, value: str):
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(pattern), value))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield ``(start, end, value)`` for every occurrence, in order of end position."""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._output[state]:
+                yield index - length + 1, index + 1, value
+
+
+def _is_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    return not before.isalnum() and not after.isalnum()
+
+
+def find_skill_spans(automaton: AhoCorasick, text: str) -> List[Tuple[int, int, str]]:
+    """Return ``(start, end, skill)`` for each dictionary match in ``text``; overlapping matches keep the longest."""
+    lowered = text.lower()
+    matches = [m for m in automaton.iter_matches(lowered) if _is_boundary(lowered, m[0], m[1])]
+    # Prefer longer matches ("React Native" over "React") when they overlap
+    matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+    spans, covered_until = [], -1
+    for match in matches:
+        if match[0] < covered_until:
+            continue
+        covered_until = match[1]
+        spans.append(match)
+    return spans
+
+
+def find_skills(automaton: AhoCorasick, text: str) -> List[str]:
+    """Return dictionary skills found in ``text``, longest match wins, in order of appearance."""
+    skills = []
+    for _, _, value in find_skill_spans(automaton, text):
+        if value not in skills:
+            skills.append(value)
+    return skills
+
+
+def skill_patterns() -> Dict[str, str]:
+    """Every canonical skill and alias, normalized, mapped to its canonical name."""
+    patterns = {}
+    for canonical, aliases in get_alias_table().items():
+        patterns[normalize_key(canonical)] = canonical
+        for alias in aliases:
+            patterns[normalize_key(alias)] = canonical
+    return patterns
+
+
+_automaton: Optional[AhoCorasick] = None
+_automaton_table = None
+
+
+def get_skill_automaton() -> AhoCorasick:
+    global _automaton, _automaton_table
+    table = get_alias_table()
+    # Rebuilt when the alias table is reloaded
+    if _automaton is None or _automaton_table is not table:
+        _automaton, _automaton_table = AhoCorasick(skill_patterns()), table
+    return _automaton
+
+
+@dataclass
+class LocalParseResult:
+    data: Dict
+    confidence: float
+    field_scores: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def missing_fields(self) -> List[str]:
+        return [name for name in FIELD_WEIGHTS if not self.data.get(name)]
+
+    def is_acceptable(self, threshold: float) -> bool:
+        return not self.missing_fields and self.confidence >= threshold
+
+
+def local_parser_settings() -> Dict:
+    return {**DEFAULT_LOCAL_PARSER_SETTINGS, **getattr(settings, 'LOCAL_RESUME_PARSER', {})}
+
+
+def split_sections(lines: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Split resume lines into a header and sections keyed by section name."""
+    header: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for line in lines:
+        heading = line.strip().rstrip(':').strip()
+        section = None
+        if heading and len(heading) <= 40:
+            for name, pattern in SECTION_PATTERNS.items():
+                if pattern.match(heading):
+                    section = name
+                    break
+        if section:
+            current = sections.setdefault(section, []) if section != 'other' else []
+            continue
+        if current is None:
+            header.append(line)
+        else:
+            current.append(line)
+    return header, sections
+
+
+def parse_name(header: List[str]) -> str:
+    for line in header:
+        line = line.strip()
+        if not line:
+            continue
+        if '@' not in line and not any(c.isdigit() for c in line) and NAME_PATTERN.match(line):
+            return line
+        # Only look at the first few meaningful lines
+        if len(line) > 60:
+            break
+    return ''
+
+
+def parse_skills(lines: List[str]) -> List[str]:
+    automaton = get_skill_automaton()
+    skills = find_skills(automaton, '\n'.join(lines))
+    known = {skill.lower() for skill in skills}
+    for line in lines:
+        line = BULLET_PATTERN.sub('', line)
+        # "Languages: Python, Go" style lines list skills after a label
+        if ':' in line:
+            line = line.split(':', 1)[1]
+        # Cut out the dictionary matches so only the unknown items are left to split
+        for start, end, _ in reversed(find_skill_spans(automaton, line)):
+            line = line[:start] + ',' + line[end:]
+        for item in LIST_SPLIT.split(line):
+            item = item.strip(' ./')
+            if not item or len(item) > 40 or len(item.split()) > 4:
+                continue
+            item = canonicalize(item)
+            if item.lower() not in known:
+                known.add(item.lower())
+                skills.append(item)
+    return skills
+
+
+def parse_education(lines: List[str]) -> List[Dict]:
+    entries = []
+    for line in lines:
+        line = BULLET_PATTERN.sub('', line).strip()
+        if not line:
+            continue
+        degree = DEGREE_PATTERN.search(line)
+        institution = INSTITUTION_PATTERN.search(line)
+        if not degree and not institution:
+            continue
+        parts = [p.strip() for p in re.split(r'\s*(?:,|\||\s-\s|\s–\s|\s—\s)\s*', line) if p.strip()]
+        entry = {'degree': '', 'institution': '', 'year': ''}
+        years = YEAR_PATTERN.findall(line)
+        if years:
+            entry['year'] = years[-1]
+        for part in parts:
+            if not entry['institution'] and INSTITUTION_PATTERN.search(part):
+                entry['institution'] = YEAR_PATTERN.sub('', part).strip(' ()')
+            elif not entry['degree'] and DEGREE_PATTERN.search(part):
+                entry['degree'] = YEAR_PATTERN.sub('', part).strip(' ()')
+        if entry['degree'] or entry['institution']:
+            entries.append(entry)
+    return entries
+
+
+def _parse_role_header(line: str) -> Dict:
+    duration_match = DURATION_PATTERN.search(line)
+    duration = duration_match.group(1).strip() if duration_match else ''
+    rest = DURATION_PATTERN.sub('', line).strip(' ,|()-–—')
+    position = company = ''
+    if re.search(r'\s+at\s+', rest, re.I):
+        position, company = re.split(r'\s+at\s+', rest, maxsplit=1, flags=re.I)
+    else:
+        parts = [p.strip() for p in re.split(r'\s*(?:,|\||\s-\s|\s–\s|\s—\s)\s*', rest) if p.strip()]
+        for part in parts:
+            if not position and POSITION_PATTERN.search(part):
+                position = part
+            elif not company:
+                company = part
+    return {
+        'company': company.strip(' ,|()'),
+        'position': position.strip(' ,|()'),
+        'duration': duration,
+        'description': '',
+    }
+
+
+def parse_work_experience(lines: List[str]) -> List[Dict]:
+    entries: List[Dict] = []
+    description: List[str] = []
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        is_bullet = bool(BULLET_PATTERN.match(raw))
+        is_title_line = len(line) <= 80 and not line.endswith('.') and POSITION_PATTERN.search(line)
+        if not is_bullet and (DURATION_PATTERN.search(line) or re.search(r'\s+at\s+', line, re.I) or is_title_line):
+            entry = _parse_role_header(line)
+            if entries and not entries[-1]['duration'] and not description and not entry['position']:
+                # Company and/or dates on their own line, following the position line
+                entries[-1]['duration'] = entry['duration']
+                entries[-1]['company'] = entries[-1]['company'] or entry['company']
+                continue
+            if entries:
+                entries[-1]['description'] = ' '.join(description)
+            entries.append(entry)
+            description = []
+        elif entries:
+            description.append(BULLET_PATTERN.sub('', line))
+    if entries:
+        entries[-1]['description'] = ' '.join(description)
+    return entries
+
+
+def _score(data: Dict) -> Dict[str, float]:
+    skills = len(data['skills'])
+    education = data['education']
+    experience = data['work_experience']
+    return {
+        'name': 1.0 if data['name'] else 0.0,
+        'skills': 1.0 if skills >= 3 else 0.5 if skills else 0.0,
+        'education': (
+            sum(1.0 if e['degree'] and e['institution'] else 0.5 for e in education) / len(education)
+            if education else 0.0
+        ),
+        'work_experience': (
+            sum((bool(e['position']) + bool(e['company']) + bool(e['duration'])) / 3.0 for e in experience)
+            / len(experience) if experience else 0.0
+        ),
+    }
+
+
+def parse_resume_locally(text: str) -> LocalParseResult:
+    """Parse a resume with heading rules and the skill dictionary, with a confidence score."""
+    header, sections = split_sections(text.splitlines())
+    data = {
+        'name': parse_name(header),
+        'skills': parse_skills(sections.get('skills', [])),
+        'education': parse_education(sections.get('education', [])),
+        'work_experience': parse_work_experience(sections.get('work_experience', [])),
+    }
+    scores = _score(data)
+    confidence = sum(FIELD_WEIGHTS[name] * score for name, score in scores.items())
+    return LocalParseResult(data=data, confidence=round(confidence, 3), field_scores=scores)
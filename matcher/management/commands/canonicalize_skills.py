@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from matcher import skills
+from matcher.models import CandidateProfile, JobPosting
+from matcher.rematch import enqueue_for_candidates, enqueue_for_jobs
+
+
+class Command(BaseCommand):
+    help = 'Recompute canonical skill arrays for all candidates and job postings from the alias table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='rows read and updated per batch')
+
+    def handle(self, *args, **options):
+        skills.reload()
+        batch_size = options['batch_size']
+        targets = [
+            (CandidateProfile, 'skills', 'canonical_skills', enqueue_for_candidates),
+            (JobPosting, 'required_skills', 'canonical_required_skills', enqueue_for_jobs),
+        ]
+        for model, source, derived, enqueue in targets:
+            changed, queued = self.backfill(model, source, derived, enqueue, batch_size)
+            self.stdout.write(f"{model.__name__}: updated {changed} rows; queued {queued} pairs for re-matching")
+
+    def backfill(self, model, source, derived, enqueue, batch_size):
+        changed = queued = 0
+        pending = []
+        rows = model.objects.only('id', source, derived).order_by('id').iterator(chunk_size=batch_size)
+        for obj in rows:
+            canonical = skills.canonicalize_skills(getattr(obj, source))
+            if canonical != getattr(obj, derived):
+                setattr(obj, derived, canonical)
+                pending.append(obj)
+            if len(pending) >= batch_size:
+                queued += self.write_batch(model, pending, derived, enqueue)
+                changed += len(pending)
+                pending = []
+        if pending:
+            queued += self.write_batch(model, pending, derived, enqueue)
+            changed += len(pending)
+        return changed, queued
+
+    def write_batch(self, model, objs, derived, enqueue):
+        # bulk_update skips post_save, so the matches scored on the old skills are queued here
+        with transaction.atomic():
+            model.objects.bulk_update(objs, [derived])
+            return enqueue(obj.id for obj in objs)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from matcher.bulk_io import FORMATS, RESOURCES, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Export all jobs, candidates or matches as JSONL or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(RESOURCES))
+        parser.add_argument('--format', choices=FORMATS, default='jsonl')
+        parser.add_argument('--output', help='file to write (default: standard output)')
+
+    def handle(self, *args, **options):
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as fh:
+                for text in export_lines(options['kind'], options['format']):
+                    fh.write(text)
+        else:
+            for text in export_lines(options['kind'], options['format']):
+                self.stdout.write(text, ending='')
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from matcher.models import JobPosting
+from matcher.rematch import enqueue_for_jobs
+
+
+class Command(BaseCommand):
+    help = 'Recompute the structured requirement profile of every job posting.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='rows read and updated per batch')
+        parser.add_argument('--missing-only', action='store_true', help='only postings without a profile yet')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        jobs = JobPosting.objects.order_by('id')
+        if options['missing_only']:
+            jobs = jobs.filter(requirements={})
+        updated = queued = 0
+        pending = []
+        for job in jobs.iterator(chunk_size=batch_size):
+            before = (job.canonical_required_skills, job.requirements)
+            job.prepare_derived_fields()
+            if (job.canonical_required_skills, job.requirements) != before:
+                pending.append(job)
+            if len(pending) >= batch_size:
+                queued += self.write_batch(pending)
+                updated += len(pending)
+                pending = []
+        if pending:
+            queued += self.write_batch(pending)
+            updated += len(pending)
+        self.stdout.write(
+            f"Updated requirement profiles of {updated} job postings; queued {queued} pairs for re-matching")
+
+    def write_batch(self, jobs):
+        # bulk_update skips post_save, so the matches scored on the old profile are queued here
+        with transaction.atomic():
+            JobPosting.objects.bulk_update(jobs, ['canonical_required_skills', 'requirements'])
+            return enqueue_for_jobs(job.id for job in jobs)
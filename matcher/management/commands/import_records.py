@@ -0,0 +1,26 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from matcher.bulk_io import FORMATS, RESOURCES, detect_format, import_records, read_records
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import jobs, candidates or matches from a JSONL or CSV file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(RESOURCES))
+        parser.add_argument('path', help='file to import')
+        parser.add_argument('--format', choices=FORMATS, help='file format (default: from the extension)')
+        parser.add_argument('--batch-size', type=int, help='rows validated and inserted per batch')
+
+    def handle(self, *args, **options):
+        try:
+            fmt = detect_format(options['path'], options['format'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        with open(options['path'], 'rb') as fh:
+            report = import_records(options['kind'], read_records(fh, fmt, options['kind']), options['batch_size'])
+        for error in report['errors']:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        self.stdout.write(f"Imported {report['created']} {options['kind']}, skipped {report['invalid']} invalid rows")
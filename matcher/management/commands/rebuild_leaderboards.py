@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from matcher.leaderboards import rebuild_board
+from matcher.models import JobMatch
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the top-candidate and top-job leaderboards from existing matches.'
+
+    def handle(self, *args, **options):
+        job_ids = JobMatch.objects.values_list('job_id', flat=True).distinct()
+        candidate_ids = JobMatch.objects.values_list('candidate_id', flat=True).distinct()
+        entries = 0
+        for job_id in job_ids.iterator():
+            entries += rebuild_board('job', job_id)
+        for candidate_id in candidate_ids.iterator():
+            entries += rebuild_board('candidate', candidate_id)
+        self.stdout.write(f"Rebuilt leaderboards with {entries} entries")
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from matcher.blobs import open_blob
+from matcher.dedup import index_resume, minhash_signature, resume_identity
+from matcher.models import CandidateProfile
+from matcher.services import parse_resume
+from matcher.views import extract_text
+
+PARSED_FIELDS = ('name', 'skills', 'education', 'work_experience')
+
+
+class Command(BaseCommand):
+    help = 'Re-extract text from stored resume files, refreshing fingerprints and optionally re-parsing profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidate', type=int, action='append', help='only this candidate id (repeatable)')
+        parser.add_argument('--reparse', action='store_true', help='also re-parse the text and update changed fields')
+
+    def handle(self, *args, **options):
+        candidates = CandidateProfile.objects.filter(resume_blob__isnull=False).select_related('resume_blob')
+        if options['candidate']:
+            candidates = candidates.filter(id__in=options['candidate'])
+        processed = updated = failed = 0
+        for candidate in candidates.order_by('id').iterator(chunk_size=100):
+            blob = candidate.resume_blob
+            try:
+                with open_blob(blob.sha256) as content:
+                    text = extract_text(blob.filename, content)
+                parsed = parse_resume(text) if options['reparse'] else {}
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Candidate {candidate.id}: {str(e)}")
+                continue
+            changed = [field for field in PARSED_FIELDS if field in parsed and parsed[field] != getattr(candidate, field)]
+            with transaction.atomic():
+                for field in changed:
+                    setattr(candidate, field, parsed[field])
+                if changed:
+                    candidate.save(update_fields=changed)
+                    updated += 1
+                index_resume(candidate, minhash_signature(text), resume_identity(text))
+            processed += 1
+        self.stdout.write(f"Re-extracted {processed} resumes, updated {updated} profiles, {failed} failed")
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from matcher.rematch import process_due_pairs, rematch_settings, requeue_provisional_matches, retry_failed_pairs
+from matcher.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Re-score stale (candidate, job) pairs queued after candidates or jobs changed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='process the due pairs once and exit')
+        parser.add_argument('--batch-size', type=int, help='pairs claimed per pass')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='queue pairs that used up their attempts for another round first')
+        parser.add_argument('--requeue-provisional', action='store_true',
+                            help='queue provisional matches whose background LLM call was lost (e.g. after a restart)')
+
+    def handle(self, *args, **options):
+        config = rematch_settings()
+        batch_size = options['batch_size'] or config['BATCH_SIZE']
+        if options['retry_failed']:
+            self.stdout.write(f"Queued {retry_failed_pairs()} failed pairs for another round")
+        if options['requeue_provisional']:
+            self.stdout.write(f"Queued {requeue_provisional_matches()} provisional pairs for re-matching")
+        if not options['once']:
+            warm_up()
+        while True:
+            counts = process_due_pairs(batch_size)
+            if any(counts.values()):
+                self.stdout.write(
+                    f"Re-scored {counts['local']} pairs locally, {counts['llm']} with the LLM, "
+                    f"{counts['failed']} failed")
+            if options['once']:
+                return
+            close_old_connections()
+            if sum(counts.values()) < batch_size:
+                time.sleep(config['POLL_INTERVAL'])
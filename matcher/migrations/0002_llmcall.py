@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMCall',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('operation', models.CharField(max_length=64)),
+                ('model_name', models.CharField(max_length=64)),
+                ('prompt_tokens', models.IntegerField(default=0)),
+                ('response_tokens', models.IntegerField(default=0)),
+                ('latency_ms', models.FloatField()),
+                ('outcome', models.CharField(choices=[('success', 'Success'), ('error', 'Error')], max_length=16)),
+                ('cache_status', models.CharField(choices=[('miss', 'Miss'), ('coalesced', 'Coalesced')], max_length=16)),
+                ('cost_usd', models.FloatField(default=0.0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['operation', 'created_at'], name='matcher_llm_operati_bb1537_idx')],
+            },
+        ),
+    ]
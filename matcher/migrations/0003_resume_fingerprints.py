@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0002_llmcall'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fingerprint', to='matcher.candidateprofile')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResumeLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(db_index=True, max_length=32)),
+                ('fingerprint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='matcher.resumefingerprint')),
+            ],
+        ),
+    ]
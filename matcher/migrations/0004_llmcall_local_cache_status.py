@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0003_resume_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='llmcall',
+            name='cache_status',
+            field=models.CharField(choices=[('miss', 'Miss'), ('coalesced', 'Coalesced'), ('local', 'Local parser')], max_length=16),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0004_llmcall_local_cache_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='canonical_skills',
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='canonical_required_skills',
+            field=models.JSONField(default=list, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0005_canonical_skills'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='requirements',
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0006_job_requirements'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobmatch',
+            name='is_stale',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='jobmatch',
+            name='score_source',
+            field=models.CharField(choices=[('llm', 'LLM'), ('local', 'Local scoring')], default='llm', max_length=8),
+        ),
+        migrations.CreateModel(
+            name='DirtyMatchPair',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('due_at', models.DateTimeField(db_index=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='matcher.candidateprofile')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='matcher.jobposting')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('candidate', 'job'), name='unique_dirty_match_pair')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0007_rematch_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('job', 'Top candidates for a job'), ('candidate', 'Top jobs for a candidate')], max_length=10)),
+                ('owner_id', models.BigIntegerField()),
+                ('member_id', models.BigIntegerField()),
+                ('match_score', models.IntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobmatch',
+            index=models.Index(fields=['job', '-match_score'], name='jobmatch_job_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobmatch',
+            index=models.Index(fields=['candidate', '-match_score'], name='jobmatch_candidate_score_idx'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='match',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='matcher.jobmatch'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['board', 'owner_id', '-match_score', '-match'], name='leaderboard_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('board', 'owner_id', 'member_id'), name='unique_leaderboard_member'),
+        ),
+    ]
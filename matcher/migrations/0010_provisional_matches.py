@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0009_resume_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobmatch',
+            name='is_provisional',
+            field=models.BooleanField(default=False),
+        ),
+    ]
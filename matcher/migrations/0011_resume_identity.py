@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0010_provisional_matches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumefingerprint',
+            name='identity',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
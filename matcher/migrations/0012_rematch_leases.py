@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0011_resume_identity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dirtymatchpair',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dirtymatchpair',
+            name='failed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='dirtymatchpair',
+            name='last_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -1,11 +1,43 @@
 # matcher/models.py
 from django.db import models
 
+from .requirements import extract_requirements
+from .skills import canonicalize_skills
+
+
+def _with_derived_fields(kwargs, sources, derived):
+    """Make sure derived columns are written whenever one of their source columns is."""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and set(sources) & set(update_fields):
+        kwargs['update_fields'] = {*update_fields, *derived}
+    return kwargs
+
+class ResumeBlob(models.Model):
+    """An original resume file in the content-addressed store (see ``matcher.blobs``)."""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    size = models.BigIntegerField()
+    filename = models.CharField(max_length=255)  # name of the first upload; gives the file type
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.sha256[:12]})"
+
 class CandidateProfile(models.Model):
     name = models.CharField(max_length=255)
     skills = models.JSONField()  # Store skills as a list of strings
+    canonical_skills = models.JSONField(default=list, editable=False)  # skills mapped through the alias table
     education = models.JSONField()  # Store education details as a list of dictionaries
     work_experience = models.JSONField()  # Store work experience as a list of dictionaries
+    resume_blob = models.ForeignKey(
+        ResumeBlob, null=True, blank=True, on_delete=models.SET_NULL, related_name='candidates')
+
+    def prepare_derived_fields(self):
+        """Recompute the columns derived from the raw fields (also used before bulk_create)."""
+        self.canonical_skills = canonicalize_skills(self.skills)
+
+    def save(self, *args, **kwargs):
+        self.prepare_derived_fields()
+        super().save(*args, **_with_derived_fields(kwargs, ['skills'], ['canonical_skills']))
 
     def __str__(self):
         return self.name
@@ -14,17 +46,152 @@ class JobPosting(models.Model):
     title = models.CharField(max_length=255)
     company = models.CharField(max_length=255)
     required_skills = models.JSONField()  # Store required skills as a list of strings
+    canonical_required_skills = models.JSONField(default=list, editable=False)
     description = models.TextField()
+    # Compact profile extracted from the posting on save: must_have,
+    # nice_to_have, mentioned, seniority and min_years_experience
+    requirements = models.JSONField(default=dict, editable=False)
+
+    def prepare_derived_fields(self):
+        """Recompute the columns derived from the posting text (also used before bulk_create)."""
+        self.canonical_required_skills = canonicalize_skills(self.required_skills)
+        self.requirements = extract_requirements(self.title, self.description, self.required_skills)
+
+    def save(self, *args, **kwargs):
+        self.prepare_derived_fields()
+        super().save(*args, **_with_derived_fields(
+            kwargs,
+            ['title', 'description', 'required_skills'],
+            ['canonical_required_skills', 'requirements'],
+        ))
+
+    def match_profile(self) -> dict:
+        """What match prompts see of the job: the requirement profile instead of the full description."""
+        if not self.requirements:
+            # Not processed yet (e.g. bulk-inserted); fall back to the raw text
+            return {
+                'title': self.title,
+                'company': self.company,
+                'required_skills': self.required_skills,
+                'description': self.description,
+            }
+        return {'title': self.title, 'company': self.company, **self.requirements}
 
     def __str__(self):
         return f"{self.title} at {self.company}"
 
 class JobMatch(models.Model):
+    SCORE_SOURCE_CHOICES = [
+        ('llm', 'LLM'),
+        ('local', 'Local scoring'),
+    ]
+
     candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE)
     job = models.ForeignKey(JobPosting, on_delete=models.CASCADE)
     match_score = models.IntegerField()
     missing_skills = models.JSONField()  # Store missing skills as a list of strings
     summary = models.TextField()
+    score_source = models.CharField(max_length=8, choices=SCORE_SOURCE_CHOICES, default='llm')
+    # Set when the candidate or job changed after scoring; cleared by the re-match worker
+    is_stale = models.BooleanField(default=False)
+    # Scored locally because the LLM missed the request deadline; upgraded when it answers
+    is_provisional = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', '-match_score'], name='jobmatch_job_score_idx'),
+            models.Index(fields=['candidate', '-match_score'], name='jobmatch_candidate_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"Match: {self.candidate} - {self.job} ({self.match_score})"
+
+
+class LeaderboardEntry(models.Model):
+    """One row of a materialized top-N board: best candidates for a job, or best jobs for a candidate."""
+    BOARD_CHOICES = [
+        ('job', 'Top candidates for a job'),
+        ('candidate', 'Top jobs for a candidate'),
+    ]
+
+    board = models.CharField(max_length=10, choices=BOARD_CHOICES)
+    owner_id = models.BigIntegerField()  # job id on a job board, candidate id on a candidate board
+    member_id = models.BigIntegerField()  # the ranked candidate or job
+    match = models.ForeignKey(JobMatch, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    match_score = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'owner_id', 'member_id'], name='unique_leaderboard_member'),
+        ]
+        indexes = [
+            models.Index(fields=['board', 'owner_id', '-match_score', '-match'], name='leaderboard_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.board} {self.owner_id}: {self.member_id} ({self.match_score})"
+
+
+class ResumeFingerprint(models.Model):
+    candidate = models.OneToOneField(CandidateProfile, on_delete=models.CASCADE, related_name='fingerprint')
+    signature = models.JSONField()  # MinHash signature of the extracted resume text
+    identity = models.CharField(max_length=32, blank=True, default='')  # dedup.resume_identity() of the text
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Fingerprint: {self.candidate}"
+
+
+class ResumeLSHBucket(models.Model):
+    fingerprint = models.ForeignKey(ResumeFingerprint, on_delete=models.CASCADE, related_name='buckets')
+    key = models.CharField(max_length=32, db_index=True)  # "<band>:<hash of band values>"
+
+    def __str__(self):
+        return self.key
+
+class DirtyMatchPair(models.Model):
+    """A (candidate, job) pair whose matches must be re-scored once ``due_at`` passes."""
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE)
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE)
+    due_at = models.DateTimeField(db_index=True)  # end of the lease while claimed_at is set
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    failed = models.BooleanField(default=False)  # gave up after MAX_ATTEMPTS; not claimed again
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['candidate', 'job'], name='unique_dirty_match_pair'),
+        ]
+
+    def __str__(self):
+        return f"Dirty: {self.candidate_id} - {self.job_id}"
+
+
+class LLMCall(models.Model):
+    OUTCOME_CHOICES = [
+        ('success', 'Success'),
+        ('error', 'Error'),
+    ]
+    CACHE_STATUS_CHOICES = [
+        ('miss', 'Miss'),
+        ('coalesced', 'Coalesced'),
+        ('local', 'Local parser'),  # served without calling the LLM
+    ]
+
+    operation = models.CharField(max_length=64)
+    model_name = models.CharField(max_length=64)
+    prompt_tokens = models.IntegerField(default=0)
+    response_tokens = models.IntegerField(default=0)
+    latency_ms = models.FloatField()
+    outcome = models.CharField(max_length=16, choices=OUTCOME_CHOICES)
+    cache_status = models.CharField(max_length=16, choices=CACHE_STATUS_CHOICES)
+    cost_usd = models.FloatField(default=0.0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['operation', 'created_at'])]
 
     def __str__(self):
-        return f"Match: {self.candidate} - {self.job} ({self.match_score})"
\ No newline at end of file
+        return f"{self.operation} ({self.outcome}, {self.latency_ms:.0f} ms)"
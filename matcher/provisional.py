@@ -0,0 +1,163 @@
+"""Deadline-bounded matching with provisional local results.
+
+The LLM call runs on a small background pool. If it answers within the
+request's deadline its result is used as usual; otherwise the request gets a
+locally scored ``JobMatch`` flagged ``is_provisional`` straight away, and the
+LLM answer replaces it when it lands. Response time is then bounded by the
+deadline plus local scoring, not by the provider.
+
+At most ``MAX_PENDING`` LLM calls wait in the background. When that backlog is
+full, or a background call fails, the provisional match is marked stale and
+its pair goes to the re-match queue (``matcher.rematch``) instead.
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MATCH_DEADLINE_SETTINGS = {
+    'DEFAULT_MS': None,  # no deadline unless the request asks for one
+    'MAX_MS': 30000,
+    'BACKGROUND_WORKERS': 4,
+    'MAX_PENDING': 16,  # background LLM calls running or queued; beyond this the rematch queue takes over
+}
+
+DEADLINE_HEADER = 'X-Match-Deadline-Ms'
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending_slots: Optional[threading.BoundedSemaphore] = None
+_executor_lock = threading.Lock()
+
+
+def match_deadline_settings() -> Dict:
+    return {**DEFAULT_MATCH_DEADLINE_SETTINGS, **getattr(settings, 'MATCH_DEADLINE', {})}
+
+
+def resolve_deadline(header_value: Optional[str]) -> Optional[float]:
+    """Deadline in seconds from the request header or the default setting; ``None`` means wait."""
+    config = match_deadline_settings()
+    value = config['DEFAULT_MS'] if header_value in (None, '') else header_value
+    if value is None:
+        return None
+    try:
+        deadline_ms = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {DEADLINE_HEADER} '{value}', expected milliseconds")
+    if deadline_ms <= 0:
+        raise ValueError(f"{DEADLINE_HEADER} must be positive")
+    return min(deadline_ms, config['MAX_MS']) / 1000.0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _pending_slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                config = match_deadline_settings()
+                _pending_slots = threading.BoundedSemaphore(config['MAX_PENDING'])
+                _executor = ThreadPoolExecutor(
+                    max_workers=config['BACKGROUND_WORKERS'], thread_name_prefix='match-llm')
+    return _executor
+
+
+def _submit(fn, *args) -> Optional[Future]:
+    """Run ``fn`` on the pool, or return ``None`` when the backlog is full."""
+    executor = _get_executor()
+    if not _pending_slots.acquire(blocking=False):
+        return None
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        _pending_slots.release()
+        raise
+    future.add_done_callback(lambda done: _pending_slots.release())
+    return future
+
+
+def _call_llm(candidate_data: Dict, job_data: Dict) -> Dict:
+    from .services import match_candidate_to_job
+
+    try:
+        return match_candidate_to_job(candidate_data, job_data)
+    finally:
+        # Pool threads outlive requests; don't keep a connection they may never reuse
+        connection.close()
+
+
+def score_with_deadline(candidate, job, deadline: float) -> Tuple[Dict, bool, Optional[Future]]:
+    """Score a pair with the LLM, falling back to local scoring after ``deadline`` seconds.
+
+    Returns ``(result, provisional, future)``: the LLM result when it answered
+    in time, otherwise the local result and the still-running LLM future, or
+    ``None`` when the background backlog was full.
+    """
+    from .scoring import score_match_locally
+    from .serializers import CandidateProfileSerializer
+
+    future = _submit(_call_llm, CandidateProfileSerializer(candidate).data, job.match_profile())
+    if future is None:
+        logger.warning(f"Background LLM backlog full; scoring candidate {candidate.id} and job {job.id} locally")
+        return score_match_locally(candidate, job), True, None
+    try:
+        return future.result(timeout=deadline), False, None
+    except TimeoutError:
+        logger.info(f"LLM missed the {deadline:.2f}s deadline for candidate {candidate.id} and job {job.id}")
+        return score_match_locally(candidate, job), True, future
+
+
+def upgrade_when_done(match, future: Optional[Future]):
+    """Replace a provisional match with the LLM result once ``future`` completes.
+
+    Without a future, or if the call fails, the pair is re-scored by the re-match worker.
+    """
+    if future is None:
+        _hand_to_rematch(match.id, match.candidate_id, match.job_id)
+        return
+    future.add_done_callback(lambda done: _schedule_upgrade(match.id, match.candidate_id, match.job_id, done))
+
+
+def _schedule_upgrade(match_id: int, candidate_id: int, job_id: int, future: Future):
+    # The callback may run inline on the request thread; the upgrade itself always runs on the pool
+    try:
+        _get_executor().submit(_upgrade, match_id, candidate_id, job_id, future)
+    except RuntimeError as e:  # interpreter shutting down
+        logger.error(f"Could not upgrade provisional match {match_id}: {str(e)}")
+
+
+def _hand_to_rematch(match_id: int, candidate_id: int, job_id: int):
+    from .models import JobMatch
+    from .rematch import enqueue_pairs
+
+    JobMatch.objects.filter(pk=match_id, is_provisional=True).update(is_stale=True)
+    enqueue_pairs([(candidate_id, job_id)], delay_seconds=0)
+    logger.info(f"Queued provisional match {match_id} for re-matching")
+
+
+def _upgrade(match_id: int, candidate_id: int, job_id: int, future: Future):
+    from .models import JobMatch
+
+    try:
+        result = future.result()
+        match = JobMatch.objects.filter(pk=match_id, is_provisional=True).first()
+        if match is None:
+            return  # deleted, or already replaced
+        match.match_score = result['match_score']
+        match.missing_skills = result['missing_skills']
+        match.summary = result['summary']
+        match.score_source = 'llm'
+        match.is_provisional = False
+        match.save(update_fields=['match_score', 'missing_skills', 'summary', 'score_source', 'is_provisional'])
+        logger.info(f"Upgraded provisional match {match_id} with the LLM result")
+    except Exception as e:
+        logger.error(f"Could not upgrade provisional match {match_id}: {str(e)}")
+        try:
+            _hand_to_rematch(match_id, candidate_id, job_id)
+        except Exception as e:
+            logger.error(f"Could not queue provisional match {match_id} for re-matching: {str(e)}")
+    finally:
+        connection.close()
@@ -0,0 +1,197 @@
+"""Incremental re-matching of (candidate, job) pairs whose inputs changed.
+
+Edits to a candidate or job mark its existing matches stale and put the
+affected pairs in a dirty-pair queue (``DirtyMatchPair``). Each new edit
+pushes the pair's due time forward, so a burst of edits is re-scored once.
+The worker re-scores due pairs with the local scorer first and only calls the
+LLM for pairs that look promising.
+
+Workers claim a pair by leasing its row (pushing ``due_at`` past the lease
+length) and delete it only once the new score is stored, so a pair whose
+worker crashed is picked up again when the lease runs out. A pair that keeps
+failing is marked ``failed`` and stays in the queue, visible in the admin,
+until it is edited again or retried with ``rematch_worker --retry-failed``.
+"""
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .db import chunked, run_in_batches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REMATCH_SETTINGS = {
+    'DEBOUNCE_SECONDS': 30,
+    # Pairs scoring below this locally keep the local score; the rest go to the LLM
+    'LLM_MIN_LOCAL_SCORE': 40,
+    'BATCH_SIZE': 50,
+    'POLL_INTERVAL': 5.0,  # seconds between queue polls in the worker
+    'RETRY_DELAY_SECONDS': 300,
+    'MAX_ATTEMPTS': 5,
+    'LEASE_SECONDS': 600,  # a claimed pair is handed out again after this long
+    'FLUSH_EVERY': 10,  # scored pairs written per transaction
+}
+
+
+def rematch_settings() -> Dict:
+    return {**DEFAULT_REMATCH_SETTINGS, **getattr(settings, 'REMATCH', {})}
+
+
+def enqueue_pairs(pairs: Iterable[Tuple[int, int]], delay_seconds: float = None):
+    """Queue (candidate_id, job_id) pairs, pushing back the due time of pairs already queued."""
+    from .models import DirtyMatchPair
+
+    if delay_seconds is None:
+        delay_seconds = rematch_settings()['DEBOUNCE_SECONDS']
+    due_at = timezone.now() + timedelta(seconds=delay_seconds)
+    rows = [DirtyMatchPair(candidate_id=c, job_id=j, due_at=due_at) for c, j in set(pairs)]
+    if rows:
+        # A new edit also revives failed pairs and ends the lease of one being scored
+        DirtyMatchPair.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['candidate', 'job'],
+            update_fields=['due_at', 'claimed_at', 'attempts', 'failed', 'last_error'])
+    return len(rows)
+
+
+@transaction.atomic
+def enqueue_for_candidates(candidate_ids: Iterable[int]) -> int:
+    """Mark the matches of changed candidates stale and queue their pairs; returns the pairs queued."""
+    from .models import JobMatch
+
+    matches = JobMatch.objects.filter(candidate_id__in=list(candidate_ids))
+    matches.update(is_stale=True)
+    return enqueue_pairs(matches.values_list('candidate_id', 'job_id').distinct())
+
+
+@transaction.atomic
+def enqueue_for_jobs(job_ids: Iterable[int]) -> int:
+    """Mark the matches of changed job postings stale and queue their pairs; returns the pairs queued."""
+    from .models import JobMatch
+
+    matches = JobMatch.objects.filter(job_id__in=list(job_ids))
+    matches.update(is_stale=True)
+    return enqueue_pairs(matches.values_list('candidate_id', 'job_id').distinct())
+
+
+def enqueue_for_candidate(candidate_id: int):
+    queued = enqueue_for_candidates([candidate_id])
+    logger.info(f"Candidate {candidate_id} changed; queued {queued} pairs for re-matching")
+
+
+def enqueue_for_job(job_id: int):
+    queued = enqueue_for_jobs([job_id])
+    logger.info(f"Job {job_id} changed; queued {queued} pairs for re-matching")
+
+
+def _claim_due_pairs(limit: int):
+    """Lease up to ``limit`` due pairs, including pairs whose previous lease expired."""
+    from .models import DirtyMatchPair
+
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=rematch_settings()['LEASE_SECONDS'])
+    claimed = []
+    due = DirtyMatchPair.objects.filter(due_at__lte=now, failed=False).order_by('due_at')[:limit]
+    for pair in due:
+        # Only one worker moves due_at from the value it read
+        if DirtyMatchPair.objects.filter(pk=pair.pk, due_at=pair.due_at).update(due_at=lease_until, claimed_at=now):
+            pair.due_at, pair.claimed_at = lease_until, now
+            claimed.append(pair)
+    return claimed
+
+
+def _release_failed(pair, error: str, config: Dict):
+    """Retry a failed pair later, or mark it failed once ``MAX_ATTEMPTS`` is used up."""
+    from .models import DirtyMatchPair
+
+    attempts = pair.attempts + 1
+    fields = {'claimed_at': None, 'attempts': attempts, 'last_error': error[:1000]}
+    if attempts < config['MAX_ATTEMPTS']:
+        fields['due_at'] = timezone.now() + timedelta(seconds=config['RETRY_DELAY_SECONDS'])
+    else:
+        fields['failed'] = True
+        logger.error(f"Giving up on candidate {pair.candidate_id} and job {pair.job_id} after {attempts} attempts")
+    # Left alone if the pair was edited again meanwhile; the edit queued a fresh attempt
+    DirtyMatchPair.objects.filter(pk=pair.pk, due_at=pair.due_at).update(**fields)
+
+
+def requeue_provisional_matches() -> int:
+    """Queue the pairs of provisional matches, e.g. after a restart lost their background LLM calls."""
+    from .models import JobMatch
+
+    matches = JobMatch.objects.filter(is_provisional=True)
+    matches.update(is_stale=True)
+    return enqueue_pairs(matches.values_list('candidate_id', 'job_id').distinct(), delay_seconds=0)
+
+
+def retry_failed_pairs() -> int:
+    """Queue pairs marked failed for another round of attempts."""
+    from .models import DirtyMatchPair
+
+    return DirtyMatchPair.objects.filter(failed=True).update(
+        failed=False, attempts=0, due_at=timezone.now(), claimed_at=None)
+
+
+def rescore_pair(candidate, job) -> Tuple[Dict, str]:
+    """Score a pair with the cheapest tier that is good enough; return ``(result, source)``."""
+    from .scoring import score_match_locally
+    from .serializers import CandidateProfileSerializer
+    from .services import match_candidate_to_job
+
+    local = score_match_locally(candidate, job)
+    if local['match_score'] < rematch_settings()['LLM_MIN_LOCAL_SCORE']:
+        return local, 'local'
+    result = match_candidate_to_job(CandidateProfileSerializer(candidate).data, job.match_profile())
+    return result, 'llm'
+
+
+def _store_result(scored):
+    """Write a re-scored pair back to its matches."""
+    from .models import DirtyMatchPair, JobMatch
+
+    pair, result, source = scored
+    # Release the lease; if the pair was edited again while it was being scored
+    # its due_at moved, the row stays queued and the matches stay stale
+    requeued = not DirtyMatchPair.objects.filter(pk=pair.pk, due_at=pair.due_at).delete()[0]
+    for match in JobMatch.objects.filter(candidate_id=pair.candidate_id, job_id=pair.job_id):
+        match.match_score = result['match_score']
+        match.missing_skills = result['missing_skills']
+        match.summary = result['summary']
+        match.score_source = source
+        match.is_stale = requeued
+        match.is_provisional = False
+        match.save(update_fields=['match_score', 'missing_skills', 'summary', 'score_source', 'is_stale',
+                                  'is_provisional'])
+
+
+def process_due_pairs(limit: int = None) -> Dict[str, int]:
+    """Re-score due pairs and refresh their matches. Returns counts per outcome."""
+    from .models import CandidateProfile, DirtyMatchPair, JobPosting
+
+    config = rematch_settings()
+    counts = {'local': 0, 'llm': 0, 'failed': 0}
+    claimed = _claim_due_pairs(limit or config['BATCH_SIZE'])
+    # Written every few pairs: one write transaction per chunk, and a slow or
+    # failing LLM call late in the batch does not hold back earlier results
+    for chunk in chunked(claimed, config['FLUSH_EVERY']):
+        scored = []
+        for pair in chunk:
+            try:
+                candidate = CandidateProfile.objects.get(pk=pair.candidate_id)
+                job = JobPosting.objects.get(pk=pair.job_id)
+                result, source = rescore_pair(candidate, job)
+            except (CandidateProfile.DoesNotExist, JobPosting.DoesNotExist):
+                DirtyMatchPair.objects.filter(pk=pair.pk).delete()
+                continue
+            except Exception as e:
+                counts['failed'] += 1
+                logger.error(f"Re-matching candidate {pair.candidate_id} with job {pair.job_id} failed: {str(e)}")
+                _release_failed(pair, str(e), config)
+                continue
+            scored.append((pair, result, source))
+            counts[source] += 1
+        run_in_batches(scored, _store_result, batch_size=config['FLUSH_EVERY'])
+    return counts
@@ -0,0 +1,113 @@
+"""Structured requirement profiles for job postings.
+
+Computed once when a posting is saved, so match prompts and local scoring can
+use a compact list of must-have and nice-to-have skills, a seniority level and
+the years of experience asked for, instead of re-reading the full description
+on every match.
+
+Must-have skills are the posting's ``required_skills`` plus skills named in
+description sentences that explicitly require them ("must", "required").
+Skills the description merely mentions go to ``mentioned``, which local
+scoring weighs less.
+"""
+import re
+from typing import Dict, List, Optional
+
+from .local_parser import AhoCorasick, find_skill_spans, get_skill_automaton
+from .skills import canonicalize_skills
+
+SENIORITY_LEVELS = ['intern', 'junior', 'mid', 'senior', 'lead', 'principal']
+
+SENIORITY_PATTERNS = [
+    ('intern', re.compile(r'\b(intern|internship|trainee)\b', re.I)),
+    ('principal', re.compile(r'\b(principal|distinguished|director|head of|vp)\b', re.I)),
+    ('lead', re.compile(r'\b(lead|staff|manager|architect)\b', re.I)),
+    ('senior', re.compile(r'\b(senior|sr\.?)\b', re.I)),
+    ('junior', re.compile(r'\b(junior|jr\.?|entry[\s-]level|graduate)\b', re.I)),
+    ('mid', re.compile(r'\b(mid[\s-]?level|intermediate)\b', re.I)),
+]
+
+NICE_TO_HAVE = re.compile(
+    r'\b(nice to have|nice-to-have|preferred|a plus|bonus|desirable|ideally|familiarity with|good to have)\b', re.I)
+REQUIRED = re.compile(r'\b(must|required|requirements?|mandatory|essential)\b', re.I)
+# Aliases that are also everyday words or bare letters ("we go fast", "express
+# ideas"): in prose they only count when spelled like the skill or in a list
+AMBIGUOUS_ALIASES = {'go': 'Go', 'express': 'Express', 'tf': 'TF', 'ml': 'ML', 'dl': 'DL', 'r': 'R', 'c': 'C'}
+LIST_SEPARATORS = ',;/|()'
+# Only years of experience count: "5+ years of experience", "3-5 years' professional Python",
+# "2 years working with Go", but not "a company with 20 years of history"
+YEARS_PATTERN = re.compile(
+    r'\b(\d{1,2})\s*\+?\s*(?:-|–|to)?\s*(?:\d{1,2}\s*)?\+?\s*years?(?:\'|’)?\s+'
+    r'(?:(?:of\s+)?(?:[\w-]+\s+){0,2}?experience\b'
+    r'|(?:of\s+)?(?:professional|industry|commercial|hands-on|relevant|production)\b'
+    r'|(?:working|developing|building|programming|writing)\b)',
+    re.I)
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+
+def detect_seniority(*texts: str) -> Optional[str]:
+    """Return the first seniority level mentioned, checking texts in order (title first)."""
+    for text in texts:
+        if not text:
+            continue
+        for level, pattern in SENIORITY_PATTERNS:
+            if pattern.search(text):
+                return level
+    return None
+
+
+def _in_list(sentence: str, start: int, end: int) -> bool:
+    before = sentence[:start].rstrip()[-1:]
+    after = sentence[end:].lstrip()[:1]
+    return (before != '' and before in LIST_SEPARATORS + ':') or (after != '' and after in LIST_SEPARATORS)
+
+
+def find_description_skills(automaton: AhoCorasick, sentence: str) -> List[str]:
+    """Skills named in a description sentence, skipping ambiguous aliases used as ordinary words."""
+    skills: List[str] = []
+    for start, end, skill in find_skill_spans(automaton, sentence):
+        written = sentence[start:end]
+        spelling = AMBIGUOUS_ALIASES.get(written.lower())
+        # A capital at the start of a sentence says nothing ("Go beyond ...")
+        if spelling is not None and not _in_list(sentence, start, end) and (
+                written != spelling or not sentence[:start].strip()):
+            continue
+        if skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def extract_requirements(title: str, description: str, required_skills) -> Dict:
+    """Build the compact requirement profile of a job posting."""
+    must_have: List[str] = canonicalize_skills(required_skills)
+    nice_to_have: List[str] = []
+    mentioned: List[str] = []
+    automaton = get_skill_automaton()
+    min_years = None
+
+    for sentence in SENTENCE_SPLIT.split(description or ''):
+        if not sentence.strip():
+            continue
+        found = find_description_skills(automaton, sentence)
+        nice = NICE_TO_HAVE.search(sentence)
+        if nice:
+            target = nice_to_have
+        elif REQUIRED.search(sentence):
+            target = must_have
+        else:
+            target = mentioned
+        for skill in found:
+            if skill not in must_have and skill not in target:
+                target.append(skill)
+        years = YEARS_PATTERN.search(sentence)
+        if years and not nice:
+            # "5+ years overall, 2 with Go" asks for five
+            min_years = max(min_years or 0, int(years.group(1)))
+
+    return {
+        'must_have': must_have,
+        'nice_to_have': [skill for skill in nice_to_have if skill not in must_have],
+        'mentioned': [skill for skill in mentioned if skill not in must_have and skill not in nice_to_have],
+        'seniority': detect_seniority(title, description),
+        'min_years_experience': min_years,
+    }
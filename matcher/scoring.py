@@ -0,0 +1,98 @@
+"""Local, LLM-free scoring of a candidate against a job's requirement profile.
+
+Returns the same ``match_score`` / ``missing_skills`` / ``summary`` shape as
+``services.match_candidate_to_job`` so callers can use it as a cheap first
+tier or as a stand-in when the LLM is unavailable.
+"""
+import re
+from datetime import date
+from typing import Dict, List, Optional
+
+from .requirements import SENIORITY_LEVELS, detect_seniority
+
+# Share of the score contributed by each component
+WEIGHTS = {
+    'must_have': 0.5,
+    'mentioned': 0.1,
+    'nice_to_have': 0.15,
+    'experience': 0.15,
+    'seniority': 0.1,
+}
+
+_YEAR = re.compile(r'(?:19|20)\d\d')
+_ONGOING = re.compile(r'\b(present|current|now|today)\b', re.I)
+
+
+def estimate_years_of_experience(work_experience: List[Dict]) -> float:
+    """Sum the spans of the duration strings in a candidate's work history."""
+    total = 0
+    current_year = date.today().year
+    for entry in work_experience or []:
+        duration = str((entry or {}).get('duration') or '')
+        years = [int(y) for y in _YEAR.findall(duration)]
+        if not years:
+            continue
+        end = current_year if _ONGOING.search(duration) else max(years)
+        total += max(0, end - min(years))
+    return float(total)
+
+
+def candidate_seniority(work_experience: List[Dict]) -> Optional[str]:
+    positions = [str((entry or {}).get('position') or '') for entry in work_experience or []]
+    levels = [detect_seniority(position) for position in positions]
+    ranked = [SENIORITY_LEVELS.index(level) for level in levels if level]
+    return SENIORITY_LEVELS[max(ranked)] if ranked else None
+
+
+def score_locally(candidate_skills: List[str], work_experience: List[Dict], requirements: Dict) -> Dict:
+    """Score canonical candidate skills and work history against a requirement profile."""
+    have = {skill.lower() for skill in candidate_skills or []}
+    must = requirements.get('must_have') or []
+    nice = requirements.get('nice_to_have') or []
+    mentioned = requirements.get('mentioned') or []
+    missing = [skill for skill in must if skill.lower() not in have]
+    missing_nice = [skill for skill in nice if skill.lower() not in have]
+    missing_mentioned = [skill for skill in mentioned if skill.lower() not in have]
+
+    components = {
+        'must_have': 1.0 - len(missing) / len(must) if must else 1.0,
+        'nice_to_have': 1.0 - len(missing_nice) / len(nice) if nice else 1.0,
+    }
+    # With nothing mentioned beyond the required skills, that weight goes to the required ones
+    components['mentioned'] = (
+        1.0 - len(missing_mentioned) / len(mentioned) if mentioned else components['must_have'])
+    years = estimate_years_of_experience(work_experience)
+    wanted_years = requirements.get('min_years_experience')
+    components['experience'] = min(1.0, years / wanted_years) if wanted_years else 1.0
+
+    wanted_level = requirements.get('seniority')
+    level = candidate_seniority(work_experience)
+    if not wanted_level:
+        components['seniority'] = 1.0
+    elif not level:
+        components['seniority'] = 0.5
+    else:
+        gap = SENIORITY_LEVELS.index(wanted_level) - SENIORITY_LEVELS.index(level)
+        components['seniority'] = 1.0 if gap <= 0 else max(0.0, 1.0 - 0.4 * gap)
+
+    score = round(100 * sum(WEIGHTS[name] * value for name, value in components.items()))
+    matched = len(must) - len(missing)
+    summary = f"Matches {matched} of {len(must)} required skills"
+    if nice:
+        summary += f" and {len(nice) - len(missing_nice)} of {len(nice)} preferred skills"
+    if mentioned:
+        summary += f" ({len(mentioned) - len(missing_mentioned)} of {len(mentioned)} others from the description)"
+    summary += f"; about {years:.0f} years of experience"
+    if wanted_years:
+        summary += f" ({wanted_years} requested)"
+    summary += '.'
+    return {
+        'match_score': score,
+        'missing_skills': missing,
+        'summary': summary,
+    }
+
+
+def score_match_locally(candidate, job) -> Dict:
+    """Score ``CandidateProfile`` and ``JobPosting`` instances without calling the LLM."""
+    return score_locally(candidate.canonical_skills, candidate.work_experience, job.requirements)
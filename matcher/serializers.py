@@ -1,23 +1,74 @@
 from rest_framework import serializers
-from .models import CandidateProfile, JobPosting, JobMatch
+from .models import CandidateProfile, JobPosting, JobMatch, LeaderboardEntry, LLMCall
 
 class CandidateProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = CandidateProfile
         fields = '__all__'
+        read_only_fields = ['resume_blob']
 
 class JobPostingSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobPosting
         fields = '__all__'
 
+class LoadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that also accepts an already loaded instance without fetching it again."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, self.get_queryset().model):
+            return data
+        return super().to_internal_value(data)
+
 class JobMatchSerializer(serializers.ModelSerializer):
-    candidate = serializers.PrimaryKeyRelatedField(queryset=CandidateProfile.objects.all())
-    job = serializers.PrimaryKeyRelatedField(queryset=JobPosting.objects.all())
+    """Candidate and job are ids unless listed in the ``expand`` context, then nested objects."""
+    candidate = LoadedPrimaryKeyRelatedField(queryset=CandidateProfile.objects.all())
+    job = LoadedPrimaryKeyRelatedField(queryset=JobPosting.objects.all())
     match_score = serializers.IntegerField()
     missing_skills = serializers.ListField(child=serializers.CharField())
     summary = serializers.CharField()
 
     class Meta:
         model = JobMatch
-        fields = ['id', 'candidate', 'job', 'match_score', 'missing_skills', 'summary'] 
\ No newline at end of file
+        fields = ['id', 'candidate', 'job', 'match_score', 'missing_skills', 'summary', 'score_source', 'is_stale',
+                  'is_provisional']
+        read_only_fields = ['score_source', 'is_stale', 'is_provisional']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        expand = self.context.get('expand', ())
+        # Read from the related objects the view already joined in with select_related
+        if 'candidate' in expand:
+            data['candidate'] = CandidateProfileSerializer(instance.candidate).data
+        if 'job' in expand:
+            data['job'] = JobPostingSerializer(instance.job).data
+        return data
+
+class JobMatchImportSerializer(serializers.ModelSerializer):
+    """Row validation for bulk imports; candidate and job ids are checked per chunk, not per row."""
+    candidate = serializers.IntegerField(source='candidate_id')
+    job = serializers.IntegerField(source='job_id')
+    missing_skills = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+
+    class Meta:
+        model = JobMatch
+        fields = ['candidate', 'job', 'match_score', 'missing_skills', 'summary', 'score_source']
+
+class LLMCallSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LLMCall
+        fields = '__all__'
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    name = serializers.SerializerMethodField()
+    score_source = serializers.CharField(source='match.score_source')
+    is_stale = serializers.BooleanField(source='match.is_stale')
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ['member_id', 'name', 'match', 'match_score', 'score_source', 'is_stale']
+
+    def get_name(self, obj):
+        if obj.board == 'job':
+            return obj.match.candidate.name
+        return f"{obj.match.job.title} at {obj.match.job.company}"
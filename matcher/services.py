@@ -1,20 +1,230 @@
+import asyncio
+import hashlib
 import json
-from typing import Dict, List, Optional
-import google.generativeai as genai
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
 from django.conf import settings
 import os
 from dotenv import load_dotenv
+from .ledger import record_llm_call
+from .llm_json import (
+    COVER_LETTER_SCHEMA, MATCH_SCHEMA, PACKED_MATCH_ENTRY_SCHEMA, RESUME_SCHEMA, LLMResponseError, decode_llm_json,
+)
+from .local_parser import local_parser_settings, parse_resume_locally
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini
-api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
-    raise ValueError("GEMINI_API_KEY not found in environment variables")
+MODEL_NAME = 'gemini-1.5-flash'
+# Created on first use by _get_model(), so importing this module (migrate,
+# check, workers that never call the LLM) neither loads the Gemini SDK nor
+# needs an API key. Tests and benchmarks replace it with a stand-in.
+model = None
+_model_lock = threading.Lock()
+
+
+def _get_model():
+    """Return the Gemini model, configuring the client on first use."""
+    global model
+    if model is None:
+        with _model_lock:
+            if model is None:
+                import google.generativeai as genai
+
+                api_key = os.getenv('GEMINI_API_KEY')
+                if not api_key:
+                    raise ValueError("GEMINI_API_KEY not found in environment variables")
+                genai.configure(api_key=api_key)
+                model = genai.GenerativeModel(MODEL_NAME)
+    return model
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is still running wait for the same result, or the same
+    exception. Works for threads and for asyncio tasks, which share one
+    registry of in-flight calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _join_or_lead(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            return future, True
+
+    def _run(self, key: str, future: Future, fn: Callable):
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+        else:
+            self._finish(key)
+            future.set_result(result)
+
+    def _finish(self, key: str):
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def do(self, key: str, fn: Callable):
+        """Run ``fn`` or wait for the identical call already in flight."""
+        return self.execute(key, fn)[0]
+
+    def execute(self, key: str, fn: Callable) -> Tuple[object, bool]:
+        """Like ``do`` but also return whether the call was coalesced."""
+        future, leader = self._join_or_lead(key)
+        if leader:
+            self._run(key, future, fn)
+        else:
+            logger.info(f"Coalesced LLM call {key[:12]} with an in-flight request")
+        return future.result(), not leader
+
+    async def do_async(self, key: str, fn: Callable):
+        """Async variant of ``do``; the leader runs ``fn`` in the default executor."""
+        return (await self.execute_async(key, fn))[0]
+
+    async def execute_async(self, key: str, fn: Callable) -> Tuple[object, bool]:
+        """Async variant of ``execute``."""
+        future, leader = self._join_or_lead(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._run, key, future, fn)
+        else:
+            logger.info(f"Coalesced LLM call {key[:12]} with an in-flight request")
+        return await asyncio.wrap_future(future), not leader
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._in_flight)}
+
+
+_llm_flight = SingleFlight()
+
+
+def prompt_fingerprint(prompt: str) -> str:
+    """Key identical prompts so concurrent duplicates can share one LLM call."""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+def _token_counts(prompt: str, response) -> Tuple[int, int]:
+    """Read token usage from a Gemini response, estimating it when absent."""
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is not None and getattr(usage, 'prompt_token_count', None) is not None:
+        return usage.prompt_token_count, usage.candidates_token_count or 0
+    # Roughly four characters per token for English text
+    return len(prompt) // 4, len(getattr(response, 'text', '') or '') // 4
+
+
+def _record_call(operation: str, prompt: str, started: float, response=None, coalesced: bool = False,
+                 error: Optional[BaseException] = None):
+    latency_ms = (time.perf_counter() - started) * 1000
+    prompt_tokens = response_tokens = 0
+    if response is not None and not coalesced:
+        # Coalesced callers shared someone else's call and cost nothing
+        prompt_tokens, response_tokens = _token_counts(prompt, response)
+    record_llm_call(
+        operation=operation,
+        model_name=MODEL_NAME,
+        latency_ms=latency_ms,
+        outcome='error' if error else 'success',
+        cache_status='coalesced' if coalesced else 'miss',
+        prompt_tokens=prompt_tokens,
+        response_tokens=response_tokens,
+        error=str(error) if error else '',
+    )
+
+
+def generate_content(prompt: str, operation: str = 'generate'):
+    """Send a prompt to Gemini, sharing the call with identical in-flight prompts."""
+    started = time.perf_counter()
+    try:
+        response, coalesced = _llm_flight.execute(
+            prompt_fingerprint(prompt), lambda: _get_model().generate_content(prompt))
+    except Exception as e:
+        _record_call(operation, prompt, started, error=e)
+        raise
+    _record_call(operation, prompt, started, response, coalesced)
+    return response
+
+
+async def generate_content_async(prompt: str, operation: str = 'generate'):
+    """Async counterpart of ``generate_content`` for use from asyncio tasks."""
+    started = time.perf_counter()
+    try:
+        response, coalesced = await _llm_flight.execute_async(
+            prompt_fingerprint(prompt), lambda: _get_model().generate_content(prompt))
+    except Exception as e:
+        _record_call(operation, prompt, started, error=e)
+        raise
+    _record_call(operation, prompt, started, response, coalesced)
+    return response
+
+
+def get_coalescing_stats() -> Dict:
+    """Return how many LLM calls were requested and how many were coalesced."""
+    return _llm_flight.stats()
+
 
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-1.5-flash')
+_local_parse_lock = threading.Lock()
+_local_parse_counts = {'parsed_locally': 0, 'fell_back': 0}
+
+
+def _count_local_parse(outcome: str):
+    with _local_parse_lock:
+        _local_parse_counts[outcome] += 1
+
+
+def get_local_parser_stats() -> Dict:
+    """Return how many resumes the local parser handled and how many went to the LLM."""
+    with _local_parse_lock:
+        total = _local_parse_counts['parsed_locally'] + _local_parse_counts['fell_back']
+        return {
+            **_local_parse_counts,
+            'local_share': round(_local_parse_counts['parsed_locally'] / total, 4) if total else 0.0,
+        }
+
+
+def _try_local_parse(text: str) -> Optional[Dict]:
+    """Parse with the rule-based parser, or return None when the LLM should handle it."""
+    config = local_parser_settings()
+    if not config['ENABLED']:
+        return None
+    started = time.perf_counter()
+    result = parse_resume_locally(text)
+    if not result.is_acceptable(config['CONFIDENCE_THRESHOLD']):
+        _count_local_parse('fell_back')
+        logger.info(
+            f"Local parse confidence {result.confidence:.2f}, missing {result.missing_fields}; falling back to LLM")
+        return None
+    _count_local_parse('parsed_locally')
+    # Its own operation, so zero-cost local parses don't skew the parse_resume call counts and latency
+    record_llm_call(
+        operation='parse_resume_local',
+        model_name='local',
+        latency_ms=(time.perf_counter() - started) * 1000,
+        outcome='success',
+        cache_status='local',
+    )
+    logger.info(f"Parsed resume locally with confidence {result.confidence:.2f}")
+    return result.data
 
 def parse_resume(text: str) -> Dict:
     """Parse resume text using Gemini to extract structured data."""
@@ -22,6 +232,11 @@ def parse_resume(text: str) -> Dict:
         if not text or len(text.strip()) == 0:
             raise ValueError("Empty resume text provided")
 
+        # Well-structured resumes are handled by the rule-based parser
+        local_data = _try_local_parse(text)
+        if local_data is not None:
+            return local_data
+
         prompt = f"""Parse this resume text into structured JSON with the following format:
         {{
             "name": "string",
@@ -48,33 +263,11 @@ def parse_resume(text: str) -> Dict:
 
         Return only the JSON object, no additional text or explanation."""
 
-        response = model.generate_content(prompt)
+        response = generate_content(prompt, operation='parse_resume')
         print("Raw response from Gemini:", response.text)  # Debug log
         
-        if not response.text:
-            raise ValueError("Empty response from Gemini API")
-            
-        # Try to clean the response text if needed
-        response_text = response.text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        try:
-            parsed_data = json.loads(response_text)
-            # Validate required fields
-            required_fields = ['name', 'skills', 'education', 'work_experience']
-            for field in required_fields:
-                if field not in parsed_data:
-                    raise ValueError(f"Missing required field: {field}")
-            return parsed_data
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {str(e)}")
-            print(f"Response text that failed to parse: {response_text}")
-            raise Exception(f"Failed to parse JSON response: {str(e)}")
-            
+        return decode_llm_json(response.text, RESUME_SCHEMA)
+
     except Exception as e:
         print(f"Error in parse_resume: {str(e)}")  # Debug log
         raise Exception(f"Error parsing resume: {str(e)}")
@@ -97,37 +290,120 @@ def match_candidate_to_job(candidate_data: Dict, job_data: Dict) -> Dict:
 
         Return only the JSON object, no additional text or explanation."""
 
-        response = model.generate_content(prompt)
+        response = generate_content(prompt, operation='match_candidate_to_job')
         print("Raw response from Gemini (match):", response.text)  # Debug log
         
-        if not response.text:
-            raise ValueError("Empty response from Gemini API")
-            
-        # Try to clean the response text if needed
-        response_text = response.text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        try:
-            parsed_data = json.loads(response_text)
-            # Validate required fields
-            required_fields = ['match_score', 'missing_skills', 'summary']
-            for field in required_fields:
-                if field not in parsed_data:
-                    raise ValueError(f"Missing required field: {field}")
-            return parsed_data
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {str(e)}")
-            print(f"Response text that failed to parse: {response_text}")
-            raise Exception(f"Failed to parse JSON response: {str(e)}")
-            
+        return decode_llm_json(response.text, MATCH_SCHEMA)
+
     except Exception as e:
         print(f"Error in match_candidate_to_job: {str(e)}")  # Debug log
         raise Exception(f"Error matching candidate to job: {str(e)}")
 
+DEFAULT_PACKED_MATCHING_SETTINGS = {
+    'TOKEN_BUDGET': 8000,  # estimated prompt + response tokens per packed prompt
+    'MAX_JOBS_PER_PROMPT': 25,
+    'RESPONSE_TOKENS_PER_JOB': 120,
+    'MAX_JOBS_PER_REQUEST': 200,
+}
+
+PACKED_MATCH_HEADER = """Score this candidate profile against each job posting below and return a JSON array with one object per job:
+[
+    {
+        "job_id": integer (the job_id of the posting),
+        "match_score": integer (0-100),
+        "missing_skills": ["string"],
+        "summary": "string"
+    }
+]
+
+Candidate Profile:
+"""
+PACKED_MATCH_JOBS = "\n\nJob Postings (one JSON object per line):\n"
+PACKED_MATCH_FOOTER = "\n\nReturn only the JSON array with exactly one entry per job_id, no additional text or explanation."
+
+
+def packed_matching_settings() -> Dict:
+    return {**DEFAULT_PACKED_MATCHING_SETTINGS, **getattr(settings, 'PACKED_MATCHING', {})}
+
+
+def _estimate_tokens(text: str) -> int:
+    # Same four-characters-per-token estimate as _token_counts
+    return len(text) // 4 + 1
+
+
+def pack_jobs(candidate_data: Dict, jobs: Dict[int, Dict], config: Optional[Dict] = None) -> List[List[int]]:
+    """Split job ids into batches whose packed prompt and expected response fit the token budget."""
+    config = config or packed_matching_settings()
+    fixed = _estimate_tokens(PACKED_MATCH_HEADER + PACKED_MATCH_JOBS + PACKED_MATCH_FOOTER
+                             + json.dumps(candidate_data, separators=(',', ':')))
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    used = fixed
+    for job_id, job_data in jobs.items():
+        cost = _estimate_tokens(_packed_job_line(job_id, job_data)) + config['RESPONSE_TOKENS_PER_JOB']
+        if batch and (used + cost > config['TOKEN_BUDGET'] or len(batch) >= config['MAX_JOBS_PER_PROMPT']):
+            batches.append(batch)
+            batch, used = [], fixed
+        batch.append(job_id)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _packed_job_line(job_id: int, job_data: Dict) -> str:
+    return json.dumps({'job_id': job_id, **job_data}, separators=(',', ':'))
+
+
+def _match_packed_batch(candidate_json: str, jobs: Dict[int, Dict], batch: List[int]) -> Dict[int, Dict]:
+    """Score one batch in a single prompt; returns the valid results by job id."""
+    prompt = (PACKED_MATCH_HEADER + candidate_json + PACKED_MATCH_JOBS
+              + "\n".join(_packed_job_line(job_id, jobs[job_id]) for job_id in batch) + PACKED_MATCH_FOOTER)
+    response = generate_content(prompt, operation='match_candidate_to_jobs')
+    entries = decode_llm_json(response.text)
+    if not isinstance(entries, list):
+        raise ValueError("Expected a JSON array of match results")
+
+    batch_ids = set(batch)
+    results = {}
+    for entry in entries:
+        try:
+            entry = PACKED_MATCH_ENTRY_SCHEMA(entry)
+        except LLMResponseError:
+            continue
+        job_id = entry['job_id']
+        if job_id in batch_ids and job_id not in results:
+            results[job_id] = {field: entry[field] for field in ('match_score', 'missing_skills', 'summary')}
+    return results
+
+
+def match_candidate_to_jobs(candidate_data: Dict, jobs: Dict[int, Dict]) -> Dict:
+    """Score a candidate against many jobs, packing jobs into as few prompts as the token budget allows.
+
+    ``jobs`` maps job ids to the job data sent to the LLM. Jobs missing from a
+    packed answer, or with an invalid entry, are retried one by one with
+    ``match_candidate_to_job``. Returns the results and errors by job id and
+    the number of packed prompts and individual retries.
+    """
+    candidate_json = json.dumps(candidate_data, separators=(',', ':'))
+    outcome = {'results': {}, 'errors': {}, 'prompts': 0, 'retried': 0}
+    for batch in pack_jobs(candidate_data, jobs):
+        outcome['prompts'] += 1
+        try:
+            outcome['results'].update(_match_packed_batch(candidate_json, jobs, batch))
+        except Exception as e:
+            logger.warning(f"Packed match of {len(batch)} jobs failed, retrying individually: {str(e)}")
+
+        for job_id in batch:
+            if job_id in outcome['results']:
+                continue
+            outcome['retried'] += 1
+            try:
+                outcome['results'][job_id] = match_candidate_to_job(candidate_data, jobs[job_id])
+            except Exception as e:
+                outcome['errors'][job_id] = str(e)
+    return outcome
+
 def generate_cover_letter(candidate_data: Dict, job_data: Dict) -> Dict:
     """Generate a personalized cover letter using Gemini."""
     try:
@@ -145,31 +421,11 @@ def generate_cover_letter(candidate_data: Dict, job_data: Dict) -> Dict:
 
         Return only the JSON object, no additional text or explanation."""
 
-        response = model.generate_content(prompt)
+        response = generate_content(prompt, operation='generate_cover_letter')
         print("Raw response from Gemini (cover letter):", response.text)  # Debug log
         
-        if not response.text:
-            raise ValueError("Empty response from Gemini API")
-            
-        # Try to clean the response text if needed
-        response_text = response.text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        try:
-            parsed_data = json.loads(response_text)
-            # Validate required fields
-            if 'cover_letter' not in parsed_data:
-                raise ValueError("Missing cover_letter field in response")
-            return parsed_data
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {str(e)}")
-            print(f"Response text that failed to parse: {response_text}")
-            raise Exception(f"Failed to parse JSON response: {str(e)}")
-            
+        return decode_llm_json(response.text, COVER_LETTER_SCHEMA)
+
     except Exception as e:
         print(f"Error in generate_cover_letter: {str(e)}")  # Debug log
         raise Exception(f"Error generating cover letter: {str(e)}") 
\ No newline at end of file
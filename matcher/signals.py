@@ -0,0 +1,61 @@
+"""Model signal handlers for the matcher app."""
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .db import apply_sqlite_pragmas
+from .leaderboards import refresh_pair
+from .models import CandidateProfile, JobMatch, JobPosting
+from .rematch import enqueue_for_candidate, enqueue_for_job
+
+# Fields whose change makes existing match scores stale
+MATCH_INPUT_FIELDS = {
+    CandidateProfile: ('skills', 'education', 'work_experience'),
+    JobPosting: ('title', 'required_skills', 'description'),
+}
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    apply_sqlite_pragmas(connection)
+
+
+@receiver(pre_save, sender=CandidateProfile)
+@receiver(pre_save, sender=JobPosting)
+def detect_match_input_changes(sender, instance, update_fields=None, raw=False, **kwargs):
+    instance._match_inputs_changed = False
+    if raw or instance.pk is None:
+        return
+    fields = MATCH_INPUT_FIELDS[sender]
+    if update_fields is not None:
+        fields = [f for f in fields if f in update_fields]
+        if not fields:
+            return
+    previous = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if previous is None:
+        return
+    instance._match_inputs_changed = any(previous[f] != getattr(instance, f) for f in fields)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def queue_candidate_rematch(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw and getattr(instance, '_match_inputs_changed', False):
+        enqueue_for_candidate(instance.pk)
+
+
+@receiver(post_save, sender=JobPosting)
+def queue_job_rematch(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw and getattr(instance, '_match_inputs_changed', False):
+        enqueue_for_job(instance.pk)
+
+
+@receiver(post_save, sender=JobMatch)
+def update_leaderboards_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'match_score' not in update_fields):
+        return
+    refresh_pair(instance.candidate_id, instance.job_id)
+
+
+@receiver(post_delete, sender=JobMatch)
+def update_leaderboards_on_delete(sender, instance, **kwargs):
+    refresh_pair(instance.candidate_id, instance.job_id)
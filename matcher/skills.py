@@ -0,0 +1,130 @@
+"""Skill canonicalization shared by parsing, matching and indexing.
+
+An alias table on disk maps each canonical skill name to its spellings
+("JavaScript": ["js", "es6", ...]). The table is compiled into a character
+trie, so normalizing a skill costs one walk over its characters no matter how
+many aliases exist. Unknown skills are kept, with whitespace tidied up.
+"""
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+DEFAULT_ALIASES_PATH = Path(__file__).resolve().parent / 'data' / 'skill_aliases.json'
+
+_WHITESPACE = re.compile(r'\s+')
+# Version suffixes such as "Python 3", "Angular 2+", "JavaScript ES6", "Vue v3.2"
+_VERSION_SUFFIX = re.compile(r'(\s+(v?\d+(\.\d+)*\+?|es\d+|es20\d\d))+$')
+
+_LIST_SEPARATOR = re.compile(r'\s*[,;\n|]\s*')
+_END = ''  # trie key marking the end of an alias; never a real character
+
+
+def normalize_key(skill: str) -> str:
+    """Lowercase and collapse whitespace; keeps symbols that matter (C++, C#, .NET)."""
+    return _WHITESPACE.sub(' ', skill.strip().lower()).strip(' ,;:')
+
+
+class SkillTrie:
+    """Character trie from normalized alias to canonical skill name."""
+
+    def __init__(self):
+        self._root: Dict = {}
+        self.size = 0
+
+    def insert(self, alias: str, canonical: str):
+        node = self._root
+        for char in normalize_key(alias):
+            node = node.setdefault(char, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = canonical
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the canonical name for an already normalized key, in O(len(key))."""
+        node = self._root
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(_END)
+
+
+def load_alias_table(path=None) -> Dict[str, List[str]]:
+    path = path or getattr(settings, 'SKILL_ALIASES_PATH', DEFAULT_ALIASES_PATH)
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def build_trie(table: Dict[str, List[str]]) -> SkillTrie:
+    trie = SkillTrie()
+    for canonical, aliases in table.items():
+        trie.insert(canonical, canonical)
+        for alias in aliases:
+            trie.insert(alias, canonical)
+    return trie
+
+
+_lock = threading.Lock()
+_table: Optional[Dict[str, List[str]]] = None
+_trie: Optional[SkillTrie] = None
+
+
+def get_alias_table() -> Dict[str, List[str]]:
+    _ensure_loaded()
+    return _table
+
+
+def get_trie() -> SkillTrie:
+    _ensure_loaded()
+    return _trie
+
+
+def _ensure_loaded():
+    global _table, _trie
+    if _trie is None:
+        with _lock:
+            if _trie is None:
+                table = load_alias_table()
+                _table, _trie = table, build_trie(table)
+
+
+def reload():
+    """Drop the cached table so the next lookup re-reads it from disk."""
+    global _table, _trie
+    with _lock:
+        _table = _trie = None
+
+
+def canonicalize(skill: str) -> str:
+    """Map a skill to its canonical name, e.g. "Javascript" or "JavaScript ES6" to "JavaScript"."""
+    key = normalize_key(skill)
+    trie = get_trie()
+    canonical = trie.lookup(key)
+    if canonical is None:
+        stripped = _VERSION_SUFFIX.sub('', key)
+        if stripped != key:
+            canonical = trie.lookup(stripped)
+    return canonical or _WHITESPACE.sub(' ', skill.strip())
+
+
+def canonicalize_skills(skills: Iterable) -> List[str]:
+    """Canonicalize a list of skills, dropping empties and duplicates, keeping order.
+
+    A free-text string such as "Python, JS; Docker" is split into skills first.
+    """
+    if isinstance(skills, str):
+        skills = _LIST_SEPARATOR.split(skills)
+    canonical: List[str] = []
+    seen = set()
+    for skill in skills or []:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        name = canonicalize(skill)
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            canonical.append(name)
+    return canonical
@@ -1,3 +1,1053 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import dedup, fastjson, ledger, provisional, rematch, services, warmup
+from .blobs import blob_path, open_blob
+from .db import BulkInserter, run_in_batches
+from .llm_json import COVER_LETTER_SCHEMA, MATCH_SCHEMA, RESUME_SCHEMA, LLMResponseError, decode_llm_json
+from .local_parser import AhoCorasick, find_skills, parse_resume_locally, parse_skills
+from .scoring import score_match_locally
+from .models import CandidateProfile, DirtyMatchPair, JobMatch, JobPosting, LeaderboardEntry, LLMCall, ResumeBlob
+from .rematch import process_due_pairs
+from .skills import canonicalize, canonicalize_skills
+from .services import SingleFlight
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_threads_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return 'result'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('key', slow))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while flight.stats()['calls'] < 5:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['result'] * 5)
+        self.assertEqual(flight.stats(), {'calls': 5, 'coalesced': 4, 'in_flight': 0})
+
+    def test_exception_is_shared_and_key_released(self):
+        flight = SingleFlight()
+
+        def boom():
+            raise ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            flight.do('key', boom)
+        self.assertEqual(flight.do('key', lambda: 'ok'), 'ok')
+
+    def test_async_tasks_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+
+        async def run():
+            return await asyncio.gather(*(flight.do_async('key', slow) for _ in range(4)))
+
+        self.assertEqual(asyncio.run(run()), [42] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats()['coalesced'], 3)
+
+
+class FakeUsage:
+    def __init__(self, prompt_tokens, response_tokens):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = response_tokens
+
+
+class FakeResponse:
+    def __init__(self, text, prompt_tokens=100, response_tokens=20):
+        self.text = text
+        self.usage_metadata = FakeUsage(prompt_tokens, response_tokens)
+
+
+class FakeModel:
+    def __init__(self, payload):
+        self.payload = payload
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return FakeResponse('```json\n' + json.dumps(self.payload) + '\n```')
+
+
+@override_settings(LLM_LEDGER={'BACKGROUND': False, 'BATCH_SIZE': 1})
+class LLMLedgerTests(TestCase):
+    def test_calls_are_recorded_and_summarized(self):
+        payload = {'match_score': 80, 'missing_skills': [], 'summary': 'Good fit'}
+        with mock.patch.object(services, 'model', FakeModel(payload)), redirect_stdout(io.StringIO()):
+            services.match_candidate_to_job({'name': 'A'}, {'title': 'B'})
+            services.match_candidate_to_job({'name': 'C'}, {'title': 'D'})
+
+        call = LLMCall.objects.first()
+        self.assertEqual(call.operation, 'match_candidate_to_job')
+        self.assertEqual((call.prompt_tokens, call.response_tokens), (100, 20))
+        self.assertEqual((call.outcome, call.cache_status), ('success', 'miss'))
+        self.assertGreater(call.cost_usd, 0)
+
+        response = self.client.get('/api/llm-calls/summary/', {'window': '1h', 'bucket': 'minute'})
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()['operations']['match_candidate_to_job']
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['prompt_tokens'], 200)
+        self.assertEqual(sum(row['calls'] for row in response.json()['timeline']), 2)
+
+    def test_failed_calls_are_recorded(self):
+        failing = mock.Mock()
+        failing.generate_content.side_effect = RuntimeError('quota exceeded')
+        with mock.patch.object(services, 'model', failing), redirect_stdout(io.StringIO()):
+            with self.assertRaises(Exception):
+                services.parse_resume('Jane Doe')
+        call = LLMCall.objects.get()
+        self.assertEqual((call.operation, call.outcome), ('parse_resume', 'error'))
+        self.assertIn('quota exceeded', call.error)
+
+    def test_summary_rejects_invalid_window(self):
+        response = self.client.get('/api/llm-calls/summary/', {'window': 'soon'})
+        self.assertEqual(response.status_code, 400)
+
+
+class LedgerWriterTests(TransactionTestCase):
+    def record(self, writer):
+        writer.record(operation='parse_resume', model_name='gemini-1.5-flash', latency_ms=5.0,
+                      outcome='success', cache_status='miss')
+
+    @override_settings(LLM_LEDGER={'FLUSH_INTERVAL': 60})
+    def test_stop_writes_the_batch_held_by_the_worker(self):
+        writer = ledger.LedgerWriter()
+        for _ in range(3):
+            self.record(writer)
+        deadline = time.monotonic() + 5
+        while not writer._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        # The worker holds all three entries until the flush interval, an hour away
+        self.assertEqual(LLMCall.objects.count(), 0)
+        writer.stop()
+        self.assertFalse(writer._thread.is_alive())
+        self.assertEqual(LLMCall.objects.count(), 3)
+
+    @override_settings(LLM_LEDGER={'BACKGROUND': False, 'MAX_QUEUE': 2})
+    def test_full_queue_counts_dropped_entries(self):
+        writer = ledger.LedgerWriter()
+        for _ in range(5):
+            self.record(writer)
+        self.assertEqual(writer.dropped, 3)
+        writer.stop()
+        self.assertEqual(LLMCall.objects.count(), 2)
+
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | +1 555 0100
+Skills
+Python, Django, PostgreSQL, Docker, AWS
+Experience
+Senior Backend Engineer at Acme Corp (2019 - 2024)
+Designed and operated services handling millions of requests per day.
+Led the migration of the monolith to containerized deployments.
+Education
+BSc Computer Science, State University, 2014
+"""
+
+PARSED_RESUME = {
+    'name': 'Jane Doe',
+    'skills': ['Python', 'Django'],
+    'education': [{'degree': 'BSc Computer Science', 'institution': 'State University', 'year': '2014'}],
+    'work_experience': [],
+}
+
+
+class TempBlobStoreMixin:
+    """Keep uploaded resume files in a temporary blob store."""
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.mkdtemp(prefix='matcher-test-blobs-')
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        blob_settings = override_settings(RESUME_BLOB_ROOT=root)
+        blob_settings.enable()
+        self.addCleanup(blob_settings.disable)
+
+
+@override_settings(LLM_LEDGER={'ENABLED': False}, LOCAL_RESUME_PARSER={'ENABLED': False})
+class ResumeDedupTests(TempBlobStoreMixin, TestCase):
+    def upload(self, text, name='resume.txt'):
+        return self.client.post('/api/candidates/upload_resume/', {
+            'resume': SimpleUploadedFile(name, text.encode('utf-8')),
+        })
+
+    def test_signature_tolerates_small_edits(self):
+        edited = RESUME_TEXT.replace('+1 555 0100', '+44 20 7946 0958').replace('(2019 - 2024)', '2019–2024')
+        other = 'John Smith\nSkills\nJava, Spring\nExperience\nAccountant at Globex handling payroll.'
+        signature = dedup.minhash_signature(RESUME_TEXT)
+        self.assertGreater(dedup.estimate_similarity(signature, dedup.minhash_signature(edited)), 0.9)
+        self.assertLess(dedup.estimate_similarity(signature, dedup.minhash_signature(other)), 0.2)
+
+    def test_near_duplicate_upload_reuses_profile(self):
+        fake = FakeModel(PARSED_RESUME)
+        with mock.patch.object(services, 'model', fake), redirect_stdout(io.StringIO()):
+            first = self.upload(RESUME_TEXT)
+            second = self.upload(RESUME_TEXT.replace('+1 555 0100', '+1 555 0199'))
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['id'], first.json()['id'])
+        self.assertEqual(len(fake.prompts), 1)
+        self.assertEqual(CandidateProfile.objects.count(), 1)
+
+    @override_settings(RESUME_DEDUP={'POLICY': 'update'})
+    def test_near_duplicate_upload_updates_profile(self):
+        with mock.patch.object(services, 'model', FakeModel(PARSED_RESUME)), redirect_stdout(io.StringIO()):
+            first = self.upload(RESUME_TEXT)
+        updated = {**PARSED_RESUME, 'skills': ['Python', 'Django', 'Kubernetes']}
+        with mock.patch.object(services, 'model', FakeModel(updated)), redirect_stdout(io.StringIO()):
+            second = self.upload(RESUME_TEXT.replace('+1 555 0100', '+1 555 0199'))
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['id'], first.json()['id'])
+        self.assertEqual(CandidateProfile.objects.get().skills, ['Python', 'Django', 'Kubernetes'])
+
+    def test_templated_resume_of_another_person_creates_new_profile(self):
+        template = RESUME_TEXT + (
+            'Mentored junior engineers and ran the on-call rotation for the platform team.\n'
+            'Introduced contract testing between services, cutting integration failures in staging.\n'
+            'Built a billing pipeline that reconciles invoices against payment provider reports nightly.\n'
+            'Wrote the runbooks, dashboards and alerts used by support during incidents.\n'
+            'Reduced cloud spend by moving batch jobs to spot instances and tuning autoscaling.\n'
+            'Partnered with product managers on quarterly planning and roadmap reviews for search.\n'
+            'Designed the event schema and retention policies for the analytics warehouse.\n'
+            'Replaced a homegrown job scheduler with a managed queue and idempotent workers.\n'
+            'Ran hiring loops, wrote interview rubrics and onboarded new team members.\n'
+            'Profiled slow endpoints and added caching that halved median response times.\n'
+            'Volunteered as a mentor for a local coding bootcamp on weekends.\n'
+            'Certifications\nAWS Solutions Architect Associate, Certified Kubernetes Administrator\n'
+        )
+        other = template.replace('Jane Doe', 'Maria Garcia').replace('jane.doe@example.com', 'maria.g@example.org')
+        similarity = dedup.estimate_similarity(dedup.minhash_signature(template), dedup.minhash_signature(other))
+        self.assertGreaterEqual(similarity, 0.9)
+        with mock.patch.object(services, 'model', FakeModel(PARSED_RESUME)), redirect_stdout(io.StringIO()):
+            first = self.upload(template)
+            second = self.upload(other)
+        self.assertEqual(second.status_code, 201)
+        self.assertNotEqual(second.json()['id'], first.json()['id'])
+        self.assertEqual(CandidateProfile.objects.count(), 2)
+
+    def test_different_resume_creates_new_profile(self):
+        with mock.patch.object(services, 'model', FakeModel(PARSED_RESUME)), redirect_stdout(io.StringIO()):
+            self.upload(RESUME_TEXT)
+            response = self.upload('John Smith\nSkills\nJava, Spring\nExperience\nAccountant at Globex.')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(CandidateProfile.objects.count(), 2)
+
+
+@override_settings(LLM_LEDGER={'BACKGROUND': False, 'BATCH_SIZE': 1})
+class LocalResumeParserTests(TestCase):
+    def test_structured_resume_is_parsed_without_llm(self):
+        fake = FakeModel(PARSED_RESUME)
+        with mock.patch.object(services, 'model', fake):
+            data = services.parse_resume(RESUME_TEXT)
+
+        self.assertEqual(fake.prompts, [])
+        self.assertEqual(data['name'], 'Jane Doe')
+        self.assertEqual(data['skills'], ['Python', 'Django', 'PostgreSQL', 'Docker', 'AWS'])
+        self.assertEqual(data['education'], [
+            {'degree': 'BSc Computer Science', 'institution': 'State University', 'year': '2014'},
+        ])
+        self.assertEqual(data['work_experience'][0]['company'], 'Acme Corp')
+        self.assertEqual(data['work_experience'][0]['position'], 'Senior Backend Engineer')
+        self.assertEqual(data['work_experience'][0]['duration'], '2019 - 2024')
+        call = LLMCall.objects.get()
+        self.assertEqual((call.operation, call.cache_status), ('parse_resume_local', 'local'))
+
+    def test_resume_without_sections_falls_back_to_llm(self):
+        text = 'Jane Doe has ten years of experience building web applications in Python.'
+        self.assertLess(parse_resume_locally(text).confidence, 0.8)
+        fake = FakeModel(PARSED_RESUME)
+        with mock.patch.object(services, 'model', fake), redirect_stdout(io.StringIO()):
+            data = services.parse_resume(text)
+        self.assertEqual(len(fake.prompts), 1)
+        self.assertEqual(data, PARSED_RESUME)
+
+    def test_two_line_role_headers(self):
+        text = (
+            'Alex Kim\nSkills\nPython, C++, React Native\nExperience\nSoftware Engineer\n'
+            'Initech, Jan 2016 - Present\n- Wrote TPS reports.\nEducation\nMSc Physics, Tech University, 2015\n'
+        )
+        result = parse_resume_locally(text)
+        self.assertEqual(result.data['work_experience'], [{
+            'company': 'Initech',
+            'position': 'Software Engineer',
+            'duration': 'Jan 2016 - Present',
+            'description': 'Wrote TPS reports.',
+        }])
+        self.assertEqual(result.data['skills'], ['Python', 'C++', 'React Native'])
+
+    def test_slash_joined_skills_are_not_split(self):
+        self.assertEqual(parse_skills(['Python, CI/CD, REST APIs, Node.js, C++', 'Networking: TCP/IP, Django/Flask']),
+                         ['Python', 'CI/CD', 'REST APIs', 'Node.js', 'C++', 'Django', 'Flask', 'TCP/IP'])
+
+    def test_aho_corasick_prefers_longest_match_on_word_boundaries(self):
+        automaton = AhoCorasick({'react': 'React', 'react native': 'React Native', 'go': 'Go', 'sql': 'SQL'})
+        self.assertEqual(find_skills(automaton, 'React Native, going to SQL and Go'), ['React Native', 'SQL', 'Go'])
+
+
+class SkillCanonicalizationTests(TestCase):
+    def test_aliases_map_to_one_canonical_name(self):
+        for spelling in ['JS', 'Javascript', 'JavaScript ES6', '  javascript  ']:
+            self.assertEqual(canonicalize(spelling), 'JavaScript')
+        self.assertEqual(canonicalize('postgres'), 'PostgreSQL')
+        self.assertEqual(canonicalize('Python 3'), 'Python')
+        self.assertEqual(canonicalize('Underwater  Basket Weaving'), 'Underwater Basket Weaving')
+
+    def test_lists_are_deduplicated_in_order(self):
+        self.assertEqual(canonicalize_skills(['k8s', 'JS', 'Kubernetes', 'javascript', '']), ['Kubernetes', 'JavaScript'])
+        self.assertEqual(canonicalize_skills('Python, node; React.js'), ['Python', 'Node.js', 'React'])
+
+    def test_canonical_arrays_are_stored_on_save(self):
+        candidate = CandidateProfile.objects.create(
+            name='Jane', skills=['JS', 'postgres'], education=[], work_experience=[])
+        self.assertEqual(candidate.canonical_skills, ['JavaScript', 'PostgreSQL'])
+        candidate.skills = ['golang']
+        candidate.save(update_fields=['skills'])
+        candidate.refresh_from_db()
+        self.assertEqual(candidate.canonical_skills, ['Go'])
+
+        job = JobPosting.objects.create(title='Dev', company='Acme', required_skills=['ReactJS'], description='')
+        self.assertEqual(job.canonical_required_skills, ['React'])
+
+    def test_backfill_command(self):
+        JobPosting.objects.bulk_create([
+            JobPosting(title='Dev', company='Acme', required_skills=['Javascript', 'k8s'], description=''),
+        ])
+        candidate = CandidateProfile.objects.create(name='Jane', skills=['JS'], education=[], work_experience=[])
+        match = JobMatch.objects.create(
+            candidate=candidate, job=JobPosting.objects.get(), match_score=50, missing_skills=[], summary='')
+        out = io.StringIO()
+        call_command('canonicalize_skills', stdout=out)
+        self.assertEqual(JobPosting.objects.get().canonical_required_skills, ['JavaScript', 'Kubernetes'])
+        self.assertIn('JobPosting: updated 1 rows; queued 1 pairs', out.getvalue())
+        self.assertIn('CandidateProfile: updated 0 rows; queued 0 pairs', out.getvalue())
+        match.refresh_from_db()
+        self.assertTrue(match.is_stale)
+        self.assertTrue(DirtyMatchPair.objects.filter(candidate=candidate, job=match.job).exists())
+
+
+JOB_DESCRIPTION = (
+    'We are looking for a Senior Backend Engineer to scale our APIs. '
+    'You must have 5+ years of experience with Python and Postgres. '
+    'Experience with k8s is a plus. Nice to have: GraphQL.'
+)
+
+
+@override_settings(LLM_LEDGER={'ENABLED': False})
+class JobRequirementsTests(TestCase):
+    def create_job(self, **kwargs):
+        fields = {
+            'title': 'Senior Backend Engineer',
+            'company': 'Acme',
+            'required_skills': ['Django', 'JS'],
+            'description': JOB_DESCRIPTION,
+            **kwargs,
+        }
+        return JobPosting.objects.create(**fields)
+
+    def test_profile_is_extracted_on_save(self):
+        job = self.create_job()
+        self.assertEqual(job.requirements, {
+            'must_have': ['Django', 'JavaScript', 'Python', 'PostgreSQL'],
+            'nice_to_have': ['Kubernetes', 'GraphQL'],
+            'mentioned': [],
+            'seniority': 'senior',
+            'min_years_experience': 5,
+        })
+
+        job.description = 'Junior role, 1 year of experience with Go.'
+        job.title = 'Developer'
+        job.save(update_fields=['title', 'description'])
+        job.refresh_from_db()
+        self.assertEqual(job.requirements['must_have'], ['Django', 'JavaScript'])
+        self.assertEqual(job.requirements['mentioned'], ['Go'])
+        self.assertEqual(job.requirements['seniority'], 'junior')
+
+    def test_ordinary_prose_adds_no_must_have_skills(self):
+        job = self.create_job(description=(
+            'We go fast and ship every day. You will express ideas clearly, use Excel reports and '
+            'apply ML when it helps. Go beyond the ticket.'))
+        self.assertEqual(job.requirements['must_have'], ['Django', 'JavaScript'])
+        self.assertEqual(job.requirements['mentioned'], ['Excel', 'Machine Learning'])
+        result = score_match_locally(
+            CandidateProfile.objects.create(name='Jane', skills=['Django', 'JS'], education=[], work_experience=[]),
+            job)
+        self.assertEqual(result['missing_skills'], [])
+        self.assertGreaterEqual(result['match_score'], 80)
+        job = self.create_job(description='Our stack: Go, Express and Python. You must know TF.')
+        self.assertEqual(job.requirements['must_have'], ['Django', 'JavaScript', 'TensorFlow'])
+        self.assertEqual(job.requirements['mentioned'], ['Go', 'Express.js', 'Python'])
+
+    def test_backfill_queues_matches_of_changed_profiles(self):
+        JobPosting.objects.bulk_create([
+            JobPosting(title='Dev', company='Acme', required_skills=['Python'], description=JOB_DESCRIPTION),
+        ])
+        job = JobPosting.objects.get()
+        candidate = CandidateProfile.objects.create(name='Jane', skills=['Python'], education=[], work_experience=[])
+        match = JobMatch.objects.create(candidate=candidate, job=job, match_score=50, missing_skills=[], summary='')
+        out = io.StringIO()
+        call_command('extract_job_requirements', stdout=out)
+        self.assertIn('Updated requirement profiles of 1 job postings; queued 1 pairs', out.getvalue())
+        match.refresh_from_db()
+        self.assertTrue(match.is_stale)
+        self.assertEqual(DirtyMatchPair.objects.count(), 1)
+        # Nothing changed on a second run, so nothing is queued again
+        call_command('extract_job_requirements', stdout=out)
+        self.assertIn('Updated requirement profiles of 0 job postings; queued 0 pairs', out.getvalue())
+
+    def test_years_outside_experience_wording_are_ignored(self):
+        job = self.create_job(description='You must join a company with 20 years of history. Python is required.')
+        self.assertIsNone(job.requirements['min_years_experience'])
+        job = self.create_job(description='Must have 3-5 years of professional Python.')
+        self.assertEqual(job.requirements['min_years_experience'], 3)
+
+    def test_match_prompt_uses_profile_instead_of_description(self):
+        job = self.create_job()
+        candidate = CandidateProfile.objects.create(
+            name='Jane', skills=['Python'], education=[], work_experience=[])
+        fake = FakeModel({'match_score': 70, 'missing_skills': ['Django'], 'summary': 'ok'})
+        with mock.patch.object(services, 'model', fake), redirect_stdout(io.StringIO()):
+            response = self.client.post(
+                '/api/matches/match_candidate/', {'candidate_id': candidate.id, 'job_id': job.id},
+                content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(JOB_DESCRIPTION, fake.prompts[0])
+        self.assertIn('"must_have"', fake.prompts[0])
+
+    def test_local_score_uses_profile(self):
+        job = self.create_job()
+        strong = CandidateProfile.objects.create(
+            name='Strong', skills=['Python', 'Django', 'JavaScript', 'Postgres', 'k8s', 'GraphQL'], education=[],
+            work_experience=[{'position': 'Senior Engineer', 'company': 'X', 'duration': '2012 - 2020'}])
+        weak = CandidateProfile.objects.create(
+            name='Weak', skills=['Excel'], education=[],
+            work_experience=[{'position': 'Intern', 'company': 'Y', 'duration': '2023 - 2024'}])
+        strong_result = score_match_locally(strong, job)
+        weak_result = score_match_locally(weak, job)
+        self.assertEqual(strong_result['match_score'], 100)
+        self.assertEqual(strong_result['missing_skills'], [])
+        self.assertLess(weak_result['match_score'], 30)
+        self.assertEqual(weak_result['missing_skills'], ['Django', 'JavaScript', 'Python', 'PostgreSQL'])
+
+
+@override_settings(LLM_LEDGER={'ENABLED': False}, REMATCH={'DEBOUNCE_SECONDS': 0, 'LLM_MIN_LOCAL_SCORE': 50})
+class IncrementalRematchTests(TestCase):
+    def setUp(self):
+        self.job = JobPosting.objects.create(
+            title='Backend Engineer', company='Acme', required_skills=['Python'], description='Build APIs.')
+        self.candidate = CandidateProfile.objects.create(
+            name='Jane', skills=['Python'], education=[], work_experience=[])
+        self.match = JobMatch.objects.create(
+            candidate=self.candidate, job=self.job, match_score=90, missing_skills=[], summary='Great')
+
+    def test_edit_marks_matches_stale_and_queues_pair_once(self):
+        for skills in (['Python', 'Go'], ['Python', 'Rust'], ['Python', 'Java']):
+            self.job.required_skills = skills
+            self.job.save()
+        self.match.refresh_from_db()
+        self.assertTrue(self.match.is_stale)
+        self.assertEqual(DirtyMatchPair.objects.count(), 1)
+
+    def test_irrelevant_edit_does_not_queue(self):
+        self.job.company = 'Acme Inc'
+        self.job.save()
+        self.candidate.name = 'Jane Doe'
+        self.candidate.save(update_fields=['name'])
+        self.assertFalse(DirtyMatchPair.objects.exists())
+
+    def test_low_local_score_is_refreshed_without_llm(self):
+        self.job.required_skills = ['Haskell', 'OCaml', 'Erlang']
+        self.job.save()
+        fake = FakeModel({'match_score': 99, 'missing_skills': [], 'summary': 'LLM'})
+        with mock.patch.object(services, 'model', fake):
+            counts = process_due_pairs()
+        self.assertEqual(counts, {'local': 1, 'llm': 0, 'failed': 0})
+        self.assertEqual(fake.prompts, [])
+        self.match.refresh_from_db()
+        self.assertFalse(self.match.is_stale)
+        self.assertEqual(self.match.score_source, 'local')
+        self.assertEqual(self.match.missing_skills, ['Haskell', 'OCaml', 'Erlang'])
+        self.assertFalse(DirtyMatchPair.objects.exists())
+
+    def test_promising_pair_is_rescored_by_llm(self):
+        self.candidate.skills = ['Python', 'Django']
+        self.candidate.save()
+        fake = FakeModel({'match_score': 77, 'missing_skills': [], 'summary': 'LLM says good'})
+        with mock.patch.object(services, 'model', fake), redirect_stdout(io.StringIO()):
+            counts = process_due_pairs()
+        self.assertEqual(counts['llm'], 1)
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.match_score, self.match.score_source, self.match.is_stale), (77, 'llm', False))
+
+    def test_lost_lease_is_claimed_again(self):
+        self.job.required_skills = ['Haskell']
+        self.job.save()
+        # A worker claimed the pair and died before storing a result
+        pair = rematch._claim_due_pairs(10)[0]
+        self.assertEqual(rematch._claim_due_pairs(10), [])
+        DirtyMatchPair.objects.filter(pk=pair.pk).update(due_at=timezone.now())
+        self.assertEqual(process_due_pairs()['local'], 1)
+        self.match.refresh_from_db()
+        self.assertFalse(self.match.is_stale)
+        self.assertFalse(DirtyMatchPair.objects.exists())
+
+    @override_settings(REMATCH={'DEBOUNCE_SECONDS': 0, 'LLM_MIN_LOCAL_SCORE': 0, 'RETRY_DELAY_SECONDS': 0,
+                                'MAX_ATTEMPTS': 2})
+    def test_pair_is_marked_failed_after_max_attempts(self):
+        self.candidate.skills = ['Python', 'Django']
+        self.candidate.save()
+        broken = FakeModel({'summary': 'no score'})
+        with mock.patch.object(services, 'model', broken), redirect_stdout(io.StringIO()):
+            self.assertEqual(process_due_pairs()['failed'], 1)
+            self.assertEqual(process_due_pairs()['failed'], 1)
+            self.assertEqual(process_due_pairs()['failed'], 0)
+        pair = DirtyMatchPair.objects.get()
+        self.assertEqual((pair.failed, pair.attempts), (True, 2))
+        self.assertIn('match_score', pair.last_error)
+        self.assertEqual(rematch.retry_failed_pairs(), 1)
+        fake = FakeModel({'match_score': 77, 'missing_skills': [], 'summary': 'LLM says good'})
+        with mock.patch.object(services, 'model', fake), redirect_stdout(io.StringIO()):
+            self.assertEqual(process_due_pairs()['llm'], 1)
+        self.assertFalse(DirtyMatchPair.objects.exists())
+
+    @override_settings(REMATCH={'DEBOUNCE_SECONDS': 0, 'FLUSH_EVERY': 1})
+    def test_results_are_written_before_later_pairs_are_scored(self):
+        other = JobPosting.objects.create(
+            title='Data Engineer', company='Acme', required_skills=['Python'], description='Pipelines.')
+        JobMatch.objects.create(candidate=self.candidate, job=other, match_score=50, missing_skills=[], summary='')
+        self.candidate.skills = ['Haskell']
+        self.candidate.save()
+        stale_seen = []
+
+        def rescore(candidate, job):
+            stale_seen.append(JobMatch.objects.filter(is_stale=True).count())
+            if len(stale_seen) == 2:
+                raise RuntimeError('LLM timed out')
+            return {'match_score': 10, 'missing_skills': ['Python'], 'summary': ''}, 'local'
+
+        with mock.patch.object(rematch, 'rescore_pair', rescore):
+            counts = process_due_pairs()
+        self.assertEqual(counts, {'local': 1, 'llm': 0, 'failed': 1})
+        # The first pair was stored before the second was scored
+        self.assertEqual(stale_seen, [2, 1])
+
+    @override_settings(REMATCH={'DEBOUNCE_SECONDS': 60})
+    def test_pairs_wait_for_debounce_window(self):
+        self.job.description = 'Build APIs with Go.'
+        self.job.save()
+        self.assertEqual(process_due_pairs(), {'local': 0, 'llm': 0, 'failed': 0})
+        self.assertEqual(DirtyMatchPair.objects.count(), 1)
+
+
+@override_settings(LEADERBOARDS={'SIZE': 3, 'PAGE_SIZE': 2})
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.job = JobPosting.objects.create(
+            title='Backend Engineer', company='Acme', required_skills=['Python'], description='Build APIs.')
+        self.candidates = [
+            CandidateProfile.objects.create(name=f'Candidate {i}', skills=['Python'], education=[], work_experience=[])
+            for i in range(5)
+        ]
+        self.matches = [
+            JobMatch.objects.create(candidate=c, job=self.job, match_score=score, missing_skills=[], summary='')
+            for c, score in zip(self.candidates, [50, 90, 70, 80, 60])
+        ]
+
+    def board(self):
+        entries = LeaderboardEntry.objects.filter(board='job', owner_id=self.job.id).order_by('-match_score')
+        return [entry.match_score for entry in entries]
+
+    def test_keeps_top_n_as_matches_change(self):
+        self.assertEqual(self.board(), [90, 80, 70])
+        # A member dropping out is replaced by the best match outside the board
+        self.matches[1].match_score = 10
+        self.matches[1].save()
+        self.assertEqual(self.board(), [80, 70, 60])
+        self.matches[3].delete()
+        self.assertEqual(self.board(), [70, 60, 50])
+        # A second, better match of the same pair replaces the first one
+        JobMatch.objects.create(candidate=self.candidates[0], job=self.job, match_score=95, missing_skills=[], summary='')
+        self.assertEqual(self.board(), [95, 70, 60])
+
+    def test_top_candidates_keyset_pagination(self):
+        response = self.client.get(f'/api/jobs/{self.job.id}/top_candidates/')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([r['name'] for r in body['results']], ['Candidate 1', 'Candidate 3'])
+        response = self.client.get(f'/api/jobs/{self.job.id}/top_candidates/', {'after': body['next']})
+        body = response.json()
+        self.assertEqual([r['match_score'] for r in body['results']], [70])
+        self.assertIsNone(body['next'])
+        response = self.client.get(f'/api/jobs/{self.job.id}/top_candidates/', {'after': 'oops'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_top_jobs_for_candidate(self):
+        response = self.client.get(f'/api/candidates/{self.candidates[1].id}/top_jobs/')
+        self.assertEqual(response.json()['results'][0]['name'], 'Backend Engineer at Acme')
+
+
+class DatabaseTuningTests(TestCase):
+    def test_sqlite_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+
+    def test_bulk_inserter_flushes_in_batches(self):
+        stored = []
+        with BulkInserter(JobPosting, batch_size=2) as inserter:
+            for i in range(5):
+                inserter.add(JobPosting(title=f'Job {i}', company='Acme', required_skills=[], description=''))
+                stored.append(JobPosting.objects.count())
+        # Rows reach the table two at a time; the last one on exit
+        self.assertEqual(stored, [0, 2, 2, 4, 4])
+        self.assertEqual((inserter.inserted, JobPosting.objects.count()), (5, 5))
+
+    def test_run_in_batches_writes_every_item(self):
+        written = run_in_batches(range(5), lambda i: JobPosting.objects.create(
+            title=f'Job {i}', company='Acme', required_skills=[], description=''), batch_size=2)
+        self.assertEqual((written, JobPosting.objects.count()), (5, 5))
+
+
+@override_settings(LLM_LEDGER={'ENABLED': False})
+class BulkImportExportTests(TestCase):
+    def test_jsonl_job_import_skips_invalid_rows(self):
+        lines = [
+            json.dumps({'title': 'Backend Engineer', 'company': 'Acme', 'required_skills': ['python', 'JS'],
+                        'description': 'Senior role, 5+ years.'}),
+            '{not json',
+            json.dumps({'company': 'Acme', 'required_skills': [], 'description': 'No title'}),
+        ]
+        upload = SimpleUploadedFile('jobs.jsonl', '\n'.join(lines).encode())
+        response = self.client.post('/api/jobs/import/', {'file': upload})
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual((body['created'], body['invalid']), (1, 2))
+        self.assertEqual([e['line'] for e in body['errors']], [2, 3])
+        job = JobPosting.objects.get()
+        self.assertEqual(job.canonical_required_skills, ['Python', 'JavaScript'])
+        self.assertEqual(job.requirements['seniority'], 'senior')
+
+    def test_csv_round_trip_and_leaderboards(self):
+        job = JobPosting.objects.create(title='Engineer', company='Acme', required_skills=['Python'], description='')
+        candidate = CandidateProfile.objects.create(name='Jane', skills=['Python'], education=[], work_experience=[])
+        csv_text = (
+            'candidate,job,match_score,missing_skills,summary\n'
+            f'{candidate.id},{job.id},88,Go;Rust,Strong\n'
+            f'{candidate.id},9999,50,,Unknown job\n'
+        )
+        upload = SimpleUploadedFile('matches.csv', csv_text.encode())
+        body = self.client.post('/api/matches/import/', {'file': upload}).json()
+        self.assertEqual((body['created'], body['invalid']), (1, 1))
+        self.assertEqual(JobMatch.objects.get().missing_skills, ['Go', 'Rust'])
+        self.assertEqual(LeaderboardEntry.objects.filter(board='job', owner_id=job.id).count(), 1)
+
+        response = self.client.get('/api/matches/export/', {'file_format': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(rows[0], 'id,candidate,job,match_score,missing_skills,summary,score_source,is_stale')
+        self.assertIn('"[""Go"", ""Rust""]"', rows[1])
+
+    def test_export_command_writes_jsonl(self):
+        JobPosting.objects.create(title='Engineer', company='Acme', required_skills=['Python'], description='')
+        out = io.StringIO()
+        call_command('export_records', 'jobs', stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['title'], 'Engineer')
+
+
+@override_settings(LLM_LEDGER={'ENABLED': False}, LOCAL_RESUME_PARSER={'ENABLED': False})
+class ResumeBlobStoreTests(TempBlobStoreMixin, TestCase):
+    def upload(self, content, name='resume.txt'):
+        return self.client.post('/api/candidates/upload_resume/', {'resume': SimpleUploadedFile(name, content)})
+
+    def test_identical_file_skips_extraction_and_parsing(self):
+        content = RESUME_TEXT.encode('utf-8')
+        fake = FakeModel(PARSED_RESUME)
+        with mock.patch.object(services, 'model', fake), redirect_stdout(io.StringIO()):
+            first = self.upload(content)
+            with mock.patch('matcher.views.extract_text') as extract:
+                second = self.upload(content, name='copy.txt')
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(second.json()['id'], first.json()['id'])
+        extract.assert_not_called()
+        self.assertEqual(len(fake.prompts), 1)
+
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(first.json()['resume_blob'], blob.sha256)
+        self.assertEqual((blob.size, blob.filename), (len(content), 'resume.txt'))
+        with open_blob(blob.sha256) as mapped:
+            self.assertEqual(mapped.getbuffer(), content)
+        # No partial uploads left behind in the store
+        self.assertEqual(os.listdir(blob_path(blob.sha256).parents[2]), [blob.sha256[:2]])
+
+    @override_settings(RESUME_DEDUP={'ENABLED': False})
+    def test_identical_file_is_parsed_again_when_dedup_is_disabled(self):
+        content = RESUME_TEXT.encode('utf-8')
+        fake = FakeModel(PARSED_RESUME)
+        with mock.patch.object(services, 'model', fake), redirect_stdout(io.StringIO()):
+            first = self.upload(content)
+            second = self.upload(content)
+        self.assertEqual((first.status_code, second.status_code), (201, 201))
+        self.assertEqual(len(fake.prompts), 2)
+        self.assertEqual(ResumeBlob.objects.count(), 1)
+
+    def test_reextract_command_reparses_stored_file(self):
+        with mock.patch.object(services, 'model', FakeModel(PARSED_RESUME)), redirect_stdout(io.StringIO()):
+            candidate_id = self.upload(RESUME_TEXT.encode('utf-8')).json()['id']
+        updated = {**PARSED_RESUME, 'skills': ['Python', 'Go']}
+        out = io.StringIO()
+        with mock.patch.object(services, 'model', FakeModel(updated)), redirect_stdout(io.StringIO()):
+            call_command('reextract_resumes', '--reparse', stdout=out)
+        self.assertIn('updated 1 profiles', out.getvalue())
+        self.assertEqual(CandidateProfile.objects.get(id=candidate_id).skills, ['Python', 'Go'])
+
+
+class PackedFakeModel(FakeModel):
+    """Answers packed prompts with ``packed`` and single-job prompts with ``payload``."""
+
+    def __init__(self, payload, packed):
+        super().__init__(payload)
+        self.packed = packed
+
+    def generate_content(self, prompt):
+        if prompt.startswith('Score this candidate'):
+            self.prompts.append(prompt)
+            return FakeResponse('```json\n' + json.dumps(self.packed) + '\n```')
+        return super().generate_content(prompt)
+
+
+@override_settings(LLM_LEDGER={'ENABLED': False})
+class PackedMatchingTests(TestCase):
+    def setUp(self):
+        self.candidate = CandidateProfile.objects.create(
+            name='Jane', skills=['Python'], education=[], work_experience=[])
+        self.jobs = [
+            JobPosting.objects.create(title=f'Engineer {i}', company='Acme', required_skills=['Python'],
+                                      description='Build APIs.')
+            for i in range(3)
+        ]
+
+    def match(self, model, job_ids):
+        with mock.patch.object(services, 'model', model), redirect_stdout(io.StringIO()):
+            return self.client.post('/api/matches/match_candidate_to_jobs/', {
+                'candidate_id': self.candidate.id, 'job_ids': job_ids,
+            }, content_type='application/json')
+
+    def test_scores_jobs_in_one_prompt_and_retries_bad_entries(self):
+        first, second, third = (job.id for job in self.jobs)
+        packed = [
+            {'job_id': first, 'match_score': 90, 'missing_skills': [], 'summary': 'Great'},
+            {'job_id': second, 'match_score': 'high', 'missing_skills': [], 'summary': 'Invalid score'},
+            {'job_id': third, 'match_score': True, 'missing_skills': [42], 'summary': 'Bool score, bad skills'},
+        ]
+        model = PackedFakeModel({'match_score': 40, 'missing_skills': ['Go'], 'summary': 'Retried'}, packed)
+        response = self.match(model, [first, second, third])
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual((body['prompts'], body['retried']), (1, 2))
+        self.assertEqual(len(model.prompts), 3)
+        self.assertEqual(model.prompts[0].count('{"job_id":'), 3)
+        scores = {m['job']: m['match_score'] for m in body['matches']}
+        self.assertEqual(scores, {first: 90, second: 40, third: 40})
+        self.assertEqual(JobMatch.objects.count(), 3)
+
+    @override_settings(PACKED_MATCHING={'TOKEN_BUDGET': 400, 'RESPONSE_TOKENS_PER_JOB': 100})
+    def test_token_budget_splits_batches(self):
+        jobs = {job.id: job.match_profile() for job in self.jobs}
+        batches = services.pack_jobs({'name': 'Jane', 'skills': ['Python']}, jobs)
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+
+    def test_unknown_job_is_rejected(self):
+        response = self.match(PackedFakeModel({}, []), [self.jobs[0].id, 9999])
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(JobMatch.objects.exists())
+
+
+class LazyImportTests(SimpleTestCase):
+    def test_url_conf_imports_without_ai_stack_or_api_key(self):
+        code = (
+            "import os, sys, django; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_matcher.settings'); "
+            "django.setup(); import resume_matcher.urls; "
+            "print('loaded=' + ','.join(m for m in ('google.generativeai', 'PyPDF2', 'docx') if m in sys.modules))"
+        )
+        env = {k: v for k, v in os.environ.items() if k != 'GEMINI_API_KEY'}
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('loaded=\n', result.stdout)
+
+    def test_missing_api_key_fails_on_first_use(self):
+        with mock.patch.object(services, 'model', None), mock.patch.dict(os.environ, {}, clear=True):
+            with self.assertRaisesMessage(ValueError, 'GEMINI_API_KEY'):
+                services._get_model()
+
+    def test_shared_warm_up_skips_per_process_steps(self):
+        steps = {name: mock.Mock() for name in warmup.STEPS}
+        with mock.patch.dict(warmup.STEPS, steps):
+            timings = warmup.warm_up(per_process=False)
+        self.assertEqual(sorted(timings), ['extractors', 'skill_indexes'])
+        steps['database'].assert_not_called()
+        steps['llm_client'].assert_not_called()
+
+
+class SlowFakeModel(FakeModel):
+    """Holds every answer until ``release`` is set."""
+
+    def __init__(self, payload):
+        super().__init__(payload)
+        self.release = threading.Event()
+
+    def generate_content(self, prompt):
+        self.release.wait(5)
+        return super().generate_content(prompt)
+
+
+# Transactional so the background upgrade, which runs on another thread, sees the rows
+@override_settings(LLM_LEDGER={'ENABLED': False})
+class MatchDeadlineTests(TransactionTestCase):
+    def setUp(self):
+        self.job = JobPosting.objects.create(
+            title='Backend Engineer', company='Acme', required_skills=['Python', 'Go'], description='Build APIs.')
+        self.candidate = CandidateProfile.objects.create(
+            name='Jane', skills=['Python'], education=[], work_experience=[])
+
+    def match(self, deadline_ms):
+        return self.client.post(
+            '/api/matches/match_candidate/', {'candidate_id': self.candidate.id, 'job_id': self.job.id},
+            content_type='application/json', headers={'X-Match-Deadline-Ms': deadline_ms})
+
+    def test_missed_deadline_returns_provisional_match_then_upgrades(self):
+        model = SlowFakeModel({'match_score': 83, 'missing_skills': ['Go'], 'summary': 'From the LLM'})
+        with mock.patch.object(services, 'model', model), redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            response = self.match('50')
+            self.assertLess(time.perf_counter() - started, 2)
+            body = response.json()
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual((body['is_provisional'], body['score_source']), (True, 'local'))
+            self.assertEqual(body['missing_skills'], ['Go'])
+
+            model.release.set()
+            match = JobMatch.objects.get(id=body['id'])
+            deadline = time.monotonic() + 5
+            while match.is_provisional and time.monotonic() < deadline:
+                time.sleep(0.02)
+                match.refresh_from_db()
+        self.assertEqual((match.is_provisional, match.score_source, match.match_score), (False, 'llm', 83))
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return condition()
+
+    def test_failed_background_call_hands_pair_to_rematch(self):
+        model = SlowFakeModel({'summary': 'no score'})
+        with mock.patch.object(services, 'model', model), redirect_stdout(io.StringIO()):
+            body = self.match('50').json()
+            model.release.set()
+            self.assertTrue(self.wait_for(DirtyMatchPair.objects.exists))
+        match = JobMatch.objects.get(id=body['id'])
+        self.assertEqual((match.is_provisional, match.is_stale), (True, True))
+        with override_settings(REMATCH={'DEBOUNCE_SECONDS': 0, 'LLM_MIN_LOCAL_SCORE': 101}):
+            process_due_pairs()
+        match.refresh_from_db()
+        self.assertEqual((match.is_provisional, match.is_stale, match.score_source), (False, False, 'local'))
+
+    def test_full_backlog_goes_straight_to_rematch(self):
+        provisional._get_executor()
+        model = FakeModel({'match_score': 70, 'missing_skills': [], 'summary': 'Fast'})
+        with mock.patch.object(provisional, '_pending_slots', threading.Semaphore(0)), \
+                mock.patch.object(services, 'model', model):
+            body = self.match('2000').json()
+        self.assertEqual((body['is_provisional'], body['score_source']), (True, 'local'))
+        self.assertEqual(model.prompts, [])
+        self.assertTrue(DirtyMatchPair.objects.filter(candidate=self.candidate, job=self.job).exists())
+
+    def test_answer_within_deadline_is_final(self):
+        model = FakeModel({'match_score': 70, 'missing_skills': [], 'summary': 'Fast'})
+        with mock.patch.object(services, 'model', model), redirect_stdout(io.StringIO()):
+            body = self.match('2000').json()
+        self.assertEqual((body['is_provisional'], body['score_source'], body['match_score']), (False, 'llm', 70))
+
+    def test_invalid_deadline_is_rejected(self):
+        self.assertEqual(self.match('soon').status_code, 400)
+
+
+@override_settings(LLM_LEDGER={'ENABLED': False})
+class MatchQueryBudgetTests(TestCase):
+    def setUp(self):
+        self.job = JobPosting.objects.create(
+            title='Backend Engineer', company='Acme', required_skills=['Python'], description='Build APIs.')
+
+    def add_matches(self, count):
+        for i in range(count):
+            candidate = CandidateProfile.objects.create(
+                name=f'Candidate {i}', skills=['Python'], education=[], work_experience=[])
+            JobMatch.objects.create(candidate=candidate, job=self.job, match_score=50, missing_skills=[], summary='')
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        for added, total in ((2, 2), (4, 6)):
+            self.add_matches(added)
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/matches/')
+            self.assertEqual(len(response.json()), total)
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/matches/', {'expand': 'candidate,job'})
+            body = response.json()
+            self.assertEqual(len(body), total)
+            self.assertEqual(body[0]['job']['title'], 'Backend Engineer')
+            self.assertTrue(body[0]['candidate']['name'].startswith('Candidate'))
+
+    def test_unknown_expansion_is_rejected(self):
+        response = self.client.get('/api/matches/', {'expand': 'fingerprint'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fingerprint', response.json()['error'])
+
+    def test_unknown_expansion_is_rejected_before_the_llm_call(self):
+        candidate = CandidateProfile.objects.create(name='Jane', skills=['Python'], education=[], work_experience=[])
+        model = FakeModel({'match_score': 80, 'missing_skills': [], 'summary': 'Good fit'})
+        with mock.patch.object(services, 'model', model):
+            response = self.client.post(
+                '/api/matches/match_candidate/?expand=fingerprint',
+                {'candidate_id': candidate.id, 'job_id': self.job.id}, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('fingerprint', response.json()['error'])
+            response = self.client.post(
+                '/api/matches/match_candidate_to_jobs/?expand=fingerprint',
+                {'candidate_id': candidate.id, 'job_ids': [self.job.id]}, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(model.prompts, [])
+        self.assertFalse(JobMatch.objects.exists())
+
+    def test_retrieve_and_leaderboard_query_budgets(self):
+        self.add_matches(2)
+        match = JobMatch.objects.first()
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/matches/{match.id}/', {'expand': 'candidate,job'})
+        self.assertEqual(response.json()['job']['title'], 'Backend Engineer')
+        for added, total in ((0, 2), (4, 6)):
+            self.add_matches(added)
+            with self.assertNumQueries(2):
+                response = self.client.get(f'/api/jobs/{self.job.id}/top_candidates/')
+            self.assertEqual(len(response.json()['results']), total)
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/candidates/{match.candidate_id}/top_jobs/')
+        self.assertEqual(response.json()['results'][0]['name'], 'Backend Engineer at Acme')
+
+    def test_admin_changelist_query_count_does_not_grow_with_rows(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.add_matches(2)
+        self.client.get('/admin/matcher/jobmatch/')
+        with CaptureQueriesContext(connection) as few:
+            self.client.get('/admin/matcher/jobmatch/')
+        self.add_matches(4)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get('/admin/matcher/jobmatch/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(many), len(few))
+
+    def test_match_candidate_does_not_fetch_candidate_and_job_twice(self):
+        candidate = CandidateProfile.objects.create(name='Jane', skills=['Python'], education=[], work_experience=[])
+        model = FakeModel({'match_score': 80, 'missing_skills': [], 'summary': 'Good fit'})
+        with mock.patch.object(services, 'model', model), redirect_stdout(io.StringIO()):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    '/api/matches/match_candidate/?expand=job',
+                    {'candidate_id': candidate.id, 'job_id': self.job.id}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['job']['company'], 'Acme')
+        lookups = [q['sql'] for q in queries if q['sql'].startswith('SELECT "matcher_candidateprofile"')]
+        self.assertEqual(len(lookups), 1)
+
+
+class LLMJsonTests(SimpleTestCase):
+    def test_decodes_fenced_and_repairs_common_malformations(self):
+        fenced = '```json\n{"match_score": 80, "missing_skills": ["Go"], "summary": "Fits"}\n```'
+        self.assertEqual(decode_llm_json(fenced, MATCH_SCHEMA)['match_score'], 80)
+        sloppy = 'Here is the result:\n{"cover_letter": "Dear team,\nHello", "extra": [1, 2,],}\nThanks!'
+        self.assertEqual(decode_llm_json(sloppy, COVER_LETTER_SCHEMA)['cover_letter'], 'Dear team,\nHello')
+        with self.assertRaisesMessage(LLMResponseError, 'Failed to parse JSON response'):
+            decode_llm_json('not json at all')
+
+    def test_repair_leaves_string_contents_alone(self):
+        answer = ('Result: {"match_score": 40, "missing_skills": ["C, ]"],\n'
+                  '"summary": "Knows Python, }, and \\"Go, ]\\",\nnot Rust",}')
+        data = decode_llm_json(answer, MATCH_SCHEMA)
+        self.assertEqual(data['missing_skills'], ['C, ]'])
+        self.assertEqual(data['summary'], 'Knows Python, }, and "Go, ]",\nnot Rust')
+
+    def test_schema_validation(self):
+        self.assertEqual(decode_llm_json('{"match_score": "85", "missing_skills": [], "summary": ""}',
+                                         MATCH_SCHEMA)['match_score'], 85)
+        with self.assertRaisesMessage(LLMResponseError, 'Missing required field: summary'):
+            decode_llm_json('{"match_score": 85, "missing_skills": []}', MATCH_SCHEMA)
+        with self.assertRaisesMessage(LLMResponseError, 'match_score must be between 0 and 100'):
+            decode_llm_json('{"match_score": 150, "missing_skills": [], "summary": ""}', MATCH_SCHEMA)
+        resume = decode_llm_json(
+            '{"name": "Jane", "skills": ["Python", 1, null], "education": ["BSc, MIT", {"degree": "MSc"}],'
+            ' "work_experience": [{"company": "Acme"}, null]}', RESUME_SCHEMA)
+        self.assertEqual(resume['skills'], ['Python'])
+        self.assertEqual(resume['education'], [{'degree': 'MSc'}])
+        self.assertEqual(resume['work_experience'], [{'company': 'Acme'}])
+        with self.assertRaisesMessage(LLMResponseError, 'Expected a JSON array for skills'):
+            decode_llm_json('{"name": "Jane", "skills": "Python", "education": [], "work_experience": []}',
+                            RESUME_SCHEMA)
+
+
+class FastJSONTests(TestCase):
+    def test_renderer_matches_stock_renderer(self):
+        data = {'score': Decimal('1.50'), 'errors': {3: 'failed'}, 'name': 'Zoë'}
+        fast = fastjson.FastJSONRenderer().render(data)
+        with mock.patch.object(fastjson, 'orjson', None):
+            fallback = fastjson.FastJSONRenderer().render(data)
+        self.assertEqual(json.loads(fast), {'score': 1.5, 'errors': {'3': 'failed'}, 'name': 'Zoë'})
+        self.assertEqual(json.loads(fast), json.loads(fallback))
+
+    def test_api_uses_fast_parser_and_renderer(self):
+        response = self.client.post('/api/jobs/', {
+            'title': 'Backend Engineer', 'company': 'Acme', 'required_skills': ['Python'], 'description': 'APIs',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.get('/api/jobs/').json()[0]['company'], 'Acme')
+        response = self.client.post('/api/jobs/', '{"title": ', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('JSON parse error', response.json()['detail'])
@@ -6,6 +6,7 @@ router = DefaultRouter()
 router.register(r'candidates', views.CandidateProfileViewSet)
 router.register(r'jobs', views.JobPostingViewSet)
 router.register(r'matches', views.JobMatchViewSet)
+router.register(r'llm-calls', views.LLMCallViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
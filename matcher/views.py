@@ -1,26 +1,49 @@
 from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
-import PyPDF2
-import docx
-from .models import CandidateProfile, JobPosting, JobMatch
-from .serializers import CandidateProfileSerializer, JobPostingSerializer, JobMatchSerializer
-from .services import parse_resume, match_candidate_to_job, generate_cover_letter
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from .blobs import open_blob, store_upload
+from .bulk_io import CONTENT_TYPES, detect_format, export_lines, import_records, read_records
+from .dedup import dedup_settings, find_near_duplicate, index_resume, minhash_signature, resume_identity
+from .leaderboards import leaderboard_settings, parse_cursor, top_entries
+from .ledger import BUCKETS, parse_window, summarize_calls
+from .models import CandidateProfile, JobPosting, JobMatch, LLMCall, ResumeBlob
+from .provisional import DEADLINE_HEADER, resolve_deadline, score_with_deadline, upgrade_when_done
+from .serializers import (
+    CandidateProfileSerializer, JobPostingSerializer, JobMatchSerializer, LeaderboardEntrySerializer,
+    LLMCallSerializer,
+)
+from .services import (
+    parse_resume, match_candidate_to_job, match_candidate_to_jobs, generate_cover_letter, packed_matching_settings,
+)
 import io
 import logging
 import json
+from typing import BinaryIO, Union
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+EXPANDABLE_MATCH_FIELDS = ('candidate', 'job')
+
+UNSUPPORTED_FILE_TYPE = 'Unsupported file type. Please upload PDF, DOCX, or TXT files.'
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+def _as_stream(file_content):
+    """Wrap bytes in a file object; file objects (such as stored blobs) are used as they are."""
+    return file_content if hasattr(file_content, 'read') else io.BytesIO(file_content)
+
+def extract_text_from_pdf(file_content: Union[bytes, BinaryIO]) -> str:
     """Extract text from a PDF file."""
+    import PyPDF2  # imported on first use to keep worker start-up light
+
     try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        pdf_reader = PyPDF2.PdfReader(_as_stream(file_content))
         text = ""
         for page in pdf_reader.pages:
             text += page.extract_text() + "\n"
@@ -29,11 +52,12 @@ def extract_text_from_pdf(file_content: bytes) -> str:
         logger.error(f"Error extracting text from PDF: {str(e)}")
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
-def extract_text_from_docx(file_content: bytes) -> str:
+def extract_text_from_docx(file_content: Union[bytes, BinaryIO]) -> str:
     """Extract text from a DOCX file."""
+    import docx  # imported on first use to keep worker start-up light
+
     try:
-        docx_file = io.BytesIO(file_content)
-        doc = docx.Document(docx_file)
+        doc = docx.Document(_as_stream(file_content))
         text = ""
         for para in doc.paragraphs:
             text += para.text + "\n"
@@ -42,6 +66,65 @@ def extract_text_from_docx(file_content: bytes) -> str:
         logger.error(f"Error extracting text from DOCX: {str(e)}")
         raise Exception(f"Failed to extract text from DOCX: {str(e)}")
 
+def leaderboard_page(request, board, owner_id):
+    """Serve one keyset-paginated page of a leaderboard (``?limit=`` and ``?after=<cursor>``)."""
+    config = leaderboard_settings()
+    try:
+        limit = int(request.query_params.get('limit', config['PAGE_SIZE']))
+        after = parse_cursor(request.query_params.get('after'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= limit <= config['SIZE']:
+        return Response(
+            {'error': f"limit must be between 1 and {config['SIZE']}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    entries, next_cursor = top_entries(board, owner_id, limit, after)
+    return Response({
+        'results': LeaderboardEntrySerializer(entries, many=True).data,
+        'next': next_cursor,
+    })
+
+def import_file(request, kind):
+    """Bulk-import an uploaded JSONL or CSV file (``file``); the format comes from the extension or ``file_format``."""
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        fmt = detect_format(upload.name, request.query_params.get('file_format'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    report = import_records(kind, read_records(upload, fmt, kind))
+    if report['created']:
+        return Response(report, status=status.HTTP_201_CREATED)
+    if report['invalid']:
+        return Response(report, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report)
+
+def export_file(request, kind):
+    """Stream a whole table as JSONL (default) or CSV (``?file_format=csv``)."""
+    fmt = request.query_params.get('file_format', 'jsonl')
+    try:
+        detect_format(requested=fmt)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    response = StreamingHttpResponse(export_lines(kind, fmt), content_type=CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
+def extract_text(filename: str, file_content: Union[bytes, BinaryIO]) -> str:
+    """Extract text from a resume by file extension; ``file_content`` is bytes or a file object."""
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        return extract_text_from_pdf(file_content)
+    if name.endswith('.docx'):
+        return extract_text_from_docx(file_content)
+    if name.endswith('.txt'):
+        if hasattr(file_content, 'getbuffer'):
+            file_content = file_content.getbuffer()
+        return str(file_content, 'utf-8')
+    raise ValueError(UNSUPPORTED_FILE_TYPE)
+
 # Create your views here.
 
 class CandidateProfileViewSet(viewsets.ModelViewSet):
@@ -67,31 +150,38 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
             resume_file = request.FILES['resume']
             logger.info(f"Received file: {resume_file.name}, size: {resume_file.size} bytes")
             
-            # Read file content
+            if not resume_file.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                logger.error(f"Unsupported file type: {resume_file.name}")
+                return Response(
+                    {'error': UNSUPPORTED_FILE_TYPE}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Store the original file, streaming it from the upload
             try:
-                file_content = resume_file.read()
-                logger.info(f"Read {len(file_content)} bytes from file")
+                digest, size = store_upload(resume_file)
+                blob, _ = ResumeBlob.objects.get_or_create(
+                    sha256=digest, defaults={'size': size, 'filename': resume_file.name})
+                logger.info(f"Stored {size} bytes as blob {digest}")
             except Exception as e:
                 logger.error(f"Error reading file: {str(e)}")
                 return Response(
                     {'error': f'Error reading file: {str(e)}'}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
+
+            # The exact same file was uploaded before: no extraction or parsing needed.
+            # Part of dedup, so RESUME_DEDUP['ENABLED'] = False forces a fresh parse
+            dedup_config = dedup_settings()
+            existing = blob.candidates.order_by('id').first() if dedup_config['ENABLED'] else None
+            if existing:
+                logger.info(f"Reusing candidate profile {existing.id} (identical file)")
+                return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
             
             # Extract text based on file type
             try:
-                if resume_file.name.lower().endswith('.pdf'):
-                    text = extract_text_from_pdf(file_content)
-                elif resume_file.name.lower().endswith('.docx'):
-                    text = extract_text_from_docx(file_content)
-                elif resume_file.name.lower().endswith('.txt'):
-                    text = file_content.decode('utf-8')
-                else:
-                    logger.error(f"Unsupported file type: {resume_file.name}")
-                    return Response(
-                        {'error': 'Unsupported file type. Please upload PDF, DOCX, or TXT files.'}, 
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+                with open_blob(digest) as file_content:
+                    text = extract_text(resume_file.name, file_content)
                 
                 logger.info(f"Extracted text length: {len(text)} characters")
                 if not text.strip():
@@ -107,6 +197,17 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
+            # Look for a near-duplicate of a previous upload by the same person
+            signature = minhash_signature(text)
+            identity = resume_identity(text)
+            duplicate = None
+            if dedup_config['ENABLED']:
+                duplicate = find_near_duplicate(signature, identity, dedup_config['THRESHOLD'])
+            if duplicate and dedup_config['POLICY'] == 'reuse':
+                existing, similarity = duplicate
+                logger.info(f"Reusing candidate profile {existing.id} (similarity {similarity:.2f})")
+                return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
+
             # Parse resume using LLM
             try:
                 parsed_data = parse_resume(text)
@@ -117,12 +218,19 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
                     {'error': f'Error parsing resume: {str(e)}'}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
+
+            if duplicate:
+                existing, similarity = duplicate
+                logger.info(f"Updating candidate profile {existing.id} (similarity {similarity:.2f})")
+                return self._update_duplicate(existing, parsed_data, signature, identity, blob)
             
             # Create candidate profile
             try:
                 serializer = self.get_serializer(data=parsed_data)
                 if serializer.is_valid():
-                    serializer.save()
+                    with transaction.atomic():
+                        candidate = serializer.save(resume_blob=blob)
+                        index_resume(candidate, signature, identity)
                     logger.info(f"Successfully created candidate profile: {serializer.data}")
                     return Response(serializer.data, status=status.HTTP_201_CREATED)
                 else:
@@ -145,19 +253,114 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _update_duplicate(self, candidate, parsed_data, signature, identity, blob=None):
+        """Apply only the fields that changed in a re-uploaded resume to the existing profile."""
+        serializer = self.get_serializer(candidate, data=parsed_data, partial=True)
+        if not serializer.is_valid():
+            logger.error(f"Serializer validation errors: {serializer.errors}")
+            return Response(
+                {'error': 'Invalid data format', 'details': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        changed = [
+            field for field, value in serializer.validated_data.items()
+            if getattr(candidate, field) != value
+        ]
+        if blob is not None and candidate.resume_blob_id != blob.sha256:
+            candidate.resume_blob = blob
+            changed.append('resume_blob')
+        with transaction.atomic():
+            for field in changed:
+                if field != 'resume_blob':
+                    setattr(candidate, field, serializer.validated_data[field])
+            if changed:
+                candidate.save(update_fields=changed)
+            index_resume(candidate, signature, identity)
+        logger.info(f"Updated fields {changed} of candidate profile {candidate.id}")
+        return Response(self.get_serializer(candidate).data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        """Create candidate profiles from a JSONL or CSV file."""
+        return import_file(request, 'candidates')
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream all candidate profiles."""
+        return export_file(request, 'candidates')
+
+    @action(detail=True, methods=['get'])
+    def top_jobs(self, request, pk=None):
+        """Best-matching jobs for a candidate, highest score first."""
+        candidate = self.get_object()
+        return leaderboard_page(request, 'candidate', candidate.id)
+
 class JobPostingViewSet(viewsets.ModelViewSet):
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSerializer
 
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def bulk_import(self, request):
+        """Create job postings from a JSONL or CSV file."""
+        return import_file(request, 'jobs')
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream all job postings."""
+        return export_file(request, 'jobs')
+
+    @action(detail=True, methods=['get'])
+    def top_candidates(self, request, pk=None):
+        """Best-matching candidates for a job, highest score first."""
+        job = self.get_object()
+        return leaderboard_page(request, 'job', job.id)
+
 class JobMatchViewSet(viewsets.ModelViewSet):
     queryset = JobMatch.objects.all()
     serializer_class = JobMatchSerializer
 
+    def expand_fields(self):
+        """Relations to nest in the response, from ``?expand=candidate,job``."""
+        value = self.request.query_params.get('expand', '') if self.request else ''
+        fields = [field.strip() for field in value.split(',') if field.strip()]
+        unknown = sorted(set(fields) - set(EXPANDABLE_MATCH_FIELDS))
+        if unknown:
+            raise ValidationError(
+                {'error': f"Cannot expand {', '.join(unknown)}, expected any of {', '.join(EXPANDABLE_MATCH_FIELDS)}"})
+        return fields
+
+    def get_queryset(self):
+        # Join the relations that will be read so a page costs one query, not one per row
+        related = set(self.expand_fields())
+        if self.action == 'generate_cover_letter':
+            related.update(EXPANDABLE_MATCH_FIELDS)
+        queryset = super().get_queryset()
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.expand_fields()
+        return context
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def bulk_import(self, request):
+        """Create job matches for existing candidates and jobs from a JSONL or CSV file."""
+        return import_file(request, 'matches')
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream all job matches."""
+        return export_file(request, 'matches')
+
     @action(detail=False, methods=['post'])
     def match_candidate(self, request):
         """Match a candidate with a job posting."""
         logger.info("Starting candidate matching process")
         logger.info(f"Request data: {request.data}")
+        # Reject a bad ?expand before paying for the LLM call
+        self.expand_fields()
         
         try:
             candidate_id = request.data.get('candidate_id')
@@ -174,28 +377,45 @@ class JobMatchViewSet(viewsets.ModelViewSet):
             candidate = get_object_or_404(CandidateProfile, id=candidate_id)
             job = get_object_or_404(JobPosting, id=job_id)
             
+            try:
+                deadline = resolve_deadline(request.headers.get(DEADLINE_HEADER))
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
             # Get match results using LLM
             logger.info("Getting match results from LLM")
-            match_results = match_candidate_to_job(
-                CandidateProfileSerializer(candidate).data,
-                JobPostingSerializer(job).data
-            )
+            provisional, pending = False, None
+            if deadline is None:
+                match_results = match_candidate_to_job(
+                    CandidateProfileSerializer(candidate).data,
+                    job.match_profile()
+                )
+            else:
+                # Past the deadline this is a local score and the LLM call keeps running
+                match_results, provisional, pending = score_with_deadline(candidate, job, deadline)
             logger.info(f"Match results: {json.dumps(match_results, indent=2)}")
             
-            # Create job match
+            # Create job match; the loaded candidate and job are validated without another lookup
             match_data = {
-                'candidate': candidate.id,
-                'job': job.id,
+                'candidate': candidate,
+                'job': job,
                 'match_score': match_results['match_score'],
                 'missing_skills': match_results['missing_skills'],
                 'summary': match_results['summary']
             }
             
-            logger.info(f"Creating job match with data: {json.dumps(match_data, indent=2)}")
+            logger.info(f"Creating job match for candidate {candidate.id} and job {job.id}")
             serializer = self.get_serializer(data=match_data)
             
             if serializer.is_valid():
-                serializer.save()
+                # One transaction for the match and its leaderboard updates
+                with transaction.atomic():
+                    if provisional:
+                        serializer.save(score_source='local', is_provisional=True)
+                    else:
+                        serializer.save()
+                if provisional:
+                    upgrade_when_done(serializer.instance, pending)
                 logger.info(f"Successfully created job match: {json.dumps(serializer.data, indent=2)}")
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             else:
@@ -212,9 +432,80 @@ class JobMatchViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=False, methods=['post'])
+    def match_candidate_to_jobs(self, request):
+        """Match a candidate with several job postings, packing the jobs into few LLM prompts."""
+        logger.info("Starting packed candidate matching process")
+        self.expand_fields()
+        try:
+            candidate_id = request.data.get('candidate_id')
+            job_ids = request.data.get('job_ids')
+            if not candidate_id or not isinstance(job_ids, list) or not job_ids:
+                return Response(
+                    {'error': 'candidate_id and a non-empty list of job_ids are required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            max_jobs = packed_matching_settings()['MAX_JOBS_PER_REQUEST']
+            if len(job_ids) > max_jobs:
+                return Response(
+                    {'error': f'At most {max_jobs} job_ids per request'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            candidate = get_object_or_404(CandidateProfile, id=candidate_id)
+            jobs = {job.id: job for job in JobPosting.objects.filter(id__in=job_ids)}
+            unknown = sorted({str(job_id) for job_id in job_ids} - {str(job_id) for job_id in jobs})
+            if unknown:
+                return Response(
+                    {'error': f"Unknown job ids: {', '.join(unknown)}"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            outcome = match_candidate_to_jobs(
+                CandidateProfileSerializer(candidate).data,
+                {job_id: job.match_profile() for job_id, job in jobs.items()}
+            )
+            logger.info(f"Packed matching used {outcome['prompts']} prompts and {outcome['retried']} retries")
+
+            # Results go through the same validation as single matches
+            valid = []
+            for job_id, result in outcome['results'].items():
+                serializer = self.get_serializer(data={
+                    'candidate': candidate,
+                    'job': jobs[job_id],
+                    'match_score': result['match_score'],
+                    'missing_skills': result['missing_skills'],
+                    'summary': result['summary'],
+                })
+                if serializer.is_valid():
+                    valid.append(serializer)
+                else:
+                    outcome['errors'][job_id] = serializer.errors
+
+            # One transaction for all matches and their leaderboard updates
+            with transaction.atomic():
+                matches = [serializer.save() for serializer in valid]
+            body = {
+                'matches': self.get_serializer(matches, many=True).data,
+                'errors': outcome['errors'],
+                'prompts': outcome['prompts'],
+                'retried': outcome['retried'],
+            }
+            if not matches:
+                return Response(body, status=status.HTTP_400_BAD_REQUEST)
+            return Response(body, status=status.HTTP_201_CREATED)
+
+        except Exception as e:
+            logger.error(f"Error in match_candidate_to_jobs: {str(e)}")
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
     @action(detail=True, methods=['post'])
     def generate_cover_letter(self, request, pk=None):
         """Generate a cover letter for a job match."""
+        self.expand_fields()
         try:
             logger.info(f"Starting cover letter generation for match {pk}")
             job_match = self.get_object()
@@ -242,3 +533,30 @@ class JobMatchViewSet(viewsets.ModelViewSet):
                 {'error': str(e)}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+class LLMCallViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = LLMCall.objects.all().order_by('-created_at')
+    serializer_class = LLMCallSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        operation = self.request.query_params.get('operation')
+        if operation:
+            queryset = queryset.filter(operation=operation)
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """Throughput, p95 latency, tokens and spend per operation over a time window."""
+        window = request.query_params.get('window', '24h')
+        bucket = request.query_params.get('bucket')
+        try:
+            delta = parse_window(window)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if bucket and bucket not in BUCKETS:
+            return Response(
+                {'error': f"Invalid bucket '{bucket}', expected one of {', '.join(BUCKETS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'window': window, **summarize_calls(self.get_queryset(), delta, bucket)})
@@ -0,0 +1,76 @@
+"""Optional warm-up for long-lived workers.
+
+Heavy dependencies (PDF/DOCX libraries, the Gemini SDK) and in-memory indexes
+are loaded on first use, so management commands and short-lived processes
+never pay for them. A web or queue worker can call ``warm_up()`` once after
+start-up instead, so its first request does not. ``MATCHER_WARM_UP=1`` makes
+the WSGI/ASGI entry points do this in every worker process.
+
+The database connection and the gRPC-based Gemini client must not be shared
+across ``fork()``. With gunicorn ``--preload`` the application is imported in
+the master, so set ``MATCHER_WARM_UP=shared`` there: only the fork-safe steps
+run, and workers call ``warm_up()`` from gunicorn's ``post_fork`` hook.
+"""
+import logging
+import time
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def _load_extractors():
+    import docx  # noqa: F401
+    import PyPDF2  # noqa: F401
+
+
+def _load_llm_client():
+    from . import services
+
+    services._get_model()
+
+
+def _load_skill_indexes():
+    from .local_parser import get_skill_automaton
+    from .skills import get_trie
+
+    get_trie()
+    get_skill_automaton()
+
+
+def _open_database():
+    from django.db import connection
+
+    connection.ensure_connection()
+
+
+STEPS: Dict[str, Callable] = {
+    'extractors': _load_extractors,
+    'llm_client': _load_llm_client,
+    'skill_indexes': _load_skill_indexes,
+    'database': _open_database,
+}
+
+# Hold sockets or threads, so they belong to the process that will use them
+PER_PROCESS_STEPS = ('llm_client', 'database')
+
+
+def warm_up(per_process: bool = True) -> Dict[str, float]:
+    """Run the warm-up steps and return how long each took in milliseconds.
+
+    ``per_process=False`` runs only the steps that are safe to do before a
+    fork. A failing step (e.g. no API key yet) is logged and skipped; it will
+    be retried lazily on first use.
+    """
+    timings = {}
+    for name, step in STEPS.items():
+        if not per_process and name in PER_PROCESS_STEPS:
+            continue
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {str(e)}")
+            continue
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(f"Warm-up finished: {timings}")
+    return timings
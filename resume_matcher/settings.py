@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os
+import django
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -62,6 +63,20 @@ MIDDLEWARE = [
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development
 CORS_ALLOW_CREDENTIALS = True
 
+# REST framework: the stock JSON renderer/parser swapped for orjson-backed ones
+# (they fall back to the standard library when orjson is not installed)
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'matcher.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'matcher.fastjson.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
 ROOT_URLCONF = 'resume_matcher.urls'
 
 TEMPLATES = [
@@ -86,12 +101,64 @@ WSGI_APPLICATION = 'resume_matcher.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# SQLite by default. Set DB_ENGINE (e.g. django.db.backends.postgresql) and the
+# DB_* variables below to move to a server database; DB_POOL=1 enables the
+# PostgreSQL connection pool (Django 5.1+, needs psycopg[pool]).
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            # Keep connections (and their PRAGMAs) open across requests
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # Seconds to wait for the write lock before "database is locked"
+                'timeout': 20,
+            },
+        }
+    }
+    if django.VERSION >= (5, 1):
+        # Take the write lock when a transaction starts instead of failing on the
+        # read-to-write upgrade, which the busy timeout cannot retry
+        DATABASES['default']['OPTIONS']['transaction_mode'] = 'IMMEDIATE'
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', 'resume_matcher'),
+            'USER': os.getenv('DB_USER', ''),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', ''),
+            'PORT': os.getenv('DB_PORT', ''),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
+    if os.getenv('DB_POOL') == '1':
+        # Pooled connections are managed by the pool, not by CONN_MAX_AGE
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = True
+
+# Applied to every new SQLite connection (see matcher.db). WAL (opt-in below) lets readers run
+# alongside the single writer; NORMAL sync is durable across app crashes and
+# only risks the last transactions on power loss.
+SQLITE_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,  # ms
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
 }
+# The journal mode is stored in the database file itself, so WAL is opt-in
+# (SQLITE_JOURNAL_MODE=WAL) instead of being switched on by the first manage.py run
+if os.getenv('SQLITE_JOURNAL_MODE'):
+    SQLITE_PRAGMAS['journal_mode'] = os.getenv('SQLITE_JOURNAL_MODE')
+
+# Rows written per transaction by the batched write paths
+DB_WRITE_BATCH_SIZE = int(os.getenv('DB_WRITE_BATCH_SIZE', '500'))
 
 
 # Password validation
@@ -135,6 +202,9 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Original resume files, stored once per SHA-256 of their content
+RESUME_BLOB_ROOT = os.path.join(MEDIA_ROOT, 'resumes')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -143,6 +213,72 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Gemini API Key
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
+# LLM call ledger: entries are queued and written in batches off the request path
+LLM_LEDGER = {
+    'ENABLED': True,
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 2.0,  # seconds
+}
+
+# Near-duplicate resume detection (MinHash/LSH over extracted text).
+# POLICY 'reuse' returns the existing profile without an LLM call; 'update'
+# re-parses and applies only the changed fields to the existing profile.
+RESUME_DEDUP = {
+    'ENABLED': True,
+    'THRESHOLD': 0.9,
+    'POLICY': 'reuse',
+}
+
+# Skill alias table (canonical name -> spellings) used to canonicalize candidate
+# and job skills on save. Run `manage.py canonicalize_skills` after editing it.
+SKILL_ALIASES_PATH = BASE_DIR / 'matcher' / 'data' / 'skill_aliases.json'
+
+# Rule-based resume parser tried before the LLM; resumes scoring below the
+# confidence threshold, or with a field missing, are sent to Gemini instead.
+LOCAL_RESUME_PARSER = {
+    'ENABLED': True,
+    'CONFIDENCE_THRESHOLD': 0.8,
+}
+
+# Incremental re-matching: edits to candidates or jobs mark their matches stale
+# and queue the pairs; `manage.py rematch_worker` re-scores them after the
+# debounce window, locally first and with the LLM only above LLM_MIN_LOCAL_SCORE.
+REMATCH = {
+    'DEBOUNCE_SECONDS': 30,
+    'LLM_MIN_LOCAL_SCORE': 40,
+    'BATCH_SIZE': 50,
+}
+
+# Optional deadline for match_candidate (per request via the X-Match-Deadline-Ms
+# header). Past it, a locally scored provisional match is returned and upgraded
+# when the LLM answers.
+MATCH_DEADLINE = {
+    'DEFAULT_MS': None,
+    'MAX_MS': 30000,
+    'BACKGROUND_WORKERS': 4,
+    'MAX_PENDING': 16,  # past this backlog, late pairs go straight to the rematch queue
+}
+
+# Packed matching: one prompt scores a candidate against several jobs, with as
+# many jobs per prompt as fit the estimated token budget.
+PACKED_MATCHING = {
+    'TOKEN_BUDGET': 8000,
+    'MAX_JOBS_PER_PROMPT': 25,
+    'MAX_JOBS_PER_REQUEST': 200,
+}
+
+# Materialized top-N boards (top candidates per job, top jobs per candidate),
+# kept up to date on every JobMatch save/delete and served with keyset pagination.
+LEADERBOARDS = {
+    'SIZE': 100,
+    'PAGE_SIZE': 20,
+}
+
+# LLM pricing in USD per million tokens, used for the ledger's spend figures
+LLM_PRICING = {
+    'gemini-1.5-flash': {'input': 0.075, 'output': 0.30},
+}
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
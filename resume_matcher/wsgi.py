@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_matcher.settings')
 
 application = get_wsgi_application()
+
+if os.getenv('MATCHER_WARM_UP') in ('1', 'shared'):
+    # Load the AI stack now rather than on the first request; 'shared' skips
+    # the database and Gemini client for servers that fork after importing this
+    from matcher.warmup import warm_up
+
+    warm_up(per_process=os.getenv('MATCHER_WARM_UP') == '1')
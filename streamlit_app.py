@@ -37,7 +37,8 @@ def upload_resume(file):
         logger.info(f"API Response Status: {response.status_code}")
         logger.info(f"API Response Headers: {response.headers}")
         
-        if response.status_code == 201:
+        # 200 means the resume was recognized as a near-duplicate of an earlier upload
+        if response.status_code in (200, 201):
             logger.info("Resume uploaded successfully")
             return response.json()
         else: